@@ -0,0 +1,155 @@
+"""
+Compare click statistics queries over a large click history.
+
+Seeds a legacy database (no click_stats index, no rollups) with millions of
+clicks spread over 90 days, times the original unbounded stats query and a
+time-bounded variant, then runs ``DatabaseManager.connect`` to add the
+(short_url_id, clicked_at) index and rollups and times them again together
+with ``StatService.get_click_statistics``.
+
+Usage:
+    PYTHONPATH=src python benchmarks/click_stats_query.py [clicks]
+"""
+
+import asyncio
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import and_, case, func, insert, select
+
+from db.database import DatabaseManager
+from models.base import Base
+from models.click_stats import ClickStatModel
+from models.short_urls import ShortURLModel
+from models.users import UserModel
+from schemas.short_urls import ShortURLFilters
+from schemas.users import UserInfoResponseSchema
+from services.stat import StatService
+from utils.unitofwork import UnitOfWork
+
+
+USERS = 100
+LINKS_PER_USER = 20
+HISTORY_DAYS = 90
+CHUNK = 100_000
+RUNS = 3
+
+
+def raw_stats_query(user_id: int, now: int, bounded: bool):
+    hour_ago, day_ago = now - 3600, now - 86400
+    join_on = ShortURLModel.id == ClickStatModel.short_url_id
+    if bounded:
+        join_on = and_(join_on, ClickStatModel.clicked_at >= day_ago)
+    hour_case = case((ClickStatModel.clicked_at >= hour_ago, 1), else_=0)
+    day_case = case((ClickStatModel.clicked_at >= day_ago, 1), else_=0)
+    return (
+        select(
+            ShortURLModel.id,
+            func.sum(hour_case).label("clicks_last_hour"),
+            func.sum(day_case).label("clicks_last_day"),
+        )
+        .outerjoin(ClickStatModel, join_on)
+        .where(ShortURLModel.user_id == user_id)
+        .group_by(ShortURLModel.id)
+        .order_by(func.sum(day_case).desc())
+        .limit(10)
+    )
+
+
+async def seed(db_manager: DatabaseManager, clicks: int, now: int) -> None:
+    legacy_tables = [
+        Base.metadata.tables[name] for name in ("users", "short_urls", "click_stats")
+    ]
+    async with db_manager.engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all, tables=legacy_tables)
+        for index in Base.metadata.tables["click_stats"].indexes:
+            await conn.run_sync(index.drop)
+
+        await conn.execute(
+            insert(UserModel),
+            [
+                {"id": i, "username": f"user{i}", "password": "x"}
+                for i in range(1, USERS + 1)
+            ],
+        )
+        links = USERS * LINKS_PER_USER
+        await conn.execute(
+            insert(ShortURLModel),
+            [
+                {
+                    "id": i,
+                    "short_code": f"c{i}",
+                    "original_url": "https://example.com",
+                    "user_id": (i - 1) // LINKS_PER_USER + 1,
+                    "expires_at": 2**31,
+                }
+                for i in range(1, links + 1)
+            ],
+        )
+        rng = random.Random(42)
+        start = now - HISTORY_DAYS * 86400
+        for offset in range(0, clicks, CHUNK):
+            await conn.execute(
+                insert(ClickStatModel),
+                [
+                    {
+                        "short_url_id": rng.randint(1, links),
+                        "clicked_at": rng.randint(start, now),
+                    }
+                    for _ in range(min(CHUNK, clicks - offset))
+                ],
+            )
+
+
+async def timed(label: str, run) -> None:
+    await run()
+    started = time.perf_counter()
+    for _ in range(RUNS):
+        await run()
+    print(f"{label:<40} {(time.perf_counter() - started) / RUNS * 1000:10.2f} ms")
+
+
+async def time_raw_queries(db_manager: DatabaseManager, now: int, suffix: str):
+    for bounded in (False, True):
+        query = raw_stats_query(USERS // 2, now, bounded)
+
+        async def run(query=query):
+            async with db_manager.async_session_maker() as session:
+                (await session.execute(query)).all()
+
+        label = "time-bounded" if bounded else "unbounded"
+        await timed(f"raw {label}, {suffix}", run)
+
+
+async def main(clicks: int) -> None:
+    now = int(time.time())
+    with tempfile.TemporaryDirectory() as tmp:
+        db_manager = DatabaseManager(f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}")
+        started = time.perf_counter()
+        await seed(db_manager, clicks, now)
+        print(f"seeded {clicks} clicks in {time.perf_counter() - started:.1f} s")
+
+        await time_raw_queries(db_manager, now, "no index")
+
+        started = time.perf_counter()
+        await db_manager.connect()
+        print(f"connect (index + rollups) took {time.perf_counter() - started:.1f} s")
+
+        await time_raw_queries(db_manager, now, "with index")
+
+        user = UserInfoResponseSchema(id=USERS // 2, username=f"user{USERS // 2}")
+
+        async def rollups():
+            await StatService().get_click_statistics(
+                UnitOfWork(db_manager.async_session_maker), user, ShortURLFilters()
+            )
+
+        await timed("StatService (rollups)", rollups)
+        await db_manager.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000))
@@ -0,0 +1,42 @@
+"""
+Compare access-token verification with and without the decoded-token cache.
+
+Decodes the same access token repeatedly, as a dashboard client polling the
+API within one token lifetime would, once with the cache disabled (HMAC
+check plus ``TokenPayloadSchema`` validation every time) and once with it
+enabled (one verification, then dict lookups).
+
+Usage:
+    PYTHONPATH=src python benchmarks/jwt_decode.py [decodes]
+"""
+
+import sys
+import time
+
+from config import Settings
+from utils.jwt_utils import JwtUtils
+
+
+def timed(label: str, jwt_utils: JwtUtils, token: str, decodes: int) -> float:
+    jwt_utils.decode_jwt(token)
+    started = time.perf_counter()
+    for _ in range(decodes):
+        jwt_utils.decode_jwt(token)
+    per_decode = (time.perf_counter() - started) / decodes * 1_000_000
+    print(f"{label:<20} {per_decode:8.2f} us/decode")
+    return per_decode
+
+
+def main(decodes: int) -> None:
+    results = []
+    for label, max_size in (("no cache", 0), ("decoded-token cache", 10000)):
+        settings = Settings()
+        settings.cache.decoded_token_cache_max_size = max_size
+        jwt_utils = JwtUtils(settings)
+        token = jwt_utils.create_token_pair(user_id=1, token_version=0).access_token
+        results.append(timed(label, jwt_utils, token, decodes))
+    print(f"speed-up {results[0] / results[1]:.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,101 @@
+"""
+Compare redirect throughput of the FastAPI route and the raw ASGI fast path.
+
+Both apps share the same SQLite database, redirect cache and click buffer;
+requests are driven straight through the ASGI interface so the numbers
+reflect server-side overhead only.
+
+Usage:
+    PYTHONPATH=src python benchmarks/redirect_fast_path.py [requests]
+"""
+
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from fastapi import FastAPI
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from api.fast_redirect import fast_redirect
+from api.v1.dependencies import get_uow
+from api.v1.short_urls import redirect_router
+from core.exceptions import register_exception_handlers
+from models.base import Base
+from models.short_urls import ShortURLModel
+from models.users import UserModel
+from services.click_buffer import click_buffer
+from utils.unitofwork import UnitOfWork
+
+
+def build_app(session_maker, fast: bool) -> FastAPI:
+    app = FastAPI()
+    if fast:
+        app.router.add_route("/{short_code}", fast_redirect, methods=["GET"])
+    else:
+        app.include_router(redirect_router)
+    register_exception_handlers(app)
+    app.dependency_overrides[get_uow] = lambda: UnitOfWork(session_maker)
+    return app
+
+
+async def drive(app: FastAPI, requests: int) -> float:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/bench",
+        "raw_path": b"/bench",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 12345),
+        "server": ("bench", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            assert message["status"] == 307, message
+
+    started = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(scope), receive, send)
+    return requests / (time.perf_counter() - started)
+
+
+async def main(requests: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        session_maker = async_sessionmaker(engine, expire_on_commit=False)
+        async with session_maker() as session:
+            session.add(UserModel(id=1, username="bench", password="x"))
+            session.add(
+                ShortURLModel(
+                    short_code="bench",
+                    original_url="https://example.com/landing",
+                    user_id=1,
+                    expires_at=2**31,
+                )
+            )
+            await session.commit()
+
+        await click_buffer.start(session_maker)
+        for name, fast in (("FastAPI route", False), ("ASGI fast path", True)):
+            app = build_app(session_maker, fast)
+            await drive(app, requests // 10)
+            rps = await drive(app, requests)
+            print(f"{name:<15} {rps:10.0f} req/s")
+        await click_buffer.stop()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000))
@@ -0,0 +1,184 @@
+"""
+Time the stats page with unique visitors and a click flush with visitors.
+
+Seeds one user with a full page of links, each with a week of hourly visitor
+sketches, then times ``StatService.get_click_statistics`` for several window
+sets and ``StatRepository.record_clicks`` for a batch of clicks spread over
+many (link, hour) sketches, each with the longest event loop stall seen
+meanwhile. Each measurement runs with the register-wise ``max`` done byte by
+byte in Python and with ``register_max``, with unique visitors allowed over
+the whole week; the last line times the week-long page again under the
+default ``unique_visitors_max_window_hours``.
+
+Usage:
+    PYTHONPATH=src python benchmarks/unique_visitors.py [visitors_per_hour]
+"""
+
+import asyncio
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import insert
+
+from config import StatsSettings, get_settings
+from db.database import DatabaseManager
+from models.short_urls import ShortURLModel
+from models.users import UserModel
+from models.visitor_sketches import SKETCH_PRECISION, VisitorSketchModel
+from schemas.stat import URLStatsFilters
+from schemas.users import UserInfoResponseSchema
+from services.result_cache import user_results
+from services.stat import StatService
+from utils import hyperloglog
+from utils.hyperloglog import HyperLogLog
+from utils.unitofwork import UnitOfWork
+
+
+LINKS = 100
+HOURS = 168
+FLUSH_CLICKS = 500
+RUNS = 3
+WINDOW_SETS = ("1h,24h", "1h,24h,48h", "1h,24h,7d")
+MERGES = {
+    "bytewise max": lambda left, right: bytes(map(max, left, right)),
+    "register_max": hyperloglog.register_max,
+}
+
+
+async def seed(db_manager: DatabaseManager, visitors: int, now: int) -> None:
+    rng = random.Random(42)
+    current_hour = now // 3600 * 3600
+    async with db_manager.engine.begin() as conn:
+        await conn.execute(
+            insert(UserModel), [{"id": 1, "username": "user1", "password": "x"}]
+        )
+        await conn.execute(
+            insert(ShortURLModel),
+            [
+                {
+                    "id": i,
+                    "short_code": f"c{i}",
+                    "original_url": "https://example.com",
+                    "user_id": 1,
+                    "expires_at": 2**31,
+                }
+                for i in range(1, LINKS + 1)
+            ],
+        )
+        for hour in range(HOURS):
+            rows = []
+            for link in range(1, LINKS + 1):
+                sketch = HyperLogLog(SKETCH_PRECISION)
+                for _ in range(visitors):
+                    sketch.add_hash(rng.getrandbits(64))
+                rows.append(
+                    {
+                        "short_url_id": link,
+                        "bucket_start": current_hour - hour * 3600,
+                        "sketch": sketch.to_bytes(),
+                    }
+                )
+            await conn.execute(insert(VisitorSketchModel), rows)
+
+
+async def longest_stall(work) -> float:
+    """Await ``work``; return the longest event loop stall meanwhile in ms."""
+    stall = 0.0
+    done = asyncio.Event()
+
+    async def watch() -> None:
+        nonlocal stall
+        while not done.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(0.001)
+            stall = max(stall, time.perf_counter() - started - 0.001)
+
+    watcher = asyncio.create_task(watch())
+    await work
+    done.set()
+    await watcher
+    return stall * 1000
+
+
+async def page(db_manager: DatabaseManager, windows: str) -> float:
+    """Build one stats page; return the longest event loop stall in ms."""
+    user_results.clear()
+    return await longest_stall(
+        StatService().get_click_statistics(
+            UnitOfWork(db_manager.async_session_maker),
+            UserInfoResponseSchema(id=1, username="user1"),
+            URLStatsFilters(windows=windows, page_size=LINKS),
+        )
+    )
+
+
+async def flush(db_manager: DatabaseManager, clicks: list[dict]) -> None:
+    uow = UnitOfWork(db_manager.async_session_maker)
+    async with uow:
+        await uow.stat.record_clicks(clicks)
+        await uow.commit()
+
+
+async def time_page(db_manager: DatabaseManager, label: str, windows: str) -> None:
+    await page(db_manager, windows)
+    stalls, started = [], time.perf_counter()
+    for _ in range(RUNS):
+        stalls.append(await page(db_manager, windows))
+    elapsed = (time.perf_counter() - started) / RUNS * 1000
+    print(
+        f"{label:<14} page {windows:<12} {elapsed:9.1f} ms"
+        f"  (longest loop stall {max(stalls):7.1f} ms)"
+    )
+
+
+async def time_flush(db_manager: DatabaseManager, label: str, now: int) -> None:
+    rng = random.Random(7)
+    elapsed, stalls = 0.0, []
+    for _ in range(RUNS):
+        clicks = [
+            {
+                "short_url_id": rng.randint(1, LINKS),
+                "clicked_at": now - rng.randint(0, 23) * 3600,
+                "visitor": rng.getrandbits(64),
+            }
+            for _ in range(FLUSH_CLICKS)
+        ]
+        started = time.perf_counter()
+        stalls.append(await longest_stall(flush(db_manager, clicks)))
+        elapsed += time.perf_counter() - started
+    print(
+        f"{label:<14} flush of {FLUSH_CLICKS} clicks {elapsed / RUNS * 1000:9.1f} ms"
+        f"  (longest loop stall {max(stalls):7.1f} ms)"
+    )
+
+
+async def main(visitors: int) -> None:
+    now = int(time.time())
+    stats_settings = get_settings().stats
+    stats_settings.unique_visitors_max_window_hours = HOURS
+    with tempfile.TemporaryDirectory() as tmp:
+        db_manager = DatabaseManager(f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}")
+        await db_manager.connect()
+        started = time.perf_counter()
+        await seed(db_manager, visitors, now)
+        print(
+            f"seeded {LINKS} links x {HOURS} hourly sketches of {visitors} "
+            f"visitors in {time.perf_counter() - started:.1f} s"
+        )
+        for label, merge in MERGES.items():
+            hyperloglog.register_max = merge
+            for windows in WINDOW_SETS:
+                await time_page(db_manager, label, windows)
+            await time_flush(db_manager, label, now)
+        stats_settings.unique_visitors_max_window_hours = (
+            StatsSettings().unique_visitors_max_window_hours
+        )
+        await time_page(db_manager, "default cap", WINDOW_SETS[-1])
+        await db_manager.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 200))
@@ -0,0 +1,48 @@
+from functools import lru_cache
+from urllib.parse import quote
+
+from api.v1.dependencies import get_uow
+from services.urls import UrlService, visitor_fingerprint
+
+
+@lru_cache(maxsize=4096)
+def redirect_headers(url: str) -> tuple[tuple[bytes, bytes], ...]:
+    """Pre-built headers of a 307 response, encoded like RedirectResponse does."""
+    location = quote(url, safe=":/%#?=@[]!$&'()*+,;")
+    return ((b"location", location.encode("latin-1")), (b"content-length", b"0"))
+
+
+class FastRedirect:  # pylint: disable=too-few-public-methods
+    """
+    Raw ASGI endpoint for ``GET /{short_code}``.
+
+    Shares ``UrlService.get_redirect_url`` with the regular route but skips
+    FastAPI dependency resolution, request parsing and response object
+    construction. The UnitOfWork comes from ``get_uow`` (or its override in
+    ``app.dependency_overrides``). HTTPException is handled by the app's
+    exception middleware, so error responses match the regular route.
+    """
+
+    async def __call__(self, scope, receive, send) -> None:
+        uow_factory = scope["app"].dependency_overrides.get(get_uow, get_uow)
+        user_agent = next(
+            (value for name, value in scope["headers"] if name == b"user-agent"), b""
+        )
+        visitor = visitor_fingerprint(
+            scope["client"][0] if scope.get("client") else None,
+            user_agent.decode("latin-1"),
+        )
+        original_url = await UrlService().get_redirect_url(
+            uow_factory(), scope["path_params"]["short_code"], visitor
+        )
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 307,
+                "headers": redirect_headers(original_url),
+            }
+        )
+        await send({"type": "http.response.body", "body": b""})
+
+
+fast_redirect = FastRedirect()
@@ -1,7 +1,9 @@
 from fastapi import APIRouter
 
+from api.fast_redirect import fast_redirect
 from api.v1.routers import router_v1
 from api.v1.short_urls import redirect_router
+from config import get_settings
 
 
 main_router = APIRouter()
@@ -14,4 +16,9 @@ def health_check():
     return {"message": "pong"}
 
 
-main_router.include_router(redirect_router)
+if get_settings().url_alias.fast_redirect_enabled:
+    main_router.add_route(
+        "/{short_code}", fast_redirect, methods=["GET"], include_in_schema=False
+    )
+else:
+    main_router.include_router(redirect_router)
@@ -0,0 +1,234 @@
+from fastapi import APIRouter
+
+from api.v1.dependencies import AdminUserDep
+from schemas.admin import HotLinkInfo
+from services.click_buffer import click_buffer
+from services.click_leases import click_leases
+from services.hot_links import hot_links
+from services.login_guard import login_guard
+from services.redirect_cache import negative_cache, redirect_cache, redirect_lookups
+from services.result_cache import user_results
+from services.short_code_filter import short_code_filter
+from services.user_cache import user_cache
+from utils.jwt_utils import jwt_service, password_executor
+
+
+admin_router = APIRouter(
+    prefix="/admin",
+    tags=["Admin"],
+)
+
+
+@admin_router.get(
+    "/metrics",
+    responses={
+        200: {
+            "description": "In-process runtime metrics of this worker",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "redirect_cache": {
+                            "size": 812,
+                            "max_size": 10000,
+                            "hits": 152340,
+                            "misses": 1290,
+                            "evictions": 0,
+                            "expirations": 478,
+                        },
+                        "redirect_lookups": {
+                            "in_flight": 2,
+                            "executed": 1290,
+                            "coalesced": 8455,
+                        },
+                        "negative_cache": {
+                            "size": 240,
+                            "max_size": 10000,
+                            "hits": 9120,
+                            "misses": 311,
+                            "evictions": 0,
+                            "expirations": 71,
+                        },
+                        "decoded_tokens": {
+                            "size": 402,
+                            "max_size": 10000,
+                            "hits": 51820,
+                            "misses": 977,
+                            "evictions": 0,
+                            "expirations": 575,
+                            "pinned": 0,
+                        },
+                        "user_cache": {
+                            "size": 311,
+                            "max_size": 10000,
+                            "hits": 48210,
+                            "misses": 1204,
+                            "evictions": 0,
+                            "expirations": 893,
+                            "pinned": 0,
+                        },
+                        "user_results": {
+                            "size": 57,
+                            "max_size": 1000,
+                            "hits": 3410,
+                            "misses": 822,
+                            "evictions": 0,
+                            "expirations": 640,
+                            "pinned": 0,
+                        },
+                        "short_code_filter": {
+                            "ready": True,
+                            "items": 120345,
+                            "bits": 1153532,
+                            "hash_count": 7,
+                            "memory_bytes": 144192,
+                            "estimated_false_positive_rate": 0.0001,
+                            "rejected": 50211,
+                            "false_positives": 4,
+                            "observed_false_positive_rate": 0.00008,
+                        },
+                        "click_buffer": {
+                            "running": True,
+                            "queue_depth": 37,
+                            "max_queue_size": 10000,
+                            "flushed_events": 98211,
+                            "flushes": 1204,
+                            "dropped_events": 0,
+                            "retries": 0,
+                            "backpressure_waits": 0,
+                            "last_flush_latency_ms": 3.1,
+                            "max_flush_latency_ms": 48.7,
+                        },
+                        "click_leases": {
+                            "enabled": True,
+                            "lease_size": 50,
+                            "active_leases": 3,
+                            "leased_clicks_outstanding": 71,
+                            "leases_acquired": 420,
+                            "clicks_served_from_lease": 20579,
+                            "clicks_returned": 1310,
+                            "clicks_lost": 0,
+                        },
+                        "login_guard": {
+                            "enabled": True,
+                            "in_flight": 2,
+                            "max_concurrent": 8,
+                            "rejected_concurrent": 0,
+                            "by_ip": {"keys": 120, "allowed": 910, "throttled": 4800},
+                            "by_username": {
+                                "keys": 340,
+                                "allowed": 905,
+                                "throttled": 5,
+                            },
+                        },
+                        "password_executor": {
+                            "workers": 4,
+                            "max_pending": 64,
+                            "running": 4,
+                            "queue_depth": 9,
+                            "completed": 3120,
+                            "rejected": 0,
+                        },
+                    }
+                }
+            },
+        },
+        403: {
+            "description": "Forbidden",
+            "content": {
+                "application/json": {"example": {"detail": "Admin privileges required"}}
+            },
+        },
+    },
+)
+async def get_metrics(admin: AdminUserDep):
+    """
+    Get runtime metrics of the worker that served the request.
+
+    Returns:
+    - redirect_cache: size and hit/miss/eviction/expiration counters of the
+      short_code -> redirect target cache
+    - redirect_lookups: database lookups run on cache misses and requests
+      coalesced into an already in-flight lookup of the same short code
+    - negative_cache: counters of the short-lived cache of 404/410 results
+    - decoded_tokens: counters of the cache of verified JWT payloads
+    - user_cache: counters of the user_id -> (username, token_version) cache
+      used to authenticate access tokens
+    - user_results: counters of the per-user cache of URL listing and stats
+      results
+    - short_code_filter: size, memory and false positive rate of the Bloom
+      filter of existing short codes
+    - click_buffer: queue depth, flush counters, retries, dropped events and
+      flush latency of the batched click ingestion
+    - click_leases: outstanding click-quota leases held by this worker
+    - login_guard: logins in flight and attempts throttled per client IP and
+      per username
+    - password_executor: busy threads, queue depth and rejections of the
+      bcrypt thread pool used by registration and login
+
+    Notes:
+    - Counters are per process and reset on restart
+    - Only users listed in ADMIN_USERNAMES may access this endpoint
+    """
+    return {
+        "redirect_cache": redirect_cache.stats(),
+        "redirect_lookups": redirect_lookups.stats(),
+        "negative_cache": negative_cache.stats(),
+        "decoded_tokens": jwt_service.decoded_token_stats(),
+        "user_cache": user_cache.stats(),
+        "user_results": user_results.stats(),
+        "short_code_filter": short_code_filter.stats(),
+        "click_buffer": click_buffer.stats(),
+        "click_leases": click_leases.stats(),
+        "login_guard": login_guard.stats(),
+        "password_executor": password_executor.stats(),
+    }
+
+
+@admin_router.get(
+    "/hot-links",
+    response_model=list[HotLinkInfo],
+    responses={
+        200: {
+            "description": "Short codes currently driving most redirects",
+            "content": {
+                "application/json": {
+                    "example": [
+                        {
+                            "short_code": "promo2024",
+                            "hits": 15234,
+                            "max_overcount": 0,
+                            "pinned": True,
+                        },
+                        {
+                            "short_code": "abc123",
+                            "hits": 980,
+                            "max_overcount": 12,
+                            "pinned": False,
+                        },
+                    ]
+                }
+            },
+        },
+        403: {
+            "description": "Forbidden",
+            "content": {
+                "application/json": {"example": {"detail": "Admin privileges required"}}
+            },
+        },
+    },
+)
+async def get_hot_links(admin: AdminUserDep):
+    """
+    Get the top short codes by recent redirect volume on this worker.
+
+    Returns:
+    - List of HotLinkInfo objects, most redirected first:
+        - short_code: The short code
+        - hits: Estimated recent redirects (decayed by half every window)
+        - max_overcount: Upper bound of the overestimation included in hits
+        - pinned: Whether the link is exempt from redirect cache eviction
+
+    Notes:
+    - Counts come from an in-memory space-saving sketch and are per process
+    """
+    return hot_links.top()
@@ -1,8 +1,9 @@
 from typing import Annotated
 
-from fastapi import Depends
+from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 
+from config import SettingsDep
 from db.database import db_manager
 from schemas.users import UserInfoResponseSchema
 from services.auth import AuthService
@@ -16,7 +17,18 @@ def get_uow():
     return UnitOfWork(db_manager.async_session_maker)
 
 
-UOWDep = Annotated[IUnitOfWork, Depends(get_uow)]
+async def get_request_uow(uow: Annotated[IUnitOfWork, Depends(get_uow)]):
+    """
+    Hold one UnitOfWork open for the whole request.
+
+    FastAPI caches the dependency per request, so the access-token check and
+    the endpoint's service share its session instead of each opening one.
+    """
+    async with uow:
+        yield uow
+
+
+UOWDep = Annotated[IUnitOfWork, Depends(get_request_uow)]
 
 
 async def get_user_from_access_token(
@@ -30,4 +42,16 @@ UserFromAccessTokenDep = Annotated[
     UserInfoResponseSchema, Depends(get_user_from_access_token)
 ]
 
+
+async def get_admin_user(user: UserFromAccessTokenDep, settings: SettingsDep):
+    if user.username not in settings.admin.admin_usernames:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin privileges required",
+        )
+    return user
+
+
+AdminUserDep = Annotated[UserInfoResponseSchema, Depends(get_admin_user)]
+
 FormDataDep = Annotated[OAuth2PasswordRequestForm, Depends()]
@@ -1,16 +1,16 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Query, status
+from fastapi import APIRouter, Query, Request, status
 from fastapi.responses import RedirectResponse
 
 from api.v1.dependencies import UOWDep, UserFromAccessTokenDep
 from config import SettingsDep
 from schemas.short_urls import (
     ShortURLCreate,
-    ShortURLFilters,
     ShortURLInfo,
+    ShortURLListFilters,
 )
-from services.urls import UrlService
+from services.urls import UrlService, visitor_fingerprint
 
 
 urls_router = APIRouter(
@@ -35,6 +35,8 @@ redirect_router = APIRouter()
                         "clicks_left": 1000,
                         "is_active": True,
                         "tag": "marketing",
+                        "total_clicks": 0,
+                        "last_clicked_at": None,
                     }
                 }
             },
@@ -95,6 +97,8 @@ async def get_short_url(
                             "clicks_left": 42,
                             "is_active": True,
                             "tag": "marketing",
+                            "total_clicks": 1520,
+                            "last_clicked_at": 1712345000,
                         },
                         {
                             "short_code": "docs123",
@@ -103,6 +107,8 @@ async def get_short_url(
                             "clicks_left": None,
                             "is_active": True,
                             "tag": "documentation",
+                            "total_clicks": 0,
+                            "last_clicked_at": None,
                         },
                     ]
                 }
@@ -119,7 +125,7 @@ async def get_short_url(
 async def get_created_urls(
     user: UserFromAccessTokenDep,
     uow: UOWDep,
-    filters: Annotated[ShortURLFilters, Query()],
+    filters: Annotated[ShortURLListFilters, Query()],
 ):
     """
     Get user's URLs with filtering and pagination.
@@ -129,6 +135,7 @@ async def get_created_urls(
     - original_url: Filter by original URL
     - is_active: Filter by URL active status
     - tag: Filter by tag
+    - sort_by: created (default), total_clicks or last_clicked_at
     - page: Page number (default: 1)
     - page_size: Items per page (default: 10, max: 100)
 
@@ -164,6 +171,7 @@ async def get_created_urls(
 async def redirect_to_url(
     short_code: str,
     uow: UOWDep,
+    request: Request,
 ) -> RedirectResponse:
     """
     Redirect to the original URL associated with the short code.
@@ -176,7 +184,11 @@ async def redirect_to_url(
     - HTTP 404 if the short code is not found
     - HTTP 410 if the URL has expired or reached click limit
     """
-    original_url = await UrlService().get_redirect_url(uow, short_code)
+    visitor = visitor_fingerprint(
+        request.client.host if request.client else None,
+        request.headers.get("user-agent"),
+    )
+    original_url = await UrlService().get_redirect_url(uow, short_code, visitor)
     return RedirectResponse(url=original_url)
 
 
@@ -1,13 +1,19 @@
 from typing import Annotated, List
 
 from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
 
-from api.v1.dependencies import UOWDep, UserFromAccessTokenDep
-from schemas.short_urls import (
-    ShortURLFilters,
+from api.v1.dependencies import AdminUserDep, UOWDep, UserFromAccessTokenDep
+from schemas.stat import (
+    ClickSeries,
+    ClickSeriesQuery,
+    StatsExportQuery,
+    TrendingLink,
+    URLClickStats,
+    URLStatsFilters,
 )
-from schemas.stat import URLClickStats
 from services.stat import StatService
+from services.trending import trending_links
 
 
 stat_router = APIRouter(
@@ -29,12 +35,14 @@ stat_router = APIRouter(
                             "short_code": "promo2024",
                             "clicks_last_hour": 42,
                             "clicks_last_day": 1234,
+                            "clicks": {"1h": 42, "24h": 1234},
                         },
                         {
                             "original_url": "https://example.com/path2",
                             "short_code": "docs123",
                             "clicks_last_hour": 156,
                             "clicks_last_day": 5678,
+                            "clicks": {"1h": 156, "24h": 5678},
                         },
                     ]
                 }
@@ -46,16 +54,18 @@ stat_router = APIRouter(
                 "application/json": {"example": {"detail": "Not authenticated"}}
             },
         },
+        422: {"description": "Invalid window in 'windows' or 'sort_by'"},
     },
 )
 async def get_url_statistics(
     user: UserFromAccessTokenDep,
     uow: UOWDep,
-    filters: Annotated[ShortURLFilters, Query()],
+    filters: Annotated[URLStatsFilters, Query()],
 ):
     """
     Get click statistics for user's URLs with filtering and pagination.
-    URLs are sorted by click count in descending order (most clicked first).
+    URLs are sorted by the click count of the 'sort_by' window in descending
+    order (most clicked first).
 
     Parameters:
     - user: Current authenticated user
@@ -66,6 +76,9 @@ async def get_url_statistics(
         - tag: Filter by tag
         - page: Page number (default: 1)
         - page_size: Items per page (default: 10, max: 100)
+        - windows: Windows to count, e.g. 5m,1h,24h,7d (default: 1h,24h,
+          at most 8, each up to 366d)
+        - sort_by: Window to sort by (default: 24h)
 
     Returns:
     - List of URLClickStats objects containing:
@@ -73,10 +86,215 @@ async def get_url_statistics(
         - short_code: The unique short code for the URL
         - clicks_last_hour: Number of clicks in the last hour
         - clicks_last_day: Number of clicks in the last 24 hours
+        - clicks: Number of clicks in each requested window
 
     Notes:
     - Only URLs owned by the authenticated user are included
-    - Click counts are updated in real-time
+    - Clicks are written in batches, so counts may lag by up to the click
+      buffer flush interval
+    - Windows are aligned to whole buckets: the last hour is the current
+      minute plus the 59 before it, the last day the current hour plus the
+      23 before it; windows of 24 days or more use day buckets
     - Inactive or expired URLs are included unless filtered out
     """
     return await StatService().get_click_statistics(uow, user, filters)
+
+
+@stat_router.get(
+    "/stats/export",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "description": "Export streamed as NDJSON or CSV",
+            "content": {
+                "application/x-ndjson": {
+                    "example": '{"short_code": "promo2024", "clicked_at": 1712345678}\n'
+                },
+                "text/csv": {
+                    "example": "short_code,original_url,tag,is_active,clicks,"
+                    "total_clicks,last_clicked_at\n"
+                    "promo2024,https://example.com/path1,marketing,True,1234,"
+                    "1520,1712345000\n"
+                },
+            },
+        },
+        400: {
+            "description": "Bad request",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "'from' must be earlier than 'to'"}
+                }
+            },
+        },
+        401: {
+            "description": "Not authenticated",
+            "content": {
+                "application/json": {"example": {"detail": "Not authenticated"}}
+            },
+        },
+    },
+)
+async def export_url_statistics(
+    user: UserFromAccessTokenDep,
+    uow: UOWDep,
+    query: Annotated[StatsExportQuery, Query()],
+):
+    """
+    Stream the user's click data for bulk processing.
+
+    Parameters:
+    - kind: 'links' (default) for one row per URL with short_code,
+      original_url, tag, is_active, clicks in the range, total_clicks and
+      last_clicked_at; 'clicks' for one row per raw click with short_code and
+      clicked_at, oldest first
+    - format: ndjson (default) or csv with a header row
+    - from: Unix timestamp, start of the range (default: unbounded)
+    - to: Unix timestamp, exclusive end of the range (default: unbounded)
+
+    Notes:
+    - Rows are streamed from a server-side cursor without pagination
+    - For 'links', range bounds are rounded down to the minute and counted
+      from the coarsest rollup both bounds align to; minute and hour
+      rollups are only kept for their retention when click compaction is
+      enabled
+    - For 'clicks', raw clicks past RAW_CLICK_RETENTION_DAYS are not exported
+      when click compaction is enabled
+    """
+    rows = await StatService().export_statistics(uow, user, query)
+    return StreamingResponse(
+        rows,
+        media_type=query.format.media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="{query.kind.value}.'
+            f'{query.format.value}"'
+        },
+    )
+
+
+@stat_router.get(
+    "/stats/trending",
+    response_model=list[TrendingLink],
+    responses={
+        200: {
+            "description": "Most redirected short codes within the trending window",
+            "content": {
+                "application/json": {
+                    "example": [
+                        {"short_code": "promo2024", "clicks": 5230, "max_overcount": 0},
+                        {"short_code": "abc123", "clicks": 410, "max_overcount": 7},
+                    ]
+                }
+            },
+        },
+        403: {
+            "description": "Forbidden",
+            "content": {
+                "application/json": {"example": {"detail": "Admin privileges required"}}
+            },
+        },
+    },
+)
+async def get_trending_links(
+    admin: AdminUserDep,
+    limit: Annotated[int, Query(ge=1, le=100, description="Number of links")] = 10,
+):
+    """
+    Get the short codes redirected most often in the trending window.
+
+    Served from an in-memory sliding-window heavy-hitter sketch updated on
+    every redirect; the database is not queried.
+
+    Parameters:
+    - limit: Number of links to return (default: 10, max: 100)
+
+    Returns:
+    - List of TrendingLink objects, most clicked first:
+        - short_code: The short code
+        - clicks: Estimated redirects within the last TRENDING_WINDOW_SECONDS
+        - max_overcount: Upper bound of the overestimation included in clicks
+
+    Notes:
+    - Requires a user listed in ADMIN_USERNAMES
+    - Counts cover redirects served by this worker only
+    """
+    return [
+        TrendingLink(short_code=short_code, clicks=clicks, max_overcount=error)
+        for short_code, clicks, error in trending_links.top(limit)
+    ]
+
+
+@stat_router.get(
+    "/stats/{short_code}/series",
+    response_model=ClickSeries,
+    responses={
+        200: {
+            "description": "Click time series retrieved successfully",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "short_code": "promo2024",
+                        "bucket": "1h",
+                        "points": [
+                            {"bucket_start": 1712340000, "clicks": 12},
+                            {"bucket_start": 1712343600, "clicks": 42},
+                        ],
+                    }
+                }
+            },
+        },
+        400: {
+            "description": "Bad request",
+            "content": {
+                "application/json": {
+                    "examples": {
+                        "range": {
+                            "value": {"detail": "'from' must be earlier than 'to'"}
+                        },
+                        "too_many_buckets": {
+                            "value": {
+                                "detail": "Range spans 8760 buckets, at most 1440 are allowed"
+                            }
+                        },
+                    }
+                }
+            },
+        },
+        401: {
+            "description": "Not authenticated",
+            "content": {
+                "application/json": {"example": {"detail": "Not authenticated"}}
+            },
+        },
+        404: {
+            "description": "URL not found",
+            "content": {"application/json": {"example": {"detail": "URL not found"}}},
+        },
+    },
+)
+async def get_url_click_series(
+    short_code: str,
+    user: UserFromAccessTokenDep,
+    uow: UOWDep,
+    query: Annotated[ClickSeriesQuery, Query()],
+):
+    """
+    Get click counts of one of the user's URLs, bucketed by minute, hour or day.
+
+    Parameters:
+    - short_code: The unique identifier of the URL
+    - from: Start of the range as a unix timestamp, rounded down to a bucket
+      boundary (default: 24 hours before 'to')
+    - to: End of the range as a unix timestamp, exclusive (default: now)
+    - bucket: Bucket width, one of 1m, 1h, 1d (default: 1h)
+
+    Returns:
+    - ClickSeries with one point per bucket, oldest first; empty buckets
+      have 0 clicks
+
+    Notes:
+    - A range may span at most STATS_SERIES_MAX_BUCKETS buckets
+    - Minute and hour buckets are only kept for their configured retention
+      when click compaction is enabled; older ranges read as 0
+    - HTTP 404 if the URL does not exist or belongs to another user
+    """
+    return await StatService().get_click_series(uow, user, short_code, query)
@@ -1,6 +1,6 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Path, status
+from fastapi import APIRouter, Path, Request, status
 
 from api.v1.dependencies import FormDataDep, UOWDep, UserFromAccessTokenDep
 from schemas.users import (
@@ -9,6 +9,7 @@ from schemas.users import (
     UserInfoResponseSchema,
 )
 from services.auth import AuthService
+from services.login_guard import login_guard
 from services.users import UsersService
 
 
@@ -81,9 +82,16 @@ async def register_user_jwt(
                 "application/json": {"example": {"detail": "Invalid credentials"}}
             },
         },
+        429: {
+            "description": "Login attempts throttled",
+            "content": {
+                "application/json": {"example": {"detail": "Too many login attempts"}}
+            },
+        },
     },
 )
 async def get_user_token(
+    request: Request,
     form_data: FormDataDep,
     uow: UOWDep,
 ) -> TokenObtainPairSchema:
@@ -98,8 +106,13 @@ async def get_user_token(
     Returns:
     - TokenObtainPairSchema containing access and refresh tokens
     - HTTP 401 if credentials are invalid
+    - HTTP 429 with Retry-After if the client IP or the username has run out
+      of login attempts, or too many logins are in flight on the worker;
+      throttled attempts never reach the password check
     """
-    token_pair = await AuthService().obtain_tokens_by_credentials(uow, form_data)
+    client_ip = request.client.host if request.client else None
+    async with login_guard.admit(form_data.username, client_ip):
+        token_pair = await AuthService().obtain_tokens_by_credentials(uow, form_data)
     return token_pair
 
 
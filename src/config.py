@@ -27,16 +27,131 @@ class AuthJWT(BaseSettings):
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 5
     refresh_token_expire_minutes: int = 30
+    bcrypt_rounds: int = 12
+    password_hash_workers: int = 4
+    password_hash_max_pending: int = 64
 
 
 class UrlAliasSettings(BaseSettings):
     default_alias_expire_minutes: int = 1440
+    fast_redirect_enabled: bool = False
+
+
+class CacheSettings(BaseSettings):
+    redirect_cache_max_size: int = 10000
+    redirect_cache_ttl_seconds: int = 60
+    redirect_cache_warmup_enabled: bool = False
+    redirect_cache_warmup_window_seconds: int = 3600
+    redirect_cache_warmup_max_links: int = 1000
+    redirect_cache_warmup_timeout_seconds: float = 5.0
+    hot_link_sketch_capacity: int = 256
+    hot_link_top_k: int = 32
+    hot_link_min_hits: int = 100
+    hot_link_window_seconds: int = 10
+    decoded_token_cache_max_size: int = 10000
+    user_cache_max_size: int = 10000
+    user_cache_ttl_seconds: int = 5
+    user_result_cache_max_size: int = 1000
+    url_list_cache_ttl_seconds: float = 30
+    stats_cache_ttl_seconds: float = 5
+    negative_cache_max_size: int = 10000
+    negative_cache_ttl_seconds: int = 5
+    short_code_bloom_enabled: bool = False
+    short_code_bloom_capacity: int = 1_000_000
+    short_code_bloom_error_rate: float = 0.01
+
+
+class ClickBufferSettings(BaseSettings):
+    click_buffer_enabled: bool = True
+    click_buffer_max_batch_size: int = 500
+    click_buffer_max_queue_size: int = 10000
+    click_buffer_flush_interval_seconds: float = 1.0
+    click_buffer_max_retries: int = 2
+    click_buffer_retry_delay_seconds: float = 0.1
+
+
+class ClickLeaseSettings(BaseSettings):
+    """
+    Opt-in click-quota leasing for limited links (disabled when size is 0).
+
+    A worker reserves ``click_lease_size`` clicks of a link in one UPDATE and
+    spends them from memory. Unused clicks are returned when the lease is
+    idle for ``click_lease_ttl_seconds``, on deactivation and on shutdown.
+    Trade-off: clicks leased by a worker that crashes are lost, so a link may
+    stop redirecting up to ``click_lease_size`` clicks early per crash.
+    """
+
+    click_lease_size: int = 0
+    click_lease_ttl_seconds: int = 60
+
+
+class StatsSettings(BaseSettings):
+    stats_series_max_buckets: int = 1440
+    unique_visitors_enabled: bool = True
+    unique_visitors_max_window_hours: int = 48
+    trending_window_seconds: int = 300
+    trending_window_slots: int = 10
+    trending_sketch_capacity: int = 1024
+    stats_export_batch_size: int = 1000
+
+
+class ClickRetentionSettings(BaseSettings):
+    """
+    Opt-in compaction of click history.
+
+    Every click is counted in minute, hour and day rollups when it is
+    recorded, so raw clicks older than ``raw_click_retention_days`` and
+    minute or hour buckets past their retention can be deleted without
+    losing daily totals. Deletes run in batches of
+    ``click_compaction_batch_size`` rows, each in its own transaction, and
+    at most ``click_compaction_max_batches`` batches per table and run.
+    Hourly visitor sketches are kept for ``visitor_sketch_retention_days``.
+    """
+
+    click_compaction_enabled: bool = False
+    click_compaction_interval_minutes: int = 60
+    click_compaction_batch_size: int = 10000
+    click_compaction_max_batches: int = 100
+    raw_click_retention_days: int = 30
+    minute_rollup_retention_days: int = 2
+    hour_rollup_retention_days: int = 90
+    visitor_sketch_retention_days: int = 30
+
+
+class LoginThrottleSettings(BaseSettings):
+    """
+    Admission control of ``POST /api/v1/token`` in front of bcrypt.
+
+    Each attempt takes a token from its client IP's bucket and its username's
+    bucket; buckets hold up to ``*_burst`` tokens and refill at
+    ``*_per_minute``. At most ``login_max_concurrent`` logins may be checking
+    a password at once per worker.
+    """
+
+    login_throttle_enabled: bool = True
+    login_ip_burst: int = 20
+    login_ip_per_minute: float = 30
+    login_username_burst: int = 5
+    login_username_per_minute: float = 5
+    login_throttle_max_keys: int = 100000
+    login_max_concurrent: int = 8
+
+
+class AdminSettings(BaseSettings):
+    admin_usernames: list[str] = []
 
 
 class Settings:
     db: DbSettings = DbSettings()
     auth_jwt: AuthJWT = AuthJWT()
     url_alias: UrlAliasSettings = UrlAliasSettings()
+    cache: CacheSettings = CacheSettings()
+    click_buffer: ClickBufferSettings = ClickBufferSettings()
+    click_lease: ClickLeaseSettings = ClickLeaseSettings()
+    click_retention: ClickRetentionSettings = ClickRetentionSettings()
+    stats: StatsSettings = StatsSettings()
+    login_throttle: LoginThrottleSettings = LoginThrottleSettings()
+    admin: AdminSettings = AdminSettings()
 
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
 
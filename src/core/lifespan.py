@@ -3,14 +3,30 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 
+from config import get_settings
 from db.database import db_manager
+from services.cache_warmup import warm_up_redirect_cache
+from services.click_buffer import click_buffer
+from services.click_leases import click_leases
 from services.scheduler import scheduler
+from services.short_code_filter import short_code_filter
+from utils.jwt_utils import password_executor
 
 
 @asynccontextmanager
 async def db_init(app: FastAPI) -> AsyncGenerator[None, None]:
+    settings = get_settings()
     await db_manager.connect()
+    if settings.cache.short_code_bloom_enabled:
+        await short_code_filter.build(db_manager.async_session_maker)
+    if settings.cache.redirect_cache_warmup_enabled:
+        await warm_up_redirect_cache(db_manager.async_session_maker)
+    if settings.click_buffer.click_buffer_enabled:
+        await click_buffer.start(db_manager.async_session_maker)
     scheduler.start()
     yield
     scheduler.shutdown()
+    await click_buffer.stop()
+    await click_leases.release_all(db_manager.async_session_maker)
     await db_manager.close()
+    password_executor.shutdown()
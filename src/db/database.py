@@ -1,12 +1,18 @@
-from sqlalchemy import MetaData
+import time
+
+from sqlalchemy import MetaData, func, insert, literal, select, text, update
 from sqlalchemy.exc import OperationalError
 from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
     async_sessionmaker,
     create_async_engine,
 )
 
 from config import get_settings
 from models.base import Base
+from models.click_rollups import DAY, HOUR, ROLLUP_GRANULARITIES, ClickRollupModel
+from models.click_stats import ClickStatModel
+from models.short_urls import ShortURLModel
 
 
 class DatabaseManager:
@@ -22,11 +28,100 @@ class DatabaseManager:
                 metadata = MetaData()
                 await conn.run_sync(metadata.reflect)
                 existing_tables = list(metadata.tables.keys())
-                if not existing_tables:
-                    await conn.run_sync(Base.metadata.create_all)
+                await conn.run_sync(Base.metadata.create_all)
+                added_columns = await conn.run_sync(self._add_missing_columns, metadata)
+                await conn.run_sync(self._create_missing_indexes)
+                if (
+                    existing_tables
+                    and ClickRollupModel.__tablename__ not in existing_tables
+                ):
+                    await self._backfill_click_rollups(conn)
+                if "short_urls.total_clicks" in added_columns:
+                    await self._backfill_click_totals(conn)
         except OperationalError as e:
             raise e
 
+    @staticmethod
+    def _add_missing_columns(sync_conn, reflected: MetaData) -> list[str]:
+        """
+        ``create_all`` skips tables that exist; add columns they lack.
+
+        Only nullable columns and columns with a server default can be added
+        this way. Returns the added columns as ``table.column`` names.
+        """
+        preparer = sync_conn.dialect.identifier_preparer
+        added = []
+        for table in Base.metadata.sorted_tables:
+            existing = reflected.tables.get(table.name)
+            if existing is None:
+                continue
+            for column in table.columns:
+                if column.name in existing.columns:
+                    continue
+                ddl = (
+                    f"ALTER TABLE {preparer.format_table(table)} "
+                    f"ADD COLUMN {preparer.format_column(column)} "
+                    f"{column.type.compile(dialect=sync_conn.dialect)}"
+                )
+                if column.server_default is not None:
+                    ddl += f" DEFAULT {column.server_default.arg}"
+                if not column.nullable:
+                    ddl += " NOT NULL"
+                sync_conn.execute(text(ddl))
+                added.append(f"{table.name}.{column.name}")
+        return added
+
+    @staticmethod
+    def _create_missing_indexes(sync_conn) -> None:
+        """``create_all`` skips tables that exist; add indexes they lack."""
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(sync_conn, checkfirst=True)
+
+    @staticmethod
+    async def _backfill_click_rollups(conn: AsyncConnection) -> None:
+        """
+        Build rollups from raw clicks on first upgrade: daily buckets for the
+        whole history, finer buckets for the last day.
+        """
+        last_day = int(time.time()) // HOUR * HOUR - 23 * HOUR
+        for granularity in ROLLUP_GRANULARITIES:
+            since = 0 if granularity == DAY else last_day
+            bucket_start = ClickStatModel.clicked_at // granularity * granularity
+            clicks = (
+                select(
+                    ClickStatModel.short_url_id,
+                    literal(granularity),
+                    bucket_start,
+                    func.count(),  # pylint: disable=not-callable
+                )
+                .where(ClickStatModel.clicked_at >= since)
+                .group_by(ClickStatModel.short_url_id, bucket_start)
+            )
+            await conn.execute(
+                insert(ClickRollupModel).from_select(
+                    ["short_url_id", "granularity", "bucket_start", "clicks"], clicks
+                )
+            )
+
+    @staticmethod
+    async def _backfill_click_totals(conn: AsyncConnection) -> None:
+        """Set click totals of existing links from daily rollups and raw clicks."""
+        link_id = ShortURLModel.id
+        await conn.execute(
+            update(ShortURLModel).values(
+                total_clicks=select(func.coalesce(func.sum(ClickRollupModel.clicks), 0))
+                .where(
+                    ClickRollupModel.short_url_id == link_id,
+                    ClickRollupModel.granularity == DAY,
+                )
+                .scalar_subquery(),
+                last_clicked_at=select(func.max(ClickStatModel.clicked_at))
+                .where(ClickStatModel.short_url_id == link_id)
+                .scalar_subquery(),
+            )
+        )
+
     async def close(self) -> None:
         await self.engine.dispose()
 
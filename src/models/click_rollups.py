@@ -0,0 +1,30 @@
+from sqlalchemy import ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+from models.base import Base
+
+
+# Bucket widths (seconds) maintained on every click.
+MINUTE = 60
+HOUR = 3600
+DAY = 86400
+ROLLUP_GRANULARITIES = (MINUTE, HOUR, DAY)
+
+
+class ClickRollupModel(Base):
+    """Click count of one short URL in one time bucket of a given width."""
+
+    __tablename__ = "click_rollups"
+    __table_args__ = (
+        # Serves retention pruning of old buckets across all links.
+        Index(
+            "ix_click_rollups_granularity_bucket_start", "granularity", "bucket_start"
+        ),
+    )
+
+    short_url_id: Mapped[int] = mapped_column(
+        ForeignKey("short_urls.id", ondelete="CASCADE"), primary_key=True
+    )
+    granularity: Mapped[int] = mapped_column(primary_key=True)
+    bucket_start: Mapped[int] = mapped_column(primary_key=True)
+    clicks: Mapped[int] = mapped_column(nullable=False, default=0)
@@ -1,4 +1,4 @@
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column
 
 from models.base import Base
@@ -6,6 +6,10 @@ from models.base import Base
 
 class ClickStatModel(Base):
     __tablename__ = "click_stats"
+    __table_args__ = (
+        # Serves per-link, time-bounded scans of raw clicks (rollup rebuilds).
+        Index("ix_click_stats_short_url_id_clicked_at", "short_url_id", "clicked_at"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     short_url_id: Mapped[int] = mapped_column(
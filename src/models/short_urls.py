@@ -1,6 +1,6 @@
 from typing import Optional
 
-from sqlalchemy import Boolean, ForeignKey
+from sqlalchemy import Boolean, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column
 
 from models.base import Base
@@ -8,6 +8,11 @@ from models.base import Base
 
 class ShortURLModel(Base):
     __tablename__ = "short_urls"
+    __table_args__ = (
+        # Serve per-user listings sorted by popularity or recency.
+        Index("ix_short_urls_user_id_total_clicks", "user_id", "total_clicks"),
+        Index("ix_short_urls_user_id_last_clicked_at", "user_id", "last_clicked_at"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     short_code: Mapped[Optional[str]] = mapped_column(
@@ -19,3 +24,8 @@ class ShortURLModel(Base):
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
     expires_at: Mapped[int] = mapped_column(nullable=False)
+    # Maintained by StatRepository.record_clicks, one update per link and batch.
+    total_clicks: Mapped[int] = mapped_column(
+        default=0, server_default="0", nullable=False
+    )
+    last_clicked_at: Mapped[Optional[int]]
@@ -0,0 +1,24 @@
+from sqlalchemy import ForeignKey, Index, LargeBinary
+from sqlalchemy.orm import Mapped, mapped_column
+
+from models.base import Base
+
+
+# Fixed for the lifetime of the table: sketches only merge at equal precision.
+SKETCH_PRECISION = 11
+
+
+class VisitorSketchModel(Base):
+    """HyperLogLog sketch of the visitors of one short URL in one hour."""
+
+    __tablename__ = "visitor_sketches"
+    __table_args__ = (
+        # Serves retention pruning of old sketches across all links.
+        Index("ix_visitor_sketches_bucket_start", "bucket_start"),
+    )
+
+    short_url_id: Mapped[int] = mapped_column(
+        ForeignKey("short_urls.id", ondelete="CASCADE"), primary_key=True
+    )
+    bucket_start: Mapped[int] = mapped_column(primary_key=True)
+    sketch: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
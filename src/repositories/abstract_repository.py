@@ -6,6 +6,10 @@ class AbstractRepository(ABC):
     async def add_one(self, *args, **kwargs):
         raise NotImplementedError
 
+    @abstractmethod
+    async def add_many(self, *args, **kwargs):
+        raise NotImplementedError
+
     @abstractmethod
     async def edit_one(self, *args, **kwargs):
         raise NotImplementedError
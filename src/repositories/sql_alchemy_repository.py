@@ -17,16 +17,28 @@ class SQLAlchemyRepository(AbstractRepository):
         res = await self.session.execute(stmt)
         return res.scalar_one()
 
+    async def add_many(self, data: list[dict]) -> None:
+        if not data:
+            return
+        stmt = insert(self.model).values(data)
+        await self.session.execute(stmt)
+
     async def edit_one(self, elem_id: int, data: dict) -> int:
         stmt = update(self.model).values(**data).filter_by(id=elem_id)
         await self.session.execute(stmt)
 
     async def find_all(
-        self, offset: int = 0, limit: int | None = None, filter_expr=None
+        self,
+        offset: int = 0,
+        limit: int | None = None,
+        filter_expr=None,
+        order_by=(),
     ) -> List:
         stmt = select(self.model)
         if filter_expr is not None:
             stmt = stmt.filter(filter_expr)
+        if order_by:
+            stmt = stmt.order_by(*order_by)
         if offset:
             stmt = stmt.offset(offset)
         if limit:
@@ -1,6 +1,342 @@
+import asyncio
+from collections import Counter, defaultdict
+
+from sqlalchemy import and_, bindparam, case, delete, func, or_, select, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+
+from models.click_rollups import HOUR, ROLLUP_GRANULARITIES, ClickRollupModel
 from models.click_stats import ClickStatModel
+from models.short_urls import ShortURLModel
+from models.visitor_sketches import SKETCH_PRECISION, VisitorSketchModel
 from repositories.sql_alchemy_repository import SQLAlchemyRepository
+from utils.hyperloglog import HyperLogLog
+
+
+_UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+_sketches = VisitorSketchModel.__table__
+UPDATE_SKETCH = (
+    _sketches.update()
+    .where(
+        _sketches.c.short_url_id == bindparam("b_short_url_id"),
+        _sketches.c.bucket_start == bindparam("b_bucket_start"),
+    )
+    .values(sketch=bindparam("b_sketch"))
+)
+
+_urls = ShortURLModel.__table__
+UPDATE_TOTALS = (
+    _urls.update()
+    .where(_urls.c.id == bindparam("b_id"))
+    .values(
+        total_clicks=_urls.c.total_clicks + bindparam("b_clicks"),
+        last_clicked_at=case(
+            (
+                or_(
+                    _urls.c.last_clicked_at.is_(None),
+                    _urls.c.last_clicked_at < bindparam("b_last_clicked_at"),
+                ),
+                bindparam("b_last_clicked_at"),
+            ),
+            else_=_urls.c.last_clicked_at,
+        ),
+    )
+)
+
+
+def _merged_sketch_params(
+    visitors: dict[tuple[int, int], list[int]], stored: list[tuple[int, int, bytes]]
+) -> list[dict]:
+    """
+    Sketch each (link, hour)'s visitor hashes, fold in the ``stored`` sketch
+    rows and serialize the results as ``UPDATE_SKETCH`` parameters.
+    """
+    sketches = {}
+    for key, hashes in visitors.items():
+        sketch = sketches[key] = HyperLogLog(SKETCH_PRECISION)
+        for visitor in hashes:
+            sketch.add_hash(visitor)
+    for url_id, bucket, data in stored:
+        sketches[url_id, bucket].merge(HyperLogLog.from_bytes(data))
+    return [
+        {
+            "b_short_url_id": url_id,
+            "b_bucket_start": bucket,
+            "b_sketch": sketches[url_id, bucket].to_bytes(),
+        }
+        for url_id, bucket in sorted(sketches)
+    ]
 
 
 class StatRepository(SQLAlchemyRepository):
     model = ClickStatModel
+
+    async def record_clicks(self, clicks: list[dict]) -> None:
+        """
+        Insert raw click events and add them to the click rollups, to the
+        links' click totals and, for clicks carrying a hashed ``visitor``, to
+        the hourly visitor sketches.
+
+        Each batch is folded into per-bucket and per-link counts first, so the
+        rollups cost one upsert row per (link, bucket) and the totals one
+        update per link regardless of the batch size. Rows are written in key
+        order so concurrent flushes cannot deadlock. The totals update runs last:
+        its ``short_urls`` row locks block link edits and deletes, so they are
+        taken only once the sketch merges and rollups are done.
+        """
+        if not clicks:
+            return
+        buckets = Counter(
+            (click["short_url_id"], granularity, click["clicked_at"] // granularity)
+            for click in clicks
+            for granularity in ROLLUP_GRANULARITIES
+        )
+        await self.add_many(
+            [
+                {
+                    "short_url_id": click["short_url_id"],
+                    "clicked_at": click["clicked_at"],
+                }
+                for click in clicks
+            ]
+        )
+        await self.add_visitors(
+            [click for click in clicks if click.get("visitor") is not None]
+        )
+        await self.add_to_rollups(
+            [
+                {
+                    "short_url_id": short_url_id,
+                    "granularity": granularity,
+                    "bucket_start": bucket * granularity,
+                    "clicks": count,
+                }
+                for (short_url_id, granularity, bucket), count in sorted(
+                    buckets.items()
+                )
+            ]
+        )
+        await self.add_to_totals(clicks)
+
+    async def add_to_rollups(self, rows: list[dict]) -> None:
+        """Add ``clicks`` of each row to its bucket, creating missing buckets."""
+        if not rows:
+            return
+        dialect = self.session.get_bind().dialect.name
+        stmt = _UPSERT_INSERTS[dialect](ClickRollupModel).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["short_url_id", "granularity", "bucket_start"],
+            set_={"clicks": ClickRollupModel.clicks + stmt.excluded.clicks},
+        )
+        await self.session.execute(stmt)
+
+    async def add_to_totals(self, clicks: list[dict]) -> None:
+        """Add clicks to ``total_clicks`` and advance ``last_clicked_at`` per link."""
+        totals: Counter[int] = Counter()
+        last_clicked: dict[int, int] = {}
+        for click in clicks:
+            url_id = click["short_url_id"]
+            totals[url_id] += 1
+            last_clicked[url_id] = max(last_clicked.get(url_id, 0), click["clicked_at"])
+        await self.session.execute(
+            UPDATE_TOTALS,
+            [
+                {
+                    "b_id": url_id,
+                    "b_clicks": totals[url_id],
+                    "b_last_clicked_at": last_clicked[url_id],
+                }
+                for url_id in sorted(totals)
+            ],
+        )
+
+    async def add_visitors(self, clicks: list[dict]) -> None:
+        """
+        Merge the ``visitor`` hashes of clicks into their hourly sketches.
+
+        The stored sketches are read under row locks (missing rows are created
+        first so they can be locked), so concurrent workers never overwrite
+        each other's visitors. Sketching, merging and compressing run in a
+        worker thread; only the statements run on the event loop.
+        """
+        if not clicks:
+            return
+        visitors: dict[tuple[int, int], list[int]] = defaultdict(list)
+        for click in clicks:
+            key = (click["short_url_id"], click["clicked_at"] // HOUR * HOUR)
+            visitors[key].append(click["visitor"])
+        keys = sorted(visitors)
+
+        dialect = self.session.get_bind().dialect.name
+        empty = HyperLogLog(SKETCH_PRECISION).to_bytes()
+        await self.session.execute(
+            _UPSERT_INSERTS[dialect](VisitorSketchModel)
+            .values(
+                [
+                    {"short_url_id": url_id, "bucket_start": bucket, "sketch": empty}
+                    for url_id, bucket in keys
+                ]
+            )
+            .on_conflict_do_nothing()
+        )
+        stored = await self.session.execute(
+            select(
+                _sketches.c.short_url_id, _sketches.c.bucket_start, _sketches.c.sketch
+            )
+            .where(tuple_(_sketches.c.short_url_id, _sketches.c.bucket_start).in_(keys))
+            .order_by(_sketches.c.short_url_id, _sketches.c.bucket_start)
+            .with_for_update()
+        )
+        await self.session.execute(
+            UPDATE_SKETCH,
+            await asyncio.to_thread(_merged_sketch_params, visitors, stored.all()),
+        )
+
+    async def visitor_sketches(
+        self, short_url_ids: list[int], since: int
+    ) -> dict[int, list[tuple[int, bytes]]]:
+        """Map each link to its ``(bucket_start, sketch)`` pairs since ``since``."""
+        result = await self.session.execute(
+            select(
+                VisitorSketchModel.short_url_id,
+                VisitorSketchModel.bucket_start,
+                VisitorSketchModel.sketch,
+            ).where(
+                VisitorSketchModel.short_url_id.in_(short_url_ids),
+                VisitorSketchModel.bucket_start >= since,
+            )
+        )
+        sketches: dict[int, list[tuple[int, bytes]]] = {}
+        for short_url_id, bucket_start, sketch in result:
+            sketches.setdefault(short_url_id, []).append((bucket_start, sketch))
+        return sketches
+
+    async def stream_user_clicks(
+        self, user_id: int, bounds: tuple[int | None, int | None], batch_size: int
+    ):
+        """
+        Stream ``(short_code, clicked_at)`` of the user's raw clicks within
+        ``[start, end)`` in time order, fetching ``batch_size`` rows at a time.
+        """
+        start, end = bounds
+        stmt = (
+            select(ShortURLModel.short_code, ClickStatModel.clicked_at)
+            .join(ShortURLModel, ShortURLModel.id == ClickStatModel.short_url_id)
+            .where(ShortURLModel.user_id == user_id)
+            .order_by(ClickStatModel.clicked_at, ClickStatModel.id)
+            .execution_options(yield_per=batch_size)
+        )
+        if start is not None:
+            stmt = stmt.where(ClickStatModel.clicked_at >= start)
+        if end is not None:
+            stmt = stmt.where(ClickStatModel.clicked_at < end)
+        return await self.session.stream(stmt)
+
+    async def stream_link_clicks(
+        self,
+        user_id: int,
+        granularity: int,
+        bounds: tuple[int, int | None],
+        batch_size: int,
+    ):
+        """
+        Stream each of the user's links with its click count from the
+        ``granularity`` rollup buckets starting within ``[start, end)``.
+        """
+        start, end = bounds
+        in_range = [
+            ClickRollupModel.short_url_id == ShortURLModel.id,
+            ClickRollupModel.granularity == granularity,
+            ClickRollupModel.bucket_start >= start,
+        ]
+        if end is not None:
+            in_range.append(ClickRollupModel.bucket_start < end)
+        stmt = (
+            select(
+                ShortURLModel.short_code,
+                ShortURLModel.original_url,
+                ShortURLModel.tag,
+                ShortURLModel.is_active,
+                func.coalesce(func.sum(ClickRollupModel.clicks), 0).label("clicks"),
+                ShortURLModel.total_clicks,
+                ShortURLModel.last_clicked_at,
+            )
+            .outerjoin(ClickRollupModel, and_(*in_range))
+            .where(ShortURLModel.user_id == user_id)
+            .group_by(ShortURLModel.id)
+            .order_by(ShortURLModel.id)
+            .execution_options(yield_per=batch_size)
+        )
+        return await self.session.stream(stmt)
+
+    async def rollup_series(
+        self, short_url_id: int, granularity: int, start: int, end: int
+    ) -> dict[int, int]:
+        """Map bucket start to clicks for non-empty buckets in ``[start, end)``."""
+        result = await self.session.execute(
+            select(ClickRollupModel.bucket_start, ClickRollupModel.clicks).where(
+                ClickRollupModel.short_url_id == short_url_id,
+                ClickRollupModel.granularity == granularity,
+                ClickRollupModel.bucket_start >= start,
+                ClickRollupModel.bucket_start < end,
+            )
+        )
+        return dict(result.tuples().all())
+
+    async def delete_clicks_before(self, before: int, limit: int) -> int:
+        """Delete up to ``limit`` raw clicks older than ``before``; return the count."""
+        oldest = (
+            select(ClickStatModel.id)
+            .where(ClickStatModel.clicked_at < before)
+            .order_by(ClickStatModel.id)
+            .limit(limit)
+        )
+        result = await self.session.execute(
+            delete(ClickStatModel)
+            .where(ClickStatModel.id.in_(oldest))
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
+    async def delete_rollups_before(
+        self, granularity: int, before: int, limit: int
+    ) -> int:
+        """Delete up to ``limit`` buckets of ``granularity`` starting before ``before``."""
+        key = tuple_(
+            ClickRollupModel.short_url_id,
+            ClickRollupModel.granularity,
+            ClickRollupModel.bucket_start,
+        )
+        oldest = (
+            select(
+                ClickRollupModel.short_url_id,
+                ClickRollupModel.granularity,
+                ClickRollupModel.bucket_start,
+            )
+            .where(
+                ClickRollupModel.granularity == granularity,
+                ClickRollupModel.bucket_start < before,
+            )
+            .limit(limit)
+        )
+        result = await self.session.execute(
+            delete(ClickRollupModel)
+            .where(key.in_(oldest))
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
+    async def delete_visitor_sketches_before(self, before: int, limit: int) -> int:
+        """Delete up to ``limit`` visitor sketches of hours before ``before``."""
+        key = tuple_(_sketches.c.short_url_id, _sketches.c.bucket_start)
+        oldest = (
+            select(_sketches.c.short_url_id, _sketches.c.bucket_start)
+            .where(_sketches.c.bucket_start < before)
+            .limit(limit)
+        )
+        result = await self.session.execute(
+            delete(VisitorSketchModel)
+            .where(key.in_(oldest))
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
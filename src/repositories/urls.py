@@ -1,6 +1,171 @@
+from enum import Enum
+
+from sqlalchemy import bindparam, func, or_, select, update
+
+from models.click_rollups import HOUR, MINUTE, ClickRollupModel
 from models.short_urls import ShortURLModel
 from repositories.sql_alchemy_repository import SQLAlchemyRepository
 
 
+class ClickRejectReason(str, Enum):
+    """Why a click on a limited link could not be spent."""
+
+    NOT_FOUND = "not_found"
+    NOT_ACTIVE = "not_active"
+    EXPIRED = "expired"
+    CLICKS_LIMIT_REACHED = "clicks_limit_reached"
+
+
+_short_urls = ShortURLModel.__table__
+
+# Core statement built once at import: it hits SQLAlchemy's compiled cache on
+# every execution, and asyncpg reuses the prepared statement it caches per
+# connection for identical SQL.
+REDIRECT_TARGET_QUERY = select(
+    _short_urls.c.id,
+    _short_urls.c.original_url,
+    _short_urls.c.is_active,
+    _short_urls.c.expires_at,
+    _short_urls.c.clicks_left,
+).where(_short_urls.c.short_code == bindparam("short_code"))
+
+
 class UrlsRepository(SQLAlchemyRepository):
     model = ShortURLModel
+
+    async def find_redirect_target(self, short_code: str):
+        """
+        Fetch the columns the redirect needs as a plain row.
+
+        Unlike ``find_one`` this skips ORM entity construction and identity
+        map bookkeeping.
+        """
+        result = await self.session.execute(
+            REDIRECT_TARGET_QUERY, {"short_code": short_code}
+        )
+        return result.first()
+
+    async def existing_ids(self, ids: set[int]) -> set[int]:
+        """Return the subset of ``ids`` that still have a short URL row."""
+        result = await self.session.scalars(
+            select(ShortURLModel.id).where(ShortURLModel.id.in_(ids))
+        )
+        return set(result)
+
+    async def stream_most_clicked_targets(self, since: int, now: int, limit: int):
+        """
+        Stream redirect rows of the ``limit`` most clicked links since ``since``.
+
+        Only active, unexpired links with clicks left are returned. Clicks
+        are summed from the click rollups rather than raw clicks, through
+        their (granularity, bucket_start) index: hour buckets for windows of
+        a day or more, minute buckets otherwise, starting with the bucket
+        ``since`` falls in. Counts and rows are joined in a single query;
+        rows carry the ``REDIRECT_TARGET_QUERY`` columns plus ``short_code``.
+        """
+        granularity = HOUR if now - since >= 24 * HOUR else MINUTE
+        clicks = (
+            select(
+                ClickRollupModel.short_url_id,
+                func.sum(ClickRollupModel.clicks).label("clicks"),
+            )
+            .where(
+                ClickRollupModel.granularity == granularity,
+                ClickRollupModel.bucket_start >= since // granularity * granularity,
+            )
+            .group_by(ClickRollupModel.short_url_id)
+            .subquery()
+        )
+        stmt = (
+            select(
+                _short_urls.c.short_code,
+                *REDIRECT_TARGET_QUERY.selected_columns,
+            )
+            .join(clicks, clicks.c.short_url_id == _short_urls.c.id)
+            .where(
+                _short_urls.c.short_code.is_not(None),
+                _short_urls.c.is_active,
+                _short_urls.c.expires_at >= now,
+                or_(_short_urls.c.clicks_left.is_(None), _short_urls.c.clicks_left > 0),
+            )
+            .order_by(clicks.c.clicks.desc())
+            .limit(limit)
+        )
+        return await self.session.stream(stmt)
+
+    async def consume_click(self, short_code: str, now: int):
+        """
+        Validate a limited link and spend one of its clicks in one UPDATE.
+
+        The conditional ``UPDATE ... RETURNING`` is atomic, so concurrent
+        redirects can never push ``clicks_left`` below zero.
+
+        Returns:
+            ``(row, None)`` where row has ``id`` and ``original_url`` if the
+            click was spent, otherwise ``(None, ClickRejectReason)``.
+        """
+        stmt = (
+            update(ShortURLModel)
+            .where(
+                ShortURLModel.short_code == short_code,
+                ShortURLModel.is_active,
+                ShortURLModel.expires_at >= now,
+                ShortURLModel.clicks_left > 0,
+            )
+            .values(clicks_left=ShortURLModel.clicks_left - 1)
+            .returning(ShortURLModel.id, ShortURLModel.original_url)
+            .execution_options(synchronize_session=False)
+        )
+        row = (await self.session.execute(stmt)).first()
+        if row is not None:
+            return row, None
+        return None, await self._reject_reason(short_code, now)
+
+    async def lease_clicks(self, short_code: str, size: int, now: int):
+        """
+        Reserve ``size`` clicks of a valid limited link in one UPDATE.
+
+        A lease is only granted while more than ``size`` clicks remain, so the
+        last clicks of a link are always spent through ``consume_click`` and a
+        leased link never reaches ``clicks_left == 0`` in the database.
+
+        Returns:
+            Row with ``id`` and ``original_url``, or None if no lease was granted.
+        """
+        stmt = (
+            update(ShortURLModel)
+            .where(
+                ShortURLModel.short_code == short_code,
+                ShortURLModel.is_active,
+                ShortURLModel.expires_at >= now,
+                ShortURLModel.clicks_left > size,
+            )
+            .values(clicks_left=ShortURLModel.clicks_left - size)
+            .returning(ShortURLModel.id, ShortURLModel.original_url)
+            .execution_options(synchronize_session=False)
+        )
+        return (await self.session.execute(stmt)).first()
+
+    async def release_clicks(self, url_id: int, count: int) -> None:
+        """Give ``count`` unused leased clicks back to the link."""
+        stmt = (
+            update(ShortURLModel)
+            .where(ShortURLModel.id == url_id)
+            .values(clicks_left=ShortURLModel.clicks_left + count)
+            .execution_options(synchronize_session=False)
+        )
+        await self.session.execute(stmt)
+
+    async def _reject_reason(self, short_code: str, now: int) -> ClickRejectReason:
+        stmt = select(
+            ShortURLModel.is_active,
+            ShortURLModel.expires_at,
+        ).where(ShortURLModel.short_code == short_code)
+        row = (await self.session.execute(stmt)).first()
+        if row is None:
+            return ClickRejectReason.NOT_FOUND
+        if not row.is_active:
+            return ClickRejectReason.NOT_ACTIVE
+        if row.expires_at < now:
+            return ClickRejectReason.EXPIRED
+        return ClickRejectReason.CLICKS_LIMIT_REACHED
@@ -0,0 +1,35 @@
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class HotLinkInfo(BaseModel):
+    """Schema for a short code that currently takes a large share of redirects."""
+
+    short_code: str = Field(
+        description="The short code being redirected",
+        examples=["promo2024", "abc123"],
+    )
+    hits: int = Field(
+        description="Estimated recent redirects, halved every detection window",
+        examples=[15234, 980],
+    )
+    max_overcount: int = Field(
+        description="Upper bound of the overestimation included in hits",
+        examples=[0, 12],
+    )
+    pinned: bool = Field(
+        description="Whether the link is pinned in the redirect cache",
+        examples=[True, False],
+    )
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "examples": [
+                {
+                    "short_code": "promo2024",
+                    "hits": 15234,
+                    "max_overcount": 0,
+                    "pinned": True,
+                }
+            ]
+        }
+    )
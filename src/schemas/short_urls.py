@@ -1,3 +1,4 @@
+from enum import Enum
 from typing import Optional
 
 from pydantic import BaseModel, ConfigDict, Field, HttpUrl, field_validator
@@ -81,6 +82,16 @@ class ShortURLInfo(BaseModel):
         description="Optional tag used for grouping links",
         examples=["marketing", "social", "documentation"],
     )
+    total_clicks: int = Field(
+        default=0,
+        description="Number of redirects served over the link's lifetime",
+        examples=[0, 1520],
+    )
+    last_clicked_at: Optional[int] = Field(
+        default=None,
+        description="Unix timestamp of the latest redirect. None if never clicked.",
+        examples=[1712345000, None],
+    )
 
     model_config = ConfigDict(
         from_attributes=True,
@@ -93,6 +104,8 @@ class ShortURLInfo(BaseModel):
                     "clicks_left": 42,
                     "is_active": True,
                     "tag": "marketing",
+                    "total_clicks": 1520,
+                    "last_clicked_at": 1712345000,
                 }
             ]
         },
@@ -138,6 +151,25 @@ class ShortURLFilters(BaseModel):
     )
 
 
+class URLSortField(str, Enum):
+    """Column that orders a URL listing."""
+
+    CREATED = "created"
+    TOTAL_CLICKS = "total_clicks"
+    LAST_CLICKED_AT = "last_clicked_at"
+
+
+class ShortURLListFilters(ShortURLFilters):
+    """Schema for filtering and sorting the user's URL listing."""
+
+    sort_by: URLSortField = Field(
+        default=URLSortField.CREATED,
+        description="Order by creation (oldest first), or by total clicks or "
+        "latest click (most first, never clicked last)",
+        examples=["total_clicks", "last_clicked_at"],
+    )
+
+
 class ShortURLDeactivateResponse(BaseModel):
     """Schema for deactivate URL response."""
 
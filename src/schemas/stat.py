@@ -1,4 +1,36 @@
-from pydantic import BaseModel, ConfigDict, Field, HttpUrl
+import re
+from enum import Enum
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict, Field, HttpUrl, field_validator
+
+from schemas.short_urls import ShortURLFilters
+
+
+WINDOW_UNITS = {"m": 60, "h": 3600, "d": 86400}
+MAX_STATS_WINDOWS = 8
+MAX_STATS_WINDOW_SECONDS = 366 * 86400
+MAX_MINUTE_WINDOW_SECONDS = 86400
+
+
+def parse_window(label: str) -> int:
+    """
+    Convert a window such as ``5m``, ``24h`` or ``7d`` to seconds.
+
+    Windows longer than a day must be whole hours: they are counted from hour
+    rollups, while minute rollups are only kept for a couple of days.
+    """
+    match = re.fullmatch(r"([1-9][0-9]*)([mhd])", label)
+    if match is None:
+        raise ValueError(f"Invalid window '{label}', expected e.g. 5m, 1h or 7d")
+    seconds = int(match[1]) * WINDOW_UNITS[match[2]]
+    if seconds > MAX_STATS_WINDOW_SECONDS:
+        raise ValueError(f"Window '{label}' is longer than 366 days")
+    if seconds > MAX_MINUTE_WINDOW_SECONDS and seconds % 3600:
+        raise ValueError(
+            f"Window '{label}' is longer than 24 hours and must be whole hours"
+        )
+    return seconds
 
 
 class URLClickStats(BaseModel):
@@ -18,6 +50,23 @@ class URLClickStats(BaseModel):
     clicks_last_day: int = Field(
         description="Number of clicks in the last 24 hours", examples=[1234, 5678, 9012]
     )
+    clicks: dict[str, int] = Field(
+        default_factory=dict,
+        description="Number of clicks in each requested window",
+        examples=[{"5m": 3, "1h": 42, "24h": 1234, "7d": 6789}],
+    )
+    unique_visitors_last_day: Optional[int] = Field(
+        default=None,
+        description="Approximate number of distinct visitors (IP and user agent) "
+        "in the last 24 hours; null when unique counting is disabled",
+        examples=[876],
+    )
+    unique_visitors: dict[str, int] = Field(
+        default_factory=dict,
+        description="Approximate distinct visitors in each requested window that "
+        "is a whole number of hours, up to the configured maximum",
+        examples=[{"1h": 40, "24h": 876, "7d": 4321}],
+    )
 
     model_config = ConfigDict(
         from_attributes=True,
@@ -28,13 +77,202 @@ class URLClickStats(BaseModel):
                     "short_code": "promo2024",
                     "clicks_last_hour": 42,
                     "clicks_last_day": 1234,
+                    "clicks": {"1h": 42, "24h": 1234},
+                    "unique_visitors_last_day": 876,
+                    "unique_visitors": {"1h": 40, "24h": 876},
                 },
                 {
                     "original_url": "https://another-example.com/path",
                     "short_code": "abc123",
                     "clicks_last_hour": 156,
                     "clicks_last_day": 5678,
+                    "clicks": {"1h": 156, "24h": 5678},
+                    "unique_visitors_last_day": 4012,
+                    "unique_visitors": {"1h": 150, "24h": 4012},
                 },
             ]
         },
     )
+
+
+class URLStatsFilters(ShortURLFilters):
+    """Schema for filtering and windowing URL click statistics."""
+
+    windows: list[str] = Field(
+        default=["1h", "24h"],
+        description="Windows to count clicks in, comma-separated or repeated: "
+        "a positive number followed by m, h or d; windows longer than a day "
+        "must be whole hours",
+        examples=[["5m", "1h", "24h", "7d"]],
+    )
+    sort_by: str = Field(
+        default="24h",
+        description="Window whose click count orders the results (most first)",
+        examples=["24h", "7d"],
+    )
+
+    @field_validator("windows", mode="before")
+    @classmethod
+    def split_windows(cls, v):
+        labels = [v] if isinstance(v, str) else v
+        windows = []
+        for label in (part.strip() for item in labels for part in item.split(",")):
+            parse_window(label)
+            if label not in windows:
+                windows.append(label)
+        if not windows or len(windows) > MAX_STATS_WINDOWS:
+            raise ValueError(f"Request between 1 and {MAX_STATS_WINDOWS} windows")
+        return windows
+
+    @field_validator("sort_by")
+    @classmethod
+    def validate_sort_by(cls, v: str) -> str:
+        parse_window(v)
+        return v
+
+
+class SeriesBucket(str, Enum):
+    """Width of one time-series bucket."""
+
+    MINUTE = "1m"
+    HOUR = "1h"
+    DAY = "1d"
+
+    @property
+    def seconds(self) -> int:
+        return {"1m": 60, "1h": 3600, "1d": 86400}[self.value]
+
+
+class ClickSeriesQuery(BaseModel):
+    """Query parameters of the click time series."""
+
+    start: Optional[int] = Field(
+        default=None,
+        alias="from",
+        description="Unix timestamp, rounded down to a bucket boundary. "
+        "Defaults to 24 hours before 'to'",
+        examples=[1712340000],
+    )
+    end: Optional[int] = Field(
+        default=None,
+        alias="to",
+        description="Unix timestamp (exclusive). Defaults to now",
+        examples=[1712426400],
+    )
+    bucket: SeriesBucket = Field(
+        default=SeriesBucket.HOUR, description="Bucket width", examples=["1h"]
+    )
+
+    # FastAPI fills query parameter models by field name, so ``from`` and
+    # ``to`` only reach the aliased fields with populate_by_name.
+    model_config = ConfigDict(populate_by_name=True)
+
+
+class ClickSeriesPoint(BaseModel):
+    """Number of clicks in one time bucket."""
+
+    bucket_start: int = Field(
+        description="Unix timestamp of the start of the bucket", examples=[1712343600]
+    )
+    clicks: int = Field(description="Number of clicks in the bucket", examples=[42])
+
+
+class ClickSeries(BaseModel):
+    """Schema for bucketed click counts of one URL."""
+
+    short_code: str = Field(
+        description="The unique short code for the URL",
+        examples=["abc123", "promo2024"],
+    )
+    bucket: SeriesBucket = Field(description="Bucket width", examples=["1h"])
+    points: list[ClickSeriesPoint] = Field(
+        description="One point per bucket in the requested range, oldest first"
+    )
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "examples": [
+                {
+                    "short_code": "promo2024",
+                    "bucket": "1h",
+                    "points": [
+                        {"bucket_start": 1712340000, "clicks": 12},
+                        {"bucket_start": 1712343600, "clicks": 42},
+                    ],
+                }
+            ]
+        },
+    )
+
+
+class TrendingLink(BaseModel):
+    """Schema for a short code among the most redirected right now."""
+
+    short_code: str = Field(
+        description="The short code being redirected",
+        examples=["promo2024", "abc123"],
+    )
+    clicks: int = Field(
+        description="Estimated redirects within the trending window",
+        examples=[5230, 410],
+    )
+    max_overcount: int = Field(
+        description="Upper bound of the overestimation included in clicks",
+        examples=[0, 7],
+    )
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "examples": [
+                {"short_code": "promo2024", "clicks": 5230, "max_overcount": 0}
+            ]
+        }
+    )
+
+
+class ExportKind(str, Enum):
+    """Rows of a statistics export."""
+
+    CLICKS = "clicks"
+    LINKS = "links"
+
+
+class ExportFormat(str, Enum):
+    """Serialization of a statistics export."""
+
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+    @property
+    def media_type(self) -> str:
+        return {"ndjson": "application/x-ndjson", "csv": "text/csv"}[self.value]
+
+
+class StatsExportQuery(BaseModel):
+    """Query parameters of the statistics export."""
+
+    kind: ExportKind = Field(
+        default=ExportKind.LINKS,
+        description="'clicks' for one row per raw click, 'links' for one row "
+        "of click totals per URL",
+        examples=["clicks", "links"],
+    )
+    format: ExportFormat = Field(
+        default=ExportFormat.NDJSON,
+        description="Output format",
+        examples=["ndjson", "csv"],
+    )
+    start: Optional[int] = Field(
+        default=None,
+        alias="from",
+        description="Unix timestamp; only clicks at or after it are exported",
+        examples=[1712340000],
+    )
+    end: Optional[int] = Field(
+        default=None,
+        alias="to",
+        description="Unix timestamp (exclusive); only clicks before it are exported",
+        examples=[1712426400],
+    )
+
+    model_config = ConfigDict(populate_by_name=True)
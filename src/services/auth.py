@@ -6,6 +6,7 @@ from schemas.users import (
     TokenType,
     UserInfoResponseSchema,
 )
+from services.user_cache import CachedUser, user_cache
 from utils.jwt_utils import jwt_service
 from utils.unitofwork import IUnitOfWork
 
@@ -18,7 +19,7 @@ class AuthService:
         async with uow:
             user = await uow.users.find_one(username=form_data.username)
 
-            if not user or not jwt_service.validate_password(
+            if not user or not await jwt_service.validate_password_async(
                 form_data.password, user.password if user else dummy_hash
             ):
                 raise HTTPException(
@@ -31,13 +32,26 @@ class AuthService:
     async def get_user_by_access_token(
         self, uow: IUnitOfWork, token: str
     ) -> UserInfoResponseSchema:
+        """
+        Resolve the user of an access token.
+
+        The user's username and token version are cached for a few seconds,
+        so most requests are authenticated without a database query. A token
+        whose version differs from the cached one is checked against the
+        database before it is rejected.
+        """
         token_payload = jwt_service.decode_jwt(token)
         jwt_service.validate_token_type(token_payload, TokenType.ACCESS)
-        async with uow:
-            user = await uow.users.find_one(id=token_payload.id)
-            jwt_service.validate_token_version(token_payload, user.token_version)
-            response = UserInfoResponseSchema(id=user.id, username=user.username)
-            return response
+        user = user_cache.get(token_payload.id)
+        if user is None or user.token_version != token_payload.token_version:
+            async with uow:
+                user_row = await uow.users.find_one(id=token_payload.id)
+                user = CachedUser(
+                    username=user_row.username, token_version=user_row.token_version
+                )
+            user_cache.set(token_payload.id, user)
+        jwt_service.validate_token_version(token_payload, user.token_version)
+        return UserInfoResponseSchema(id=token_payload.id, username=user.username)
 
     async def refresh_tokens(
         self, uow: IUnitOfWork, refresh_token: str
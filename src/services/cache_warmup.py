@@ -0,0 +1,57 @@
+import asyncio
+import logging
+import time
+
+from config import get_settings
+from services.redirect_cache import RedirectTarget, redirect_cache
+from utils.unitofwork import UnitOfWork
+
+
+logger = logging.getLogger(__name__)
+
+
+async def warm_up_redirect_cache(session_factory) -> int:
+    """
+    Preload the redirect cache with the most clicked links of the recent past.
+
+    Loads at most ``redirect_cache_warmup_max_links`` links (never more than
+    the cache holds) clicked within ``redirect_cache_warmup_window_seconds``,
+    using one query. Rows are cached as they stream in, so when the query
+    exceeds ``redirect_cache_warmup_timeout_seconds`` startup continues with
+    whatever was loaded so far.
+
+    Returns:
+        Number of links added to the cache.
+    """
+    settings = get_settings().cache
+    now = int(time.time())
+    limit = min(settings.redirect_cache_warmup_max_links, redirect_cache.maxsize)
+    loaded = 0
+
+    async def load() -> None:
+        nonlocal loaded
+        uow = UnitOfWork(session_factory)
+        async with uow:
+            rows = await uow.urls.stream_most_clicked_targets(
+                since=now - settings.redirect_cache_warmup_window_seconds,
+                now=now,
+                limit=limit,
+            )
+            async for row in rows:
+                redirect_cache.add(row.short_code, RedirectTarget.from_row(row))
+                loaded += 1
+
+    started = time.perf_counter()
+    try:
+        await asyncio.wait_for(load(), settings.redirect_cache_warmup_timeout_seconds)
+    except asyncio.TimeoutError:
+        logger.warning("Redirect cache warm-up timed out after %d links", loaded)
+    except Exception:  # pylint: disable=broad-exception-caught
+        logger.exception("Redirect cache warm-up failed after %d links", loaded)
+    else:
+        logger.info(
+            "Warmed up redirect cache with %d links in %.0f ms",
+            loaded,
+            (time.perf_counter() - started) * 1000,
+        )
+    return loaded
@@ -0,0 +1,158 @@
+import asyncio
+import logging
+import time
+
+from sqlalchemy.exc import IntegrityError
+
+from config import get_settings
+from utils.unitofwork import UnitOfWork
+
+
+logger = logging.getLogger(__name__)
+
+
+class ClickBuffer:
+    """
+    In-memory buffer of click events flushed to ``click_stats`` and the click
+    rollups in batches.
+
+    Redirects enqueue events instead of writing them; a background task
+    writes them with one multi-row INSERT and one rollup upsert whenever
+    ``max_batch_size`` events are pending or ``flush_interval`` seconds have
+    passed. When the queue is full, producers wait for the next flush
+    (backpressure). Pending events are flushed on ``stop``.
+
+    A failed flush is retried up to ``click_buffer_max_retries`` times. On an
+    integrity error, clicks of links deleted since the redirect are dropped
+    before the retry so the rest of the batch is kept.
+    """
+
+    def __init__(
+        self,
+        max_batch_size: int,
+        max_queue_size: int,
+        flush_interval: float,
+    ) -> None:
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self._session_factory = None
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue_size)
+        self._batch_ready = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._metrics = {
+            "flushed_events": 0,
+            "flushes": 0,
+            "dropped_events": 0,
+            "retries": 0,
+            "backpressure_waits": 0,
+            "last_flush_latency_ms": 0.0,
+            "max_flush_latency_ms": 0.0,
+        }
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    async def start(self, session_factory) -> None:
+        self._session_factory = session_factory
+        self._queue = asyncio.Queue(maxsize=self._queue.maxsize)
+        self._batch_ready = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is None:
+            return
+        self._batch_ready.set()
+        await task
+        await self.flush()
+
+    async def put(self, click: dict) -> None:
+        if self._queue.full():
+            self._metrics["backpressure_waits"] += 1
+            self._batch_ready.set()
+        await self._queue.put(click)
+        if self._queue.qsize() >= self.max_batch_size:
+            self._batch_ready.set()
+
+    async def flush(self) -> None:
+        """Write every pending event, ``max_batch_size`` rows per INSERT."""
+        while not self._queue.empty():
+            batch = []
+            while len(batch) < self.max_batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            await self._write(batch)
+
+    async def _run(self) -> None:
+        while self._task is not None:
+            try:
+                await asyncio.wait_for(self._batch_ready.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._batch_ready.clear()
+            await self.flush()
+
+    async def _write(self, batch: list[dict]) -> None:
+        started = time.perf_counter()
+        settings = get_settings().click_buffer
+        for attempt in range(settings.click_buffer_max_retries + 1):
+            if attempt:
+                self._metrics["retries"] += 1
+                await asyncio.sleep(settings.click_buffer_retry_delay_seconds)
+            try:
+                uow = UnitOfWork(self._session_factory)
+                async with uow:
+                    await uow.stat.record_clicks(batch)
+                    await uow.commit()
+                break
+            except IntegrityError:
+                logger.warning("Click flush hit an integrity error, dropping orphans")
+                batch = await self._drop_deleted_links(batch)
+                if not batch:
+                    return
+            except Exception:  # pylint: disable=broad-exception-caught
+                logger.warning(
+                    "Failed to flush %d click events", len(batch), exc_info=True
+                )
+        else:
+            logger.error("Dropping %d click events after retries", len(batch))
+            self._metrics["dropped_events"] += len(batch)
+            return
+
+        latency_ms = (time.perf_counter() - started) * 1000
+        self._metrics["flushes"] += 1
+        self._metrics["flushed_events"] += len(batch)
+        self._metrics["last_flush_latency_ms"] = latency_ms
+        self._metrics["max_flush_latency_ms"] = max(
+            self._metrics["max_flush_latency_ms"], latency_ms
+        )
+
+    async def _drop_deleted_links(self, batch: list[dict]) -> list[dict]:
+        """Drop clicks of links that no longer exist; keep the batch on error."""
+        try:
+            uow = UnitOfWork(self._session_factory)
+            async with uow:
+                existing = await uow.urls.existing_ids(
+                    {click["short_url_id"] for click in batch}
+                )
+        except Exception:  # pylint: disable=broad-exception-caught
+            logger.warning("Failed to look up clicked links", exc_info=True)
+            return batch
+        kept = [click for click in batch if click["short_url_id"] in existing]
+        self._metrics["dropped_events"] += len(batch) - len(kept)
+        return kept
+
+    def stats(self) -> dict:
+        return {
+            "running": self.running,
+            "queue_depth": self._queue.qsize(),
+            "max_queue_size": self._queue.maxsize,
+            **self._metrics,
+        }
+
+
+click_buffer = ClickBuffer(
+    max_batch_size=get_settings().click_buffer.click_buffer_max_batch_size,
+    max_queue_size=get_settings().click_buffer.click_buffer_max_queue_size,
+    flush_interval=get_settings().click_buffer.click_buffer_flush_interval_seconds,
+)
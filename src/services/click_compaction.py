@@ -0,0 +1,59 @@
+import logging
+import time
+
+from config import get_settings
+from models.click_rollups import DAY, HOUR, MINUTE
+from utils.unitofwork import UnitOfWork
+
+
+logger = logging.getLogger(__name__)
+
+
+async def compact_clicks(session_factory) -> dict[str, int]:
+    """
+    Delete raw clicks, fine rollup buckets and visitor sketches that are
+    past retention.
+
+    Clicks are folded into day rollups when they are recorded, so only
+    detail is lost. Each table is trimmed in bounded batches, one
+    transaction per batch, so a run never holds long locks; whatever is
+    left over is picked up by the next run.
+
+    Returns:
+        Number of deleted rows per table and granularity.
+    """
+    settings = get_settings().click_retention
+    now = int(time.time())
+    limit = settings.click_compaction_batch_size
+
+    def cutoff(days: int) -> int:
+        return now - days * DAY
+
+    steps = {
+        "raw_clicks": lambda uow: uow.stat.delete_clicks_before(
+            cutoff(settings.raw_click_retention_days), limit
+        ),
+        "minute_rollups": lambda uow: uow.stat.delete_rollups_before(
+            MINUTE, cutoff(settings.minute_rollup_retention_days), limit
+        ),
+        "hour_rollups": lambda uow: uow.stat.delete_rollups_before(
+            HOUR, cutoff(settings.hour_rollup_retention_days), limit
+        ),
+        "visitor_sketches": lambda uow: uow.stat.delete_visitor_sketches_before(
+            cutoff(settings.visitor_sketch_retention_days), limit
+        ),
+    }
+    deleted = {}
+    for name, delete_batch in steps.items():
+        deleted[name] = 0
+        for _ in range(settings.click_compaction_max_batches):
+            uow = UnitOfWork(session_factory)
+            async with uow:
+                count = await delete_batch(uow)
+                await uow.commit()
+            deleted[name] += count
+            if count < limit:
+                break
+
+    logger.info("Click compaction deleted %s", deleted)
+    return deleted
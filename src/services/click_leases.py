@@ -0,0 +1,109 @@
+import logging
+import time
+from collections import Counter
+from dataclasses import dataclass
+
+from config import get_settings
+from utils.unitofwork import UnitOfWork
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class ClickLease:
+    url_id: int
+    remaining: int
+    expires_at: float
+
+
+class ClickLeaseManager:
+    """
+    Per-process pool of clicks reserved from ``short_urls.clicks_left``.
+
+    Limited links spend leased clicks from memory and only touch the
+    database once per ``lease_size`` clicks. Clicks still held when a lease
+    goes idle, its link is deactivated or the worker shuts down are returned;
+    clicks held by a crashed worker are lost.
+    """
+
+    def __init__(self, lease_size: int, lease_ttl: float) -> None:
+        self.lease_size = lease_size
+        self.lease_ttl = lease_ttl
+        self._leases: dict[str, ClickLease] = {}
+        self._counters: Counter[str] = Counter()
+
+    @property
+    def enabled(self) -> bool:
+        return self.lease_size > 0
+
+    def take(self, short_code: str) -> bool:
+        """Spend one leased click of the link, if this worker holds any."""
+        lease = self._leases.get(short_code)
+        if lease is None or lease.remaining <= 0:
+            return False
+        lease.remaining -= 1
+        self._counters["clicks_served_from_lease"] += 1
+        return True
+
+    def grant(self, short_code: str, url_id: int) -> None:
+        """Record a lease of ``lease_size`` clicks, one of which is spent now."""
+        lease = self._leases.get(short_code)
+        if lease is None:
+            lease = self._leases[short_code] = ClickLease(url_id, 0, 0)
+        lease.remaining += self.lease_size - 1
+        lease.expires_at = time.time() + self.lease_ttl
+        self._counters["leases_acquired"] += 1
+
+    def drop(self, short_code: str) -> ClickLease | None:
+        return self._leases.pop(short_code, None)
+
+    async def release_expired(self, session_factory) -> None:
+        now = time.time()
+        expired = [
+            short_code
+            for short_code, lease in self._leases.items()
+            if lease.expires_at <= now
+        ]
+        await self._release(session_factory, [self.drop(code) for code in expired])
+
+    async def release_all(self, session_factory) -> None:
+        leases = list(self._leases.values())
+        self._leases.clear()
+        await self._release(session_factory, leases)
+
+    async def _release(self, session_factory, leases: list[ClickLease]) -> None:
+        leases = [lease for lease in leases if lease.remaining > 0]
+        if not leases:
+            return
+        try:
+            uow = UnitOfWork(session_factory)
+            async with uow:
+                for lease in leases:
+                    await uow.urls.release_clicks(lease.url_id, lease.remaining)
+                await uow.commit()
+        except Exception:  # pylint: disable=broad-exception-caught
+            logger.exception("Failed to return %d click leases", len(leases))
+            self._counters["clicks_lost"] += sum(lease.remaining for lease in leases)
+            return
+        self._counters["clicks_returned"] += sum(lease.remaining for lease in leases)
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "lease_size": self.lease_size,
+            "active_leases": len(self._leases),
+            "leased_clicks_outstanding": sum(
+                lease.remaining for lease in self._leases.values()
+            ),
+            "leases_acquired": self._counters["leases_acquired"],
+            "clicks_served_from_lease": self._counters["clicks_served_from_lease"],
+            "clicks_returned": self._counters["clicks_returned"],
+            "clicks_lost": self._counters["clicks_lost"],
+        }
+
+
+click_leases = ClickLeaseManager(
+    lease_size=get_settings().click_lease.click_lease_size,
+    lease_ttl=get_settings().click_lease.click_lease_ttl_seconds,
+)
@@ -0,0 +1,76 @@
+import time
+from typing import Callable
+
+from config import get_settings
+from services.redirect_cache import redirect_cache
+from utils.sketches import SpaceSaving
+
+
+class HotLinkTracker:
+    """
+    Detects the short codes that take most redirects and pins them in the
+    redirect cache.
+
+    Every successful redirect is counted in a space-saving sketch. Once per
+    ``window`` seconds the top ``top_k`` codes with at least ``min_hits``
+    (exponentially decayed) hits become the pinned tier of the redirect
+    cache, and all counts are halved so links cool down when traffic moves on.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        capacity: int,
+        top_k: int,
+        min_hits: int,
+        window: float,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.top_k = top_k
+        self.min_hits = min_hits
+        self.window = window
+        self._clock = clock
+        self._sketch = SpaceSaving(capacity)
+        self._hot: frozenset[str] = frozenset()
+        self._next_refresh = clock() + window
+
+    def record(self, short_code: str) -> None:
+        self._sketch.add(short_code)
+        now = self._clock()
+        if now >= self._next_refresh:
+            self._refresh(now)
+
+    def _refresh(self, now: float) -> None:
+        self._hot = frozenset(
+            short_code
+            for short_code, hits, _ in self._sketch.top(self.top_k)
+            if hits >= self.min_hits
+        )
+        redirect_cache.pin(self._hot)
+        self._sketch.decay()
+        self._next_refresh = now + self.window
+
+    def top(self) -> list[dict]:
+        return [
+            {
+                "short_code": short_code,
+                "hits": hits,
+                "max_overcount": error,
+                "pinned": short_code in self._hot,
+            }
+            for short_code, hits, error in self._sketch.top(self.top_k)
+        ]
+
+    def reset(self) -> None:
+        self._sketch = SpaceSaving(self._sketch.capacity)
+        self._hot = frozenset()
+        self._next_refresh = self._clock() + self.window
+        redirect_cache.pin(self._hot)
+
+
+hot_links = HotLinkTracker(
+    capacity=get_settings().cache.hot_link_sketch_capacity,
+    top_k=get_settings().cache.hot_link_top_k,
+    min_hits=get_settings().cache.hot_link_min_hits,
+    window=get_settings().cache.hot_link_window_seconds,
+)
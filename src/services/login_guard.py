@@ -0,0 +1,102 @@
+import math
+from collections import Counter
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from fastapi import HTTPException, status
+
+from config import get_settings
+from utils.rate_limit import TokenBucketLimiter
+
+
+TOO_MANY_CONCURRENT_LOGINS = HTTPException(
+    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+    detail="Too many concurrent login attempts",
+    headers={"Retry-After": "1"},
+)
+
+
+def _too_many_attempts(wait: float) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Too many login attempts",
+        headers={"Retry-After": str(math.ceil(wait))},
+    )
+
+
+class LoginGuard:
+    """
+    Admission control in front of password checks.
+
+    An attempt is throttled by its client IP's bucket first, so attempts that
+    are already throttled by IP do not drain the username's bucket, then by
+    its username's bucket, and finally rejected while ``max_concurrent``
+    logins are in flight. All checks happen before any database or bcrypt
+    work and fail with 429.
+    """
+
+    def __init__(
+        self,
+        by_ip: TokenBucketLimiter,
+        by_username: TokenBucketLimiter,
+        max_concurrent: int,
+        enabled: bool = True,
+    ) -> None:
+        self.by_ip = by_ip
+        self.by_username = by_username
+        self.max_concurrent = max_concurrent
+        self.enabled = enabled
+        self._in_flight = 0
+        self._counters: Counter[str] = Counter()
+
+    @asynccontextmanager
+    async def admit(self, username: str, client_ip: str | None) -> AsyncIterator[None]:
+        if not self.enabled:
+            yield
+            return
+        if client_ip is not None:
+            wait = self.by_ip.acquire(client_ip)
+            if wait:
+                raise _too_many_attempts(wait)
+        wait = self.by_username.acquire(username)
+        if wait:
+            raise _too_many_attempts(wait)
+        if self._in_flight >= self.max_concurrent:
+            self._counters["rejected_concurrent"] += 1
+            raise TOO_MANY_CONCURRENT_LOGINS
+
+        self._in_flight += 1
+        try:
+            yield
+        finally:
+            self._in_flight -= 1
+
+    def reset(self) -> None:
+        self.by_ip.clear()
+        self.by_username.clear()
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "in_flight": self._in_flight,
+            "max_concurrent": self.max_concurrent,
+            "rejected_concurrent": self._counters["rejected_concurrent"],
+            "by_ip": self.by_ip.stats(),
+            "by_username": self.by_username.stats(),
+        }
+
+
+login_guard = LoginGuard(
+    by_ip=TokenBucketLimiter(
+        rate=get_settings().login_throttle.login_ip_per_minute / 60,
+        burst=get_settings().login_throttle.login_ip_burst,
+        maxsize=get_settings().login_throttle.login_throttle_max_keys,
+    ),
+    by_username=TokenBucketLimiter(
+        rate=get_settings().login_throttle.login_username_per_minute / 60,
+        burst=get_settings().login_throttle.login_username_burst,
+        maxsize=get_settings().login_throttle.login_throttle_max_keys,
+    ),
+    max_concurrent=get_settings().login_throttle.login_max_concurrent,
+    enabled=get_settings().login_throttle.login_throttle_enabled,
+)
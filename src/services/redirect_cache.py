@@ -0,0 +1,56 @@
+from dataclasses import dataclass
+
+from config import get_settings
+from utils.cache import TTLCache
+from utils.single_flight import SingleFlight
+
+
+@dataclass(frozen=True, slots=True)
+class RedirectTarget:
+    """The subset of a short URL row that the redirect path needs."""
+
+    id: int
+    original_url: str
+    is_active: bool
+    expires_at: int
+    is_limited: bool
+
+    @classmethod
+    def from_row(cls, row) -> "RedirectTarget":
+        return cls(
+            id=row.id,
+            original_url=str(row.original_url),
+            is_active=row.is_active,
+            expires_at=row.expires_at,
+            is_limited=row.clicks_left is not None,
+        )
+
+
+class RedirectCache(TTLCache):
+    """
+    short_code -> RedirectTarget cache for the redirect hot path.
+
+    Entries never outlive the link's own ``expires_at``; the configured TTL
+    bounds how long a deactivation made by another worker can go unnoticed.
+    """
+
+    def add(self, short_code: str, target: RedirectTarget) -> None:
+        self.set(short_code, target, expires_at=target.expires_at)
+
+    def invalidate(self, short_code: str) -> None:
+        self.pop(short_code)
+
+
+redirect_cache = RedirectCache(
+    maxsize=get_settings().cache.redirect_cache_max_size,
+    ttl=get_settings().cache.redirect_cache_ttl_seconds,
+)
+
+
+negative_cache = TTLCache(
+    maxsize=get_settings().cache.negative_cache_max_size,
+    ttl=get_settings().cache.negative_cache_ttl_seconds,
+)
+
+# Coalesces concurrent cache-miss lookups of the same short code.
+redirect_lookups = SingleFlight()
@@ -0,0 +1,65 @@
+import json
+import time
+from typing import Any, Callable, Hashable
+
+from pydantic import BaseModel
+
+from config import get_settings
+from utils.cache import TTLCache
+
+
+class UserResultCache:
+    """
+    Short-lived per-user cache of listing and stats results.
+
+    Entries are keyed on the result kind, the user and the normalized filter
+    set, expire after the kind's TTL and are evicted LRU beyond ``maxsize``
+    entries (each holds at most one page of results). Bumping a user's
+    generation makes all of their entries unreachable, which is how link
+    creation and deactivation invalidate them in this process; other
+    workers see changes once their entries expire.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttls: dict[str, float],
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.ttls = ttls
+        self._clock = clock
+        self._cache = TTLCache(maxsize=maxsize, ttl=max(ttls.values()), clock=clock)
+        self._generations: dict[int, int] = {}
+
+    def key(self, kind: str, user_id: int, filters: BaseModel) -> Hashable:
+        return (
+            kind,
+            user_id,
+            self._generations.get(user_id, 0),
+            json.dumps(filters.model_dump(mode="json"), sort_keys=True),
+        )
+
+    def get(self, key: Hashable) -> Any | None:
+        return self._cache.get(key)
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self._cache.set(key, value, expires_at=self._clock() + self.ttls[key[0]])
+
+    def invalidate_user(self, user_id: int) -> None:
+        self._generations[user_id] = self._generations.get(user_id, 0) + 1
+
+    def clear(self) -> None:
+        self._cache.clear()
+        self._generations.clear()
+
+    def stats(self) -> dict:
+        return self._cache.stats()
+
+
+user_results = UserResultCache(
+    maxsize=get_settings().cache.user_result_cache_max_size,
+    ttls={
+        "urls": get_settings().cache.url_list_cache_ttl_seconds,
+        "stats": get_settings().cache.stats_cache_ttl_seconds,
+    },
+)
@@ -4,8 +4,11 @@ from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from config import get_settings
 from db.database import db_manager
 from models.short_urls import ShortURLModel
+from services.click_compaction import compact_clicks
+from services.click_leases import click_leases
 
 
 scheduler = AsyncIOScheduler()
@@ -27,3 +30,24 @@ async def delete_expired_links(session: AsyncSession):
 async def scheduled_delete():
     async with db_manager.async_session_maker() as session:
         await delete_expired_links(session)
+
+
+@scheduler.scheduled_job(
+    IntervalTrigger(
+        seconds=get_settings().click_lease.click_lease_ttl_seconds,
+        start_date=datetime.now(),
+    )
+)
+async def scheduled_release_click_leases():
+    await click_leases.release_expired(db_manager.async_session_maker)
+
+
+@scheduler.scheduled_job(
+    IntervalTrigger(
+        minutes=get_settings().click_retention.click_compaction_interval_minutes,
+        start_date=datetime.now(),
+    )
+)
+async def scheduled_compact_clicks():
+    if get_settings().click_retention.click_compaction_enabled:
+        await compact_clicks(db_manager.async_session_maker)
@@ -0,0 +1,85 @@
+from sqlalchemy import func, select
+
+from config import get_settings
+from models.short_urls import ShortURLModel
+from utils.bloom import BloomFilter
+
+
+class ShortCodeFilter:
+    """
+    Bloom filter of every existing short code, used to 404 unknown codes
+    without a database lookup.
+
+    The filter is built once at startup and extended by ``UrlService.add_url``,
+    so it only knows about codes created by this process after the build. It
+    is therefore opt-in and only sound when links are created through the
+    same worker that serves redirects. Until ``build`` has run, every code is
+    reported as possibly existing.
+    """
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._bloom: BloomFilter | None = None
+        self.rejected = 0
+        self.false_positives = 0
+
+    @property
+    def ready(self) -> bool:
+        return self._bloom is not None
+
+    async def build(self, session_factory) -> None:
+        async with session_factory() as session:
+            total = await session.scalar(
+                select(func.count(ShortURLModel.id))  # pylint: disable=not-callable
+            )
+            bloom = BloomFilter(max(self.capacity, 2 * total), self.error_rate)
+            codes = await session.stream_scalars(
+                select(ShortURLModel.short_code)
+                .where(ShortURLModel.short_code.is_not(None))
+                .execution_options(yield_per=10000)
+            )
+            async for short_code in codes:
+                bloom.add(short_code)
+        self._bloom = bloom
+
+    def add(self, short_code: str) -> None:
+        if self._bloom is not None:
+            self._bloom.add(short_code)
+
+    def might_exist(self, short_code: str) -> bool:
+        if self._bloom is None or short_code in self._bloom:
+            return True
+        self.rejected += 1
+        return False
+
+    def record_false_positive(self) -> None:
+        if self._bloom is not None:
+            self.false_positives += 1
+
+    def reset(self) -> None:
+        self._bloom = None
+
+    def stats(self) -> dict:
+        if self._bloom is None:
+            return {"ready": False}
+        unknown_lookups = self.rejected + self.false_positives
+        return {
+            "ready": True,
+            "items": self._bloom.count,
+            "bits": self._bloom.size,
+            "hash_count": self._bloom.hash_count,
+            "memory_bytes": self._bloom.memory_bytes,
+            "estimated_false_positive_rate": self._bloom.estimated_false_positive_rate,
+            "rejected": self.rejected,
+            "false_positives": self.false_positives,
+            "observed_false_positive_rate": (
+                self.false_positives / unknown_lookups if unknown_lookups else 0.0
+            ),
+        }
+
+
+short_code_filter = ShortCodeFilter(
+    capacity=get_settings().cache.short_code_bloom_capacity,
+    error_rate=get_settings().cache.short_code_bloom_error_rate,
+)
@@ -1,65 +1,345 @@
-from datetime import datetime, timedelta, timezone
-from typing import List
+import asyncio
+import csv
+import io
+import json
+from datetime import datetime, timezone
+from typing import AsyncIterator, List
 
-from sqlalchemy import case, func, select
+from fastapi import HTTPException, status
+from sqlalchemy import and_, case, func, or_, select
 
-from models.click_stats import ClickStatModel
+from config import get_settings
+from models.click_rollups import DAY, HOUR, MINUTE, ClickRollupModel
 from models.short_urls import ShortURLModel
-from schemas.short_urls import ShortURLFilters
-from schemas.stat import URLClickStats
+from models.visitor_sketches import SKETCH_PRECISION
+from schemas.stat import (
+    ClickSeries,
+    ClickSeriesPoint,
+    ClickSeriesQuery,
+    ExportFormat,
+    ExportKind,
+    StatsExportQuery,
+    URLClickStats,
+    URLStatsFilters,
+    parse_window,
+)
 from schemas.users import UserInfoResponseSchema
+from services.result_cache import user_results
+from services.urls import URL_NOT_FOUND
+from utils.hyperloglog import HyperLogLog
 from utils.unitofwork import IUnitOfWork
 from utils.url_utils import build_short_url_filters
 
 
+INVALID_TIME_RANGE = HTTPException(
+    status_code=status.HTTP_400_BAD_REQUEST,
+    detail="'from' must be earlier than 'to'",
+)
+
+
+def _window_condition(seconds: int, now: int):
+    """
+    Select the rollup buckets covering the last ``seconds``: the current
+    bucket plus the ones before it, at the coarsest width that yields at
+    least 24 buckets (or at minute width for short windows).
+    """
+    granularity = next(
+        (
+            width
+            for width in (DAY, HOUR)
+            if seconds % width == 0 and seconds // width >= 24
+        ),
+        MINUTE,
+    )
+    buckets = max(seconds // granularity, 1)
+    return and_(
+        ClickRollupModel.granularity == granularity,
+        ClickRollupModel.bucket_start
+        >= now // granularity * granularity - (buckets - 1) * granularity,
+    )
+
+
+def _unique_visitor_counts(
+    sketches: list[tuple[int, bytes]], window_hours: dict[str, int], now: int
+) -> dict[str, int]:
+    """
+    Estimate unique visitors per window by merging the hourly sketches of the
+    current hour and the ``hours - 1`` before it, shortest window first.
+    """
+    current_hour = now // HOUR * HOUR
+    sketches = sorted(sketches, reverse=True)
+    merged = HyperLogLog(SKETCH_PRECISION)
+    counts, next_sketch = {}, 0
+    for label, hours in sorted(window_hours.items(), key=lambda item: item[1]):
+        since = current_hour - (hours - 1) * HOUR
+        while next_sketch < len(sketches) and sketches[next_sketch][0] >= since:
+            merged.merge(HyperLogLog.from_bytes(sketches[next_sketch][1]))
+            next_sketch += 1
+        counts[label] = merged.count()
+    return counts
+
+
+def _page_unique_visitors(
+    sketches: dict[int, list[tuple[int, bytes]]],
+    short_url_ids: list[int],
+    window_hours: dict[str, int],
+    now: int,
+) -> dict[int, dict[str, int]]:
+    """``_unique_visitor_counts`` of every link on a page."""
+    return {
+        short_url_id: _unique_visitor_counts(
+            sketches.get(short_url_id, []), window_hours, now
+        )
+        for short_url_id in short_url_ids
+    }
+
+
+EXPORT_COLUMNS = {
+    ExportKind.CLICKS: ("short_code", "clicked_at"),
+    ExportKind.LINKS: (
+        "short_code",
+        "original_url",
+        "tag",
+        "is_active",
+        "clicks",
+        "total_clicks",
+        "last_clicked_at",
+    ),
+}
+
+
+def _export_granularity(start: int, end: int | None) -> int:
+    """Coarsest rollup width both (minute-aligned) range bounds fall on."""
+    return next(
+        (
+            width
+            for width in (DAY, HOUR)
+            if start % width == 0 and (end is None or end % width == 0)
+        ),
+        MINUTE,
+    )
+
+
+def _serialize(rows, columns: tuple[str, ...], export_format: ExportFormat) -> str:
+    if export_format == ExportFormat.CSV:
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator="\n").writerows(rows)
+        return buffer.getvalue()
+    return "".join(json.dumps(dict(zip(columns, row))) + "\n" for row in rows)
+
+
 class StatService:
 
     async def get_click_statistics(
-        self, uow: IUnitOfWork, user: UserInfoResponseSchema, filters: ShortURLFilters
+        self, uow: IUnitOfWork, user: UserInfoResponseSchema, filters: URLStatsFilters
     ) -> List[URLClickStats]:
         """
         Get click statistics for user's URLs.
-        Returns URLs sorted by click count (most clicked first).
-        """
-        async with uow:
-            hour_ago = int(
-                (datetime.now(timezone.utc) - timedelta(hours=1)).timestamp()
-            )
-            day_ago = int((datetime.now(timezone.utc) - timedelta(days=1)).timestamp())
+        Returns URLs sorted by the ``sort_by`` window's click count (most
+        clicked first).
+
+        Every window is counted in the same grouped query over the click
+        rollups, each from the coarsest bucket width that still splits it into
+        at least 24 buckets (1h from minutes, 24h and 7d from hours, 30d from
+        days), so the cost does not depend on click history.
 
-            conditions = build_short_url_filters(user.id, filters)
+        Unique visitors are estimated for the last day and for requested
+        windows of whole hours up to ``unique_visitors_max_window_hours`` by
+        merging the page's hourly HyperLogLog sketches in a worker thread, off
+        the event loop.
 
-            hour_case = case((ClickStatModel.clicked_at >= hour_ago, 1), else_=0)
-            day_case = case((ClickStatModel.clicked_at >= day_ago, 1), else_=0)
+        Results are cached per user and filter set for a few seconds.
+        """
+        cache_key = user_results.key("stats", user.id, filters)
+        cached = user_results.get(cache_key)
+        if cached is not None:
+            return cached
 
+        now = int(datetime.now(timezone.utc).timestamp())
+        windows = {
+            label: _window_condition(parse_window(label), now)
+            for label in dict.fromkeys([*filters.windows, "1h", "24h", filters.sort_by])
+        }
+        window_sums = {
+            label: func.sum(case((condition, ClickRollupModel.clicks), else_=0))
+            for label, condition in windows.items()
+        }
+
+        async with uow:
             query = (
                 select(
                     ShortURLModel.id,
                     ShortURLModel.original_url,
                     ShortURLModel.short_code,
-                    func.sum(hour_case).label("clicks_last_hour"),
-                    func.sum(day_case).label("clicks_last_day"),
+                    *(
+                        window_sum.label(f"window_{i}")
+                        for i, window_sum in enumerate(window_sums.values())
+                    ),
                 )
                 .outerjoin(
-                    ClickStatModel, ShortURLModel.id == ClickStatModel.short_url_id
+                    ClickRollupModel,
+                    and_(
+                        ShortURLModel.id == ClickRollupModel.short_url_id,
+                        or_(*windows.values()),
+                    ),
                 )
-                .where(conditions)
+                .where(build_short_url_filters(user.id, filters))
                 .group_by(ShortURLModel.id)
-                .order_by(func.sum(day_case).desc())
+                .order_by(window_sums[filters.sort_by].desc())
+                .offset((filters.page - 1) * filters.page_size)
+                .limit(filters.page_size)
             )
 
-            offset = (filters.page - 1) * filters.page_size
-            query = query.offset(offset).limit(filters.page_size)
+            rows = (await uow.session.execute(query)).all()
 
-            result = await uow.session.execute(query)
-            rows = result.all()
+            unique_windows = self._unique_visitor_windows(filters)
+            sketches = {}
+            if unique_windows and rows:
+                sketches = await uow.stat.visitor_sketches(
+                    [row.id for row in rows],
+                    now // HOUR * HOUR - (max(unique_windows.values()) - 1) * HOUR,
+                )
+
+        unique = await asyncio.to_thread(
+            _page_unique_visitors,
+            sketches,
+            [row.id for row in rows],
+            unique_windows,
+            now,
+        )
+
+        result = [
+            self._to_stats(
+                row,
+                filters,
+                clicks={
+                    label: getattr(row, f"window_{i}") or 0
+                    for i, label in enumerate(window_sums)
+                },
+                unique=unique[row.id],
+            )
+            for row in rows
+        ]
+        user_results.set(cache_key, result)
+        return result
+
+    @staticmethod
+    def _to_stats(
+        row, filters: URLStatsFilters, clicks: dict[str, int], unique: dict[str, int]
+    ) -> URLClickStats:
+        return URLClickStats(
+            original_url=row.original_url,
+            short_code=row.short_code,
+            clicks_last_hour=clicks["1h"],
+            clicks_last_day=clicks["24h"],
+            clicks={label: clicks[label] for label in filters.windows},
+            unique_visitors_last_day=unique.get("24h"),
+            unique_visitors={
+                label: unique[label] for label in filters.windows if label in unique
+            },
+        )
+
+    @staticmethod
+    def _unique_visitor_windows(filters: URLStatsFilters) -> dict[str, int]:
+        """Hours of each window that unique visitors can be estimated for."""
+        settings = get_settings().stats
+        if not settings.unique_visitors_enabled:
+            return {}
+        windows = {}
+        for label in dict.fromkeys(["24h", *filters.windows]):
+            seconds = parse_window(label)
+            hours = seconds // HOUR
+            if (
+                seconds % HOUR == 0
+                and hours <= settings.unique_visitors_max_window_hours
+            ):
+                windows[label] = hours
+        return windows
+
+    async def get_click_series(
+        self,
+        uow: IUnitOfWork,
+        user: UserInfoResponseSchema,
+        short_code: str,
+        query: ClickSeriesQuery,
+    ) -> ClickSeries:
+        """
+        Get click counts of one of the user's URLs in fixed-width buckets.
+
+        The range start is rounded down to a bucket boundary and its end is
+        exclusive. Counts are read from the rollup of the same width with a
+        single primary-key range scan; empty buckets are filled with zeros.
+        """
+        end = (
+            query.end
+            if query.end is not None
+            else int(datetime.now(timezone.utc).timestamp())
+        )
+        start = query.start if query.start is not None else end - DAY
+        if start >= end:
+            raise INVALID_TIME_RANGE
+        width = query.bucket.seconds
+        start = start // width * width
+        bucket_count = -(-(end - start) // width)
+        max_buckets = get_settings().stats.stats_series_max_buckets
+        if bucket_count > max_buckets:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Range spans {bucket_count} buckets, at most "
+                f"{max_buckets} are allowed",
+            )
 
-            return [
-                URLClickStats(
-                    original_url=row.original_url,
-                    short_code=row.short_code,
-                    clicks_last_hour=row.clicks_last_hour or 0,
-                    clicks_last_day=row.clicks_last_day or 0,
+        async with uow:
+            url = await uow.urls.find_one(short_code=short_code)
+            if url is None or url.user_id != user.id:
+                raise URL_NOT_FOUND
+            counts = await uow.stat.rollup_series(url.id, width, start, end)
+
+        return ClickSeries(
+            short_code=short_code,
+            bucket=query.bucket,
+            points=[
+                ClickSeriesPoint(bucket_start=ts, clicks=counts.get(ts, 0))
+                for ts in range(start, end, width)
+            ],
+        )
+
+    async def export_statistics(
+        self, uow: IUnitOfWork, user: UserInfoResponseSchema, query: StatsExportQuery
+    ) -> AsyncIterator[str]:
+        """
+        Export the user's raw clicks or per-link click counts as NDJSON or
+        CSV chunks.
+
+        Rows are read through a server-side cursor ``stats_export_batch_size``
+        at a time and serialized one batch per chunk, so memory stays constant
+        however many rows are exported. The range is validated before the
+        response starts; the returned iterator opens the database session.
+        """
+        if query.start is not None and query.end is not None:
+            if query.start >= query.end:
+                raise INVALID_TIME_RANGE
+        return self._export_rows(uow, user.id, query)
+
+    @staticmethod
+    async def _export_rows(
+        uow: IUnitOfWork, user_id: int, query: StatsExportQuery
+    ) -> AsyncIterator[str]:
+        columns = EXPORT_COLUMNS[query.kind]
+        batch_size = get_settings().stats.stats_export_batch_size
+        if query.format == ExportFormat.CSV:
+            yield _serialize([columns], columns, query.format)
+
+        async with uow:
+            if query.kind == ExportKind.CLICKS:
+                result = await uow.stat.stream_user_clicks(
+                    user_id, (query.start, query.end), batch_size
+                )
+            else:
+                start = (query.start or 0) // MINUTE * MINUTE
+                end = None if query.end is None else query.end // MINUTE * MINUTE
+                result = await uow.stat.stream_link_clicks(
+                    user_id, _export_granularity(start, end), (start, end), batch_size
                 )
-                for row in rows
-            ]
+            async for rows in result.partitions():
+                yield _serialize(rows, columns, query.format)
@@ -0,0 +1,10 @@
+from config import get_settings
+from utils.sketches import SlidingTopK
+
+
+# Most redirected short codes of this worker over the trending window.
+trending_links = SlidingTopK(
+    capacity=get_settings().stats.trending_sketch_capacity,
+    window=get_settings().stats.trending_window_seconds,
+    slots=get_settings().stats.trending_window_slots,
+)
@@ -3,12 +3,30 @@ from typing import List
 
 from fastapi import HTTPException, status
 
-from config import Settings
+from config import Settings, get_settings
 from models.short_urls import ShortURLModel
-from schemas.short_urls import ShortURLCreate, ShortURLFilters, ShortURLInfo
+from repositories.urls import ClickRejectReason
+from schemas.short_urls import ShortURLCreate, ShortURLInfo, ShortURLListFilters
 from schemas.users import UserInfoResponseSchema
+from services.click_buffer import click_buffer
+from services.click_leases import click_leases
+from services.hot_links import hot_links
+from services.redirect_cache import (
+    RedirectTarget,
+    negative_cache,
+    redirect_cache,
+    redirect_lookups,
+)
+from services.result_cache import user_results
+from services.short_code_filter import short_code_filter
+from services.trending import trending_links
+from utils.hyperloglog import hash64
 from utils.unitofwork import IUnitOfWork
-from utils.url_utils import build_short_url_filters, generate_short_code
+from utils.url_utils import (
+    build_short_url_filters,
+    generate_short_code,
+    short_url_order,
+)
 
 
 URL_NOT_FOUND = HTTPException(
@@ -33,6 +51,17 @@ SHORT_CODE_ALREADY_USED = HTTPException(
     status_code=status.HTTP_400_BAD_REQUEST,
     detail="Desired short code is already in use.",
 )
+CLICK_REJECTIONS = {
+    ClickRejectReason.NOT_FOUND: URL_NOT_FOUND,
+    ClickRejectReason.NOT_ACTIVE: URL_NOT_ACTIVE,
+    ClickRejectReason.EXPIRED: URL_EXPIRED,
+    ClickRejectReason.CLICKS_LIMIT_REACHED: CLICKS_LIMIT_REACHED,
+}
+
+
+def visitor_fingerprint(client_host: str | None, user_agent: str | None) -> int:
+    """Hash identifying a visitor for unique counting; raw values are not kept."""
+    return hash64(f"{client_host or ''}|{user_agent or ''}")
 
 
 class UrlService:
@@ -67,53 +96,148 @@ class UrlService:
 
             short_url: ShortURLModel = await uow.urls.add_one(payload)
             if not short_code:
-                generated_code = generate_short_code(short_url.id)
-                await uow.urls.edit_one(short_url.id, {"short_code": generated_code})
+                short_code = generate_short_code(short_url.id)
+                await uow.urls.edit_one(short_url.id, {"short_code": short_code})
+            short_code_filter.add(short_code)
             await uow.commit()
+            negative_cache.pop(short_code)
+            user_results.invalidate_user(user.id)
             return ShortURLInfo.model_validate(short_url)
 
     async def get_redirect_url(
         self,
         uow: IUnitOfWork,
         short_code: str,
+        visitor: int | None = None,
     ) -> str:
-        """Get original URL and handle click tracking for redirection."""
+        """
+        Get original URL and handle click tracking for redirection.
+
+        ``visitor`` is the ``visitor_fingerprint`` of the client; it feeds the
+        per-link, per-hour unique visitor sketches.
+
+        Unknown and dead short codes are answered from the negative cache or
+        the short code Bloom filter without touching the database; their
+        404/410 results are cached for a few seconds.
+        """
+        rejection = negative_cache.get(short_code)
+        if rejection is not None:
+            raise rejection
+        if not short_code_filter.might_exist(short_code):
+            raise URL_NOT_FOUND
+
+        try:
+            return await self._resolve_redirect(uow, short_code, visitor)
+        except HTTPException as exc:
+            negative_cache.set(short_code, exc)
+            raise
+
+    async def _resolve_redirect(
+        self, uow: IUnitOfWork, short_code: str, visitor: int | None
+    ) -> str:
+        """
+        Validate the link, spend a click and record it.
+
+        Link metadata is served from the in-process redirect cache when
+        possible, so unlimited links are resolved without reading the database.
+        Concurrent cache misses for the same code share one lookup.
+        Limited links spend their click from a click lease when leasing is
+        enabled, otherwise with a single conditional UPDATE.
+        Clicks go through the click buffer when it is running and are
+        written directly otherwise.
+        """
         async with uow:
-            url = await uow.urls.find_one(short_code=short_code)
-            if not url:
-                raise URL_NOT_FOUND
+            target = redirect_cache.get(short_code)
+            if target is None:
+                row = await redirect_lookups.do(
+                    short_code, lambda: uow.urls.find_redirect_target(short_code)
+                )
+                if row is None:
+                    short_code_filter.record_false_positive()
+                    raise URL_NOT_FOUND
+                target = RedirectTarget.from_row(row)
+                redirect_cache.add(short_code, target)
 
-            if not url.is_active:
+            if not target.is_active:
                 raise URL_NOT_ACTIVE
 
             current_time = int(datetime.now(timezone.utc).timestamp())
-            if url.expires_at and current_time > url.expires_at:
+            if target.expires_at and current_time > target.expires_at:
                 raise URL_EXPIRED
 
-            if url.clicks_left is not None:
-                if url.clicks_left <= 0:
-                    raise CLICKS_LIMIT_REACHED
-                await uow.urls.edit_one(url.id, {"clicks_left": url.clicks_left - 1})
+            if target.is_limited:
+                await self._spend_click(uow, short_code, target, current_time)
+            hot_links.record(short_code)
+            trending_links.add(short_code)
 
-            click_time = int(datetime.now(timezone.utc).timestamp())
-            await uow.stat.add_one({"short_url_id": url.id, "clicked_at": click_time})
+            click = {
+                "short_url_id": target.id,
+                "clicked_at": int(datetime.now(timezone.utc).timestamp()),
+            }
+            if visitor is not None and get_settings().stats.unique_visitors_enabled:
+                click["visitor"] = visitor
+            if click_buffer.running:
+                await click_buffer.put(click)
+            else:
+                await uow.stat.record_clicks([click])
 
             await uow.commit()
-            return str(url.original_url)
+            return target.original_url
+
+    async def _spend_click(
+        self,
+        uow: IUnitOfWork,
+        short_code: str,
+        target: RedirectTarget,
+        current_time: int,
+    ) -> None:
+        """Spend one click of a limited link from a lease or the database."""
+        if click_leases.take(short_code):
+            return
+
+        if click_leases.enabled:
+            leased = await uow.urls.lease_clicks(
+                short_code, click_leases.lease_size, current_time
+            )
+            if leased is not None:
+                await uow.commit()
+                click_leases.grant(short_code, target.id)
+                return
+
+        spent, reason = await uow.urls.consume_click(short_code, current_time)
+        if spent is None:
+            redirect_cache.invalidate(short_code)
+            raise CLICK_REJECTIONS[reason]
 
     async def get_user_urls(
-        self, uow: IUnitOfWork, user: UserInfoResponseSchema, filters: ShortURLFilters
+        self,
+        uow: IUnitOfWork,
+        user: UserInfoResponseSchema,
+        filters: ShortURLListFilters,
     ) -> List[ShortURLInfo]:
-        """Get user's URLs with filtering and pagination."""
+        """
+        Get user's URLs with filtering and pagination.
+
+        Pages are cached per user and filter set for a few seconds, and
+        dropped when the user creates or deactivates a link.
+        """
+        cache_key = user_results.key("urls", user.id, filters)
+        cached = user_results.get(cache_key)
+        if cached is not None:
+            return cached
+
         async with uow:
             conditions = build_short_url_filters(user.id, filters)
             urls = await uow.urls.find_all(
                 filter_expr=conditions,
                 offset=(filters.page - 1) * filters.page_size,
                 limit=filters.page_size,
+                order_by=short_url_order(filters.sort_by),
             )
 
-            return [ShortURLInfo.model_validate(url) for url in urls]
+            result = [ShortURLInfo.model_validate(url) for url in urls]
+        user_results.set(cache_key, result)
+        return result
 
     async def deactivate_url(
         self,
@@ -134,4 +258,9 @@ class UrlService:
                 raise URL_ALREADY_DEACTIVATED
 
             await uow.urls.edit_one(url.id, {"is_active": False})
+            lease = click_leases.drop(short_code)
+            if lease is not None and lease.remaining > 0:
+                await uow.urls.release_clicks(url.id, lease.remaining)
             await uow.commit()
+            redirect_cache.invalidate(short_code)
+            user_results.invalidate_user(user.id)
@@ -0,0 +1,20 @@
+from dataclasses import dataclass
+
+from config import get_settings
+from utils.cache import TTLCache
+
+
+@dataclass(frozen=True, slots=True)
+class CachedUser:
+    """The subset of a user row that access-token authentication needs."""
+
+    username: str
+    token_version: int
+
+
+# user_id -> CachedUser. The TTL bounds how long a revocation made through
+# another worker can go unnoticed; revocations on this worker evict at once.
+user_cache = TTLCache(
+    maxsize=get_settings().cache.user_cache_max_size,
+    ttl=get_settings().cache.user_cache_ttl_seconds,
+)
@@ -4,6 +4,7 @@ from sqlalchemy.exc import IntegrityError
 
 from models.users import UserModel
 from schemas.users import UserInfoResponseSchema, UserSchema
+from services.user_cache import user_cache
 from utils.jwt_utils import jwt_service
 from utils.unitofwork import IUnitOfWork
 
@@ -14,7 +15,7 @@ class UsersService:
     ) -> UserModel:
         username = form_data.username
         password = form_data.password
-        hashed_password = jwt_service.hash_password(password)
+        hashed_password = await jwt_service.hash_password_async(password)
 
         try:
             async with uow:
@@ -42,3 +43,4 @@ class UsersService:
                 user_id, {"token_version": UserModel.token_version + 1}
             )
             await uow.commit()
+        user_cache.pop(user_id)
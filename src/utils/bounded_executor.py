@@ -0,0 +1,53 @@
+import asyncio
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+
+class ExecutorSaturated(RuntimeError):
+    """Raised instead of queueing a call when the executor is at capacity."""
+
+
+class BoundedExecutor:
+    """
+    Thread pool for blocking calls from async code with a cap on backlog.
+
+    At most ``max_workers`` calls run at once; up to ``max_pending`` calls
+    may be running or queued. Further calls fail immediately with
+    ``ExecutorSaturated`` instead of waiting behind the backlog.
+    """
+
+    def __init__(
+        self, max_workers: int, max_pending: int, thread_name_prefix: str = ""
+    ) -> None:
+        self.max_workers = max_workers
+        self.max_pending = max(max_pending, max_workers)
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix)
+        self._pending = 0
+        self._counters: Counter[str] = Counter()
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if self._pending >= self.max_pending:
+            self._counters["rejected"] += 1
+            raise ExecutorSaturated
+        self._pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor, fn, *args
+            )
+        finally:
+            self._pending -= 1
+            self._counters["completed"] += 1
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "running": min(self._pending, self.max_workers),
+            "queue_depth": max(self._pending - self.max_workers, 0),
+            "completed": self._counters["completed"],
+            "rejected": self._counters["rejected"],
+        }
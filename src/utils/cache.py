@@ -0,0 +1,90 @@
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Callable, Hashable
+
+
+class TTLCache:
+    """
+    Bounded in-process LRU mapping whose entries expire at a per-key deadline.
+
+    Deadlines are absolute unix timestamps so they can be aligned with
+    database values such as ``ShortURLModel.expires_at``. A ``maxsize`` of 0
+    disables the cache: every ``get`` is a miss and ``set`` is a no-op.
+    Pinned keys are skipped by LRU eviction (they still expire), so the cache
+    may exceed ``maxsize`` by at most the number of pinned keys.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._counters: Counter[str] = Counter()
+        self._pinned: frozenset = frozenset()
+
+    def get(self, key: Hashable) -> Any | None:
+        entry = self._data.get(key)
+        if entry is None:
+            self._counters["misses"] += 1
+            return None
+
+        deadline, value = entry
+        if deadline <= self._clock():
+            del self._data[key]
+            self._counters["expirations"] += 1
+            self._counters["misses"] += 1
+            return None
+
+        self._data.move_to_end(key)
+        self._counters["hits"] += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, expires_at: float | None = None) -> None:
+        """Store ``value`` until ``expires_at`` or the default TTL, whichever is first."""
+        if self.maxsize <= 0:
+            return
+
+        deadline = self._clock() + self.ttl
+        if expires_at is not None:
+            deadline = min(deadline, expires_at)
+        if deadline <= self._clock():
+            self._data.pop(key, None)
+            return
+
+        self._data[key] = (deadline, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            victim = next((k for k in self._data if k not in self._pinned), None)
+            if victim is None:
+                break
+            del self._data[victim]
+            self._counters["evictions"] += 1
+
+    def pin(self, keys: set) -> None:
+        """Replace the set of keys exempt from LRU eviction."""
+        self._pinned = frozenset(keys)
+
+    def pop(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "size": len(self._data),
+            "max_size": self.maxsize,
+            "hits": self._counters["hits"],
+            "misses": self._counters["misses"],
+            "evictions": self._counters["evictions"],
+            "expirations": self._counters["expirations"],
+            "pinned": sum(key in self._data for key in self._pinned),
+        }
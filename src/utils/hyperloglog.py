@@ -0,0 +1,102 @@
+import hashlib
+import math
+import zlib
+from functools import cache
+
+
+def hash64(value: str) -> int:
+    """Stable 64-bit hash of ``value`` for feeding HyperLogLog sketches."""
+    digest = hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+@cache
+def _high_bits(size: int) -> int:
+    return int.from_bytes(b"\x80" * size, "little")
+
+
+def register_max(left: bytes, right: bytes) -> bytes:
+    """
+    Byte-wise maximum of two register arrays of the same length.
+
+    Registers never exceed ``64 - precision + 1 < 128``, so both arrays are
+    read as big integers with each byte's high bit free: setting it on the
+    left before subtracting the right leaves it set exactly where the left
+    byte is the larger one, without borrowing across bytes. That bit is then
+    spread into a byte mask selecting each maximum, which keeps the work in
+    a handful of big-integer operations instead of a Python loop.
+    """
+    size = len(left)
+    high = _high_bits(size)
+    a = int.from_bytes(left, "little")
+    b = int.from_bytes(right, "little")
+    mask = ((((a | high) - b) & high) >> 7) * 0xFF
+    return ((a & mask) | (b & ~mask)).to_bytes(size, "little")
+
+
+class HyperLogLog:
+    """
+    Cardinality estimator with a fixed ``2 ** precision`` byte footprint.
+
+    Sketches of the same precision merge losslessly (register-wise max), so
+    per-hour, per-worker sketches can be combined into any larger window.
+    The standard error is about ``1.04 / sqrt(2 ** precision)``; precision
+    11 gives ~2.3% with 2 KiB of registers.
+    """
+
+    def __init__(self, precision: int, registers: bytes | None = None) -> None:
+        self.precision = precision
+        self._size = 1 << precision
+        self._registers = bytearray(registers or self._size)
+        if len(self._registers) != self._size:
+            raise ValueError("Register count does not match precision")
+
+    def add_hash(self, value: int) -> None:
+        index = value >> (64 - self.precision)
+        rest = value & ((1 << (64 - self.precision)) - 1)
+        rank = 64 - self.precision - rest.bit_length() + 1
+        if rank > self._registers[index]:
+            self._registers[index] = rank
+
+    def add(self, value: str) -> None:
+        self.add_hash(hash64(value))
+
+    def merge(self, other: "HyperLogLog") -> None:
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge sketches of different precision")
+        self._registers = bytearray(register_max(self._registers, other.registers))
+
+    @property
+    def registers(self) -> bytes:
+        return bytes(self._registers)
+
+    def count(self) -> int:
+        size = self._size
+        if size >= 128:
+            alpha = 0.7213 / (1 + 1.079 / size)
+        else:
+            alpha = {16: 0.673, 32: 0.697, 64: 0.709}[size]
+        estimate = alpha * size * size / self._harmonic_sum()
+        zeros = self._registers.count(0)
+        if estimate <= 2.5 * size and zeros:
+            estimate = size * math.log(size / zeros)
+        return round(estimate)
+
+    def _harmonic_sum(self) -> float:
+        """Sum of ``2 ** -register``, counting the (few, small) distinct ranks."""
+        total, seen, rank = 0.0, 0, 0
+        while seen < self._size:
+            registers = self._registers.count(rank)
+            total += registers * 2.0**-rank
+            seen += registers
+            rank += 1
+        return total
+
+    def to_bytes(self) -> bytes:
+        """Compressed registers; sparse sketches shrink to a few dozen bytes."""
+        return zlib.compress(self.registers, 1)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "HyperLogLog":
+        registers = zlib.decompress(data)
+        return cls(len(registers).bit_length() - 1, registers)
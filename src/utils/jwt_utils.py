@@ -1,3 +1,4 @@
+import hashlib
 from datetime import datetime, timedelta, timezone
 from typing import Any
 
@@ -14,6 +15,23 @@ from schemas.users import (
     TokenPayloadSchema,
     TokenType,
 )
+from utils.bounded_executor import BoundedExecutor, ExecutorSaturated
+from utils.cache import TTLCache
+
+
+AUTH_BUSY = HTTPException(
+    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+    detail="Too many concurrent authentication requests",
+    headers={"Retry-After": "1"},
+)
+
+# bcrypt holds a CPU for ~200 ms per call at the default cost, so it runs
+# outside the event loop on a few dedicated threads.
+password_executor = BoundedExecutor(
+    max_workers=get_settings().auth_jwt.password_hash_workers,
+    max_pending=get_settings().auth_jwt.password_hash_max_pending,
+    thread_name_prefix="bcrypt",
+)
 
 
 class JwtUtils:
@@ -21,6 +39,11 @@ class JwtUtils:
         self.__settings = settings
         self.__algorithm = settings.auth_jwt.algorithm
         self.__secret_key = settings.auth_jwt.secret_key
+        # SHA-256 of the token -> verified payload, dropped at the token's exp.
+        self.__decoded_tokens = TTLCache(
+            maxsize=settings.cache.decoded_token_cache_max_size,
+            ttl=settings.auth_jwt.refresh_token_expire_minutes * 60,
+        )
 
     def __encode_jwt(self, payload: dict[str, Any], expire_time_delta: int) -> str:
         to_encode = payload.copy()
@@ -70,11 +93,24 @@ class JwtUtils:
         self,
         token: str,
     ) -> TokenPayloadSchema:
+        """
+        Verify ``token`` and return its payload.
+
+        Verified payloads are cached by token digest until the token's
+        ``exp``, so repeated requests with the same token skip the signature
+        check and schema validation. Invalid tokens are never cached.
+        """
+        digest = hashlib.sha256(token.encode("utf-8")).digest()
+        payload = self.__decoded_tokens.get(digest)
+        if payload is not None:
+            return payload
         try:
             decoded = jwt.decode(
                 token, self.__secret_key, algorithms=[self.__algorithm]
             )
-            return TokenPayloadSchema(**decoded)
+            payload = TokenPayloadSchema(**decoded)
+            self.__decoded_tokens.set(digest, payload, expires_at=payload.exp)
+            return payload
         except jwt.ExpiredSignatureError:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED, detail="Token expired"
@@ -84,6 +120,9 @@ class JwtUtils:
                 status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token"
             )
 
+    def decoded_token_stats(self) -> dict[str, int]:
+        return self.__decoded_tokens.stats()
+
     def validate_token_type(
         self,
         token_payload: TokenPayloadSchema,
@@ -105,8 +144,8 @@ class JwtUtils:
             )
 
     @staticmethod
-    def hash_password(password: str) -> str:
-        salt = bcrypt.gensalt()
+    def hash_password(password: str, rounds: int = 12) -> str:
+        salt = bcrypt.gensalt(rounds)
         hashed = bcrypt.hashpw(password.encode("utf-8"), salt)
         return hashed.decode("utf-8")
 
@@ -114,5 +153,25 @@ class JwtUtils:
     def validate_password(password: str, hashed_password: str) -> bool:
         return bcrypt.checkpw(password.encode("utf-8"), hashed_password.encode("utf-8"))
 
+    async def hash_password_async(self, password: str) -> str:
+        """``hash_password`` at the configured cost on the password executor."""
+        try:
+            return await password_executor.run(
+                self.hash_password, password, self.__settings.auth_jwt.bcrypt_rounds
+            )
+        except ExecutorSaturated:
+            raise AUTH_BUSY
+
+    async def validate_password_async(
+        self, password: str, hashed_password: str
+    ) -> bool:
+        """``validate_password`` on the password executor."""
+        try:
+            return await password_executor.run(
+                self.validate_password, password, hashed_password
+            )
+        except ExecutorSaturated:
+            raise AUTH_BUSY
+
 
 jwt_service = JwtUtils(get_settings())
@@ -0,0 +1,54 @@
+import time
+from collections import Counter, OrderedDict
+from typing import Callable, Hashable
+
+
+class TokenBucketLimiter:
+    """
+    Per-key token buckets of up to ``burst`` tokens refilled at ``rate``
+    tokens per second.
+
+    Buckets of at most ``maxsize`` keys are kept; the least recently used
+    ones are dropped beyond that and start full when the key returns.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        maxsize: int,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.maxsize = maxsize
+        self._clock = clock
+        self._buckets: OrderedDict[Hashable, tuple[float, float]] = OrderedDict()
+        self._counters: Counter[str] = Counter()
+
+    def acquire(self, key: Hashable) -> float:
+        """Take a token of ``key``; return 0 or the seconds until one is available."""
+        now = self._clock()
+        tokens, updated = self._buckets.pop(key, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - updated) * self.rate)
+        if tokens >= 1:
+            tokens -= 1
+            wait = 0.0
+            self._counters["allowed"] += 1
+        else:
+            wait = (1 - tokens) / self.rate
+            self._counters["throttled"] += 1
+        self._buckets[key] = (tokens, now)
+        while len(self._buckets) > self.maxsize:
+            self._buckets.popitem(last=False)
+        return wait
+
+    def clear(self) -> None:
+        self._buckets.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "keys": len(self._buckets),
+            "allowed": self._counters["allowed"],
+            "throttled": self._counters["throttled"],
+        }
@@ -0,0 +1,52 @@
+import asyncio
+from collections import Counter
+from typing import Any, Awaitable, Callable, Hashable
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls for the same key into one in-flight call.
+
+    The first caller for a key runs the function; callers arriving while it
+    is in flight await its result (or exception) instead of running it
+    again. If the leading caller is cancelled, waiters retry on their own.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, asyncio.Future] = {}
+        self._counters: Counter[str] = Counter()
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        call = self._calls.get(key)
+        if call is not None:
+            self._counters["coalesced"] += 1
+            try:
+                return await asyncio.shield(call)
+            except asyncio.CancelledError:
+                if call.cancelled():
+                    return await self.do(key, fn)
+                raise
+
+        call = asyncio.get_running_loop().create_future()
+        self._calls[key] = call
+        self._counters["executed"] += 1
+        try:
+            result = await fn()
+        except Exception as exc:
+            call.set_exception(exc)
+            call.exception()
+            raise
+        except BaseException:
+            call.cancel()
+            raise
+        finally:
+            del self._calls[key]
+        call.set_result(result)
+        return result
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "in_flight": len(self._calls),
+            "executed": self._counters["executed"],
+            "coalesced": self._counters["coalesced"],
+        }
@@ -0,0 +1,151 @@
+import heapq
+import itertools
+import time
+from collections import deque
+from operator import itemgetter
+from typing import Callable, Hashable, Iterable
+
+
+class SpaceSaving:
+    """
+    Space-saving heavy-hitter sketch (Metwally et al.).
+
+    Tracks at most ``capacity`` keys. A new key arriving when the sketch is
+    full replaces the key with the lowest count and inherits that count, so
+    counts overestimate by at most the recorded ``error``. Any key with a
+    true frequency above ``total / capacity`` is guaranteed to be tracked.
+
+    The minimum is found through a heap holding one entry per key, updated
+    lazily: increments leave the entry stale and eviction re-pushes stale
+    entries until the top is current. Every re-push pays for an earlier
+    increment, so ``add`` is amortized O(log capacity).
+    """
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self._counts: dict[Hashable, int] = {}
+        self._errors: dict[Hashable, int] = {}
+        self._heap: list[tuple[int, int, Hashable]] = []
+        self._ticket = itertools.count()
+
+    def add(self, key: Hashable, count: int = 1) -> None:
+        counts = self._counts
+        if key in counts:
+            counts[key] += count
+            return
+        if len(counts) < self.capacity:
+            floor = 0
+        else:
+            floor = self._pop_min()
+        counts[key] = floor + count
+        self._errors[key] = floor
+        heapq.heappush(self._heap, (counts[key], next(self._ticket), key))
+
+    def _pop_min(self) -> int:
+        """Evict the key with the lowest count and return that count."""
+        heap, counts = self._heap, self._counts
+        while heap[0][0] != counts[heap[0][2]]:
+            key = heap[0][2]
+            heapq.heapreplace(heap, (counts[key], next(self._ticket), key))
+        floor, _, victim = heapq.heappop(heap)
+        del counts[victim]
+        del self._errors[victim]
+        return floor
+
+    def top(self, k: int) -> list[tuple[Hashable, int, int]]:
+        """Return up to ``k`` ``(key, count, error)`` tuples, highest count first."""
+        return [
+            (key, count, self._errors[key])
+            for key, count in heapq.nlargest(k, self._counts.items(), key=itemgetter(1))
+        ]
+
+    def items(self) -> Iterable[tuple[Hashable, int, int]]:
+        """Every tracked ``(key, count, error)``, in no particular order."""
+        return ((key, count, self._errors[key]) for key, count in self._counts.items())
+
+    def decay(self) -> None:
+        """Halve every count so old traffic fades out; drops keys reaching 0."""
+        for key in list(self._counts):
+            self._counts[key] //= 2
+            self._errors[key] //= 2
+            if not self._counts[key]:
+                del self._counts[key]
+                del self._errors[key]
+        self._heap = [
+            (count, next(self._ticket), key) for key, count in self._counts.items()
+        ]
+        heapq.heapify(self._heap)
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+
+class SlidingTopK:
+    """
+    Heavy hitters of the last ``window`` seconds.
+
+    The window is split into ``slots`` space-saving sketches and recording
+    only touches the current one. When a slot closes, the closed slots still
+    inside the window are merged once into a summary trimmed to ``capacity``
+    keys, so ``top`` only combines that summary with the current slot.
+    Expiry is slot-granular: the window spans between ``slots - 1`` and
+    ``slots`` slot widths.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        window: float,
+        slots: int,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.slots = slots
+        self.slot_width = window / slots
+        self._clock = clock
+        self._closed: deque[tuple[int, SpaceSaving]] = deque()
+        self._slot = int(clock() // self.slot_width)
+        self._current = SpaceSaving(capacity)
+        self._summary: dict[Hashable, tuple[int, int]] = {}
+
+    def add(self, key: Hashable) -> None:
+        self._rotate()
+        self._current.add(key)
+
+    def top(self, k: int) -> list[tuple[Hashable, int, int]]:
+        """Return up to ``k`` ``(key, count, error)`` tuples, highest count first."""
+        self._rotate()
+        merged = dict(self._summary)
+        for key, count, error in self._current.items():
+            total, total_error = merged.get(key, (0, 0))
+            merged[key] = (total + count, total_error + error)
+        return [
+            (key, count, error)
+            for key, (count, error) in heapq.nlargest(
+                k, merged.items(), key=lambda item: item[1][0]
+            )
+        ]
+
+    def clear(self) -> None:
+        self._closed.clear()
+        self._current = SpaceSaving(self._current.capacity)
+        self._summary = {}
+
+    def _rotate(self) -> None:
+        slot = int(self._clock() // self.slot_width)
+        if slot == self._slot:
+            return
+        capacity = self._current.capacity
+        self._closed.append((self._slot, self._current))
+        self._slot = slot
+        self._current = SpaceSaving(capacity)
+        while self._closed and self._closed[0][0] <= slot - self.slots:
+            self._closed.popleft()
+
+        totals: dict[Hashable, tuple[int, int]] = {}
+        for _, sketch in self._closed:
+            for key, count, error in sketch.items():
+                total, total_error = totals.get(key, (0, 0))
+                totals[key] = (total + count, total_error + error)
+        self._summary = dict(
+            heapq.nlargest(capacity, totals.items(), key=lambda item: item[1][0])
+        )
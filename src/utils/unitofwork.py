@@ -23,19 +23,37 @@ class IUnitOfWork(ABC):
 
 
 class UnitOfWork(IUnitOfWork):
+    """
+    Session wrapper shared by the repositories.
+
+    Entering is re-entrant: nested ``async with`` blocks reuse the session of
+    the outermost one, so a request-scoped UnitOfWork serves both the auth
+    dependency and the endpoint's service with one session. The session
+    checks out a connection and begins a transaction only on its first
+    statement. A nested block that exits normally leaves the transaction
+    open for the next block; one that raises rolls it back. The outermost
+    exit always rolls back uncommitted work and closes the session.
+    """
+
     def __init__(self, session_factory):
         self.session_factory = session_factory
+        self._depth = 0
 
     async def __aenter__(self):
-        self.session = self.session_factory()
-
-        self.users = UsersRepository(self.session)
-        self.urls = UrlsRepository(self.session)
-        self.stat = StatRepository(self.session)
-
-    async def __aexit__(self, *args):
-        await self.rollback()
-        await self.session.close()
+        if self._depth == 0:
+            self.session = self.session_factory()
+
+            self.users = UsersRepository(self.session)
+            self.urls = UrlsRepository(self.session)
+            self.stat = StatRepository(self.session)
+        self._depth += 1
+
+    async def __aexit__(self, exc_type, *args):
+        self._depth -= 1
+        if self._depth == 0 or exc_type is not None:
+            await self.rollback()
+        if self._depth == 0:
+            await self.session.close()
 
     async def commit(self):
         await self.session.commit()
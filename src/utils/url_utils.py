@@ -1,7 +1,7 @@
 from sqlalchemy import and_
 
 from models.short_urls import ShortURLModel
-from schemas.short_urls import ShortURLFilters
+from schemas.short_urls import ShortURLFilters, URLSortField
 
 
 def id_to_short_url(num: int) -> str:
@@ -63,3 +63,12 @@ def build_short_url_filters(user_id: int, filters: ShortURLFilters):
         conditions.append(ShortURLModel.tag == filters.tag)
 
     return and_(*conditions)
+
+
+def short_url_order(sort_by: URLSortField) -> tuple:
+    """ORDER BY clauses of a URL listing; ties keep creation order."""
+    if sort_by == URLSortField.TOTAL_CLICKS:
+        return (ShortURLModel.total_clicks.desc(), ShortURLModel.id)
+    if sort_by == URLSortField.LAST_CLICKED_AT:
+        return (ShortURLModel.last_clicked_at.desc().nulls_last(), ShortURLModel.id)
+    return (ShortURLModel.id,)
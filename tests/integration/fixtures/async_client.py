@@ -4,6 +4,13 @@ from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
 from api.v1.dependencies import get_uow
 from models.base import Base
+from services.hot_links import hot_links
+from services.login_guard import login_guard
+from services.redirect_cache import negative_cache, redirect_cache
+from services.result_cache import user_results
+from services.short_code_filter import short_code_filter
+from services.trending import trending_links
+from services.user_cache import user_cache
 from src.main import app
 from utils.unitofwork import UnitOfWork
 
@@ -22,6 +29,14 @@ async def async_client():
         return UnitOfWork(test_session_maker)
 
     app.dependency_overrides[get_uow] = override_get_uow
+    redirect_cache.clear()
+    negative_cache.clear()
+    user_results.clear()
+    user_cache.clear()
+    login_guard.reset()
+    short_code_filter.reset()
+    hot_links.reset()
+    trending_links.clear()
 
     async with AsyncClient(
         transport=ASGITransport(app=app), base_url="http://test"
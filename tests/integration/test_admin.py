@@ -0,0 +1,96 @@
+import pytest
+
+from config import Settings, get_settings
+from src.main import app
+
+
+@pytest.fixture
+def admin_settings():
+    settings = Settings()
+    settings.admin = settings.admin.model_copy(
+        update={"admin_usernames": ["testuser"]}
+    )
+    app.dependency_overrides[get_settings] = lambda: settings
+    yield settings
+    app.dependency_overrides.pop(get_settings, None)
+
+
+@pytest.mark.asyncio
+async def test_metrics_requires_admin(async_client, test_user):
+    response = await async_client.get(
+        "/api/v1/admin/metrics",
+        headers={"Authorization": f"Bearer {test_user['access_token']}"},
+    )
+    assert response.status_code == 403
+    assert response.json()["detail"] == "Admin privileges required"
+
+
+@pytest.mark.asyncio
+async def test_metrics_exposes_redirect_cache_counters(
+    async_client, test_user, admin_settings
+):
+    response = await async_client.get(
+        "/api/v1/admin/metrics",
+        headers={"Authorization": f"Bearer {test_user['access_token']}"},
+    )
+    assert response.status_code == 200
+    cache_stats = response.json()["redirect_cache"]
+    for counter in ("size", "max_size", "hits", "misses", "evictions"):
+        assert counter in cache_stats
+
+
+@pytest.mark.asyncio
+async def test_hot_links_lists_most_redirected_codes(
+    async_client, test_user, admin_settings
+):
+    for code, clicks in (("hot", 5), ("warm", 2)):
+        await async_client.post(
+            "/api/v1/urls",
+            json={"original_url": "https://example.com", "desired_short_code": code},
+            headers={"Authorization": f"Bearer {test_user['access_token']}"},
+        )
+        for _ in range(clicks):
+            await async_client.get(f"/{code}")
+
+    response = await async_client.get(
+        "/api/v1/admin/hot-links",
+        headers={"Authorization": f"Bearer {test_user['access_token']}"},
+    )
+    assert response.status_code == 200
+    hot_links = response.json()
+    assert [link["short_code"] for link in hot_links] == ["hot", "warm"]
+    assert hot_links[0]["hits"] == 5
+
+
+@pytest.mark.asyncio
+async def test_trending_lists_most_clicked_codes(
+    async_client, test_user, admin_settings
+):
+    for code, clicks in (("warm", 2), ("hot", 4), ("cold", 1)):
+        await async_client.post(
+            "/api/v1/urls",
+            json={"original_url": "https://example.com", "desired_short_code": code},
+            headers={"Authorization": f"Bearer {test_user['access_token']}"},
+        )
+        for _ in range(clicks):
+            await async_client.get(f"/{code}")
+
+    response = await async_client.get(
+        "/api/v1/stats/trending",
+        params={"limit": 2},
+        headers={"Authorization": f"Bearer {test_user['access_token']}"},
+    )
+    assert response.status_code == 200
+    assert response.json() == [
+        {"short_code": "hot", "clicks": 4, "max_overcount": 0},
+        {"short_code": "warm", "clicks": 2, "max_overcount": 0},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_trending_requires_admin(async_client, test_user):
+    response = await async_client.get(
+        "/api/v1/stats/trending",
+        headers={"Authorization": f"Bearer {test_user['access_token']}"},
+    )
+    assert response.status_code == 403
@@ -0,0 +1,96 @@
+import time
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from config import get_settings
+from models.base import Base
+from models.short_urls import ShortURLModel
+from models.users import UserModel
+from repositories.stat import StatRepository
+from services.cache_warmup import warm_up_redirect_cache
+from services.redirect_cache import redirect_cache
+
+
+LINKS = {
+    # short_code: (is_active, expires_in, clicks_left, recent clicks, old clicks)
+    "top": (True, 3600, None, 5, 0),
+    "second": (True, 3600, 10, 3, 0),
+    "old": (True, 3600, None, 0, 9),
+    "inactive": (False, 3600, None, 9, 0),
+    "expired": (True, -1, None, 9, 0),
+    "used_up": (True, 3600, 0, 9, 0),
+}
+
+
+@pytest_asyncio.fixture(scope="function")
+async def session_maker():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    now = int(time.time())
+    maker = async_sessionmaker(bind=engine, expire_on_commit=False)
+    async with maker() as session:
+        session.add(UserModel(id=1, username="testuser", password="x"))
+        clicks = []
+        for url_id, (code, link) in enumerate(LINKS.items(), start=1):
+            is_active, expires_in, clicks_left, recent, old = link
+            session.add(
+                ShortURLModel(
+                    id=url_id,
+                    short_code=code,
+                    original_url=f"https://example.com/{code}",
+                    user_id=1,
+                    is_active=is_active,
+                    expires_at=now + expires_in,
+                    clicks_left=clicks_left,
+                )
+            )
+            clicks.extend(
+                {"short_url_id": url_id, "clicked_at": now - 60}
+                for _ in range(recent)
+            )
+            clicks.extend(
+                {"short_url_id": url_id, "clicked_at": now - 86400}
+                for _ in range(old)
+            )
+        await session.flush()
+        await StatRepository(session).record_clicks(clicks)
+        await session.commit()
+
+    redirect_cache.clear()
+    yield maker
+    redirect_cache.clear()
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_warm_up_loads_recently_clicked_live_links(session_maker):
+    loaded = await warm_up_redirect_cache(session_maker)
+
+    assert loaded == 2
+    assert redirect_cache.get("top").original_url == "https://example.com/top"
+    assert redirect_cache.get("second").is_limited
+    for code in ("old", "inactive", "expired", "used_up"):
+        assert redirect_cache.get(code) is None
+
+
+@pytest.mark.asyncio
+async def test_warm_up_respects_row_budget(session_maker, monkeypatch):
+    monkeypatch.setattr(get_settings().cache, "redirect_cache_warmup_max_links", 1)
+
+    assert await warm_up_redirect_cache(session_maker) == 1
+    assert redirect_cache.get("top") is not None
+    assert redirect_cache.get("second") is None
+
+
+@pytest.mark.asyncio
+async def test_warm_up_long_window_counts_hour_buckets(session_maker, monkeypatch):
+    monkeypatch.setattr(
+        get_settings().cache, "redirect_cache_warmup_window_seconds", 2 * 86400
+    )
+
+    assert await warm_up_redirect_cache(session_maker) == 3
+    assert redirect_cache.get("old") is not None
@@ -0,0 +1,139 @@
+import asyncio
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, func, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from models.base import Base
+from models.click_stats import ClickStatModel
+from models.short_urls import ShortURLModel
+from models.users import UserModel
+from repositories.stat import StatRepository
+from services.click_buffer import ClickBuffer
+
+
+@pytest_asyncio.fixture(scope="function")
+async def session_maker():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def enable_foreign_keys(dbapi_connection, _):
+        dbapi_connection.execute("PRAGMA foreign_keys=ON")
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    maker = async_sessionmaker(bind=engine, expire_on_commit=False)
+    async with maker() as session:
+        session.add(UserModel(id=1, username="testuser", password="x"))
+        await session.flush()
+        session.add(
+            ShortURLModel(
+                id=1,
+                short_code="abc",
+                original_url="https://example.com",
+                user_id=1,
+                expires_at=2**31,
+            )
+        )
+        await session.commit()
+
+    yield maker
+    await engine.dispose()
+
+
+async def count_clicks(maker) -> int:
+    async with maker() as session:
+        return await session.scalar(select(func.count(ClickStatModel.id)))
+
+
+@pytest.mark.asyncio
+async def test_flush_on_stop(session_maker):
+    buffer = ClickBuffer(max_batch_size=100, max_queue_size=1000, flush_interval=60)
+    await buffer.start(session_maker)
+    for i in range(10):
+        await buffer.put({"short_url_id": 1, "clicked_at": i})
+
+    assert await count_clicks(session_maker) == 0
+    await buffer.stop()
+
+    assert await count_clicks(session_maker) == 10
+    assert buffer.stats()["queue_depth"] == 0
+    assert not buffer.running
+
+
+@pytest.mark.asyncio
+async def test_flush_when_batch_is_full(session_maker):
+    buffer = ClickBuffer(max_batch_size=5, max_queue_size=1000, flush_interval=60)
+    await buffer.start(session_maker)
+    for i in range(5):
+        await buffer.put({"short_url_id": 1, "clicked_at": i})
+
+    for _ in range(50):
+        if buffer.stats()["flushed_events"] == 5:
+            break
+        await asyncio.sleep(0.01)
+
+    assert await count_clicks(session_maker) == 5
+    assert buffer.stats()["flushes"] == 1
+    await buffer.stop()
+
+
+@pytest.mark.asyncio
+async def test_flush_after_interval(session_maker):
+    buffer = ClickBuffer(max_batch_size=100, max_queue_size=1000, flush_interval=0.05)
+    await buffer.start(session_maker)
+    await buffer.put({"short_url_id": 1, "clicked_at": 0})
+    await asyncio.sleep(0.2)
+
+    assert await count_clicks(session_maker) == 1
+    await buffer.stop()
+
+
+@pytest.mark.asyncio
+async def test_backpressure_when_queue_is_full(session_maker):
+    buffer = ClickBuffer(max_batch_size=100, max_queue_size=3, flush_interval=60)
+    await buffer.start(session_maker)
+    for i in range(10):
+        await buffer.put({"short_url_id": 1, "clicked_at": i})
+    await buffer.stop()
+
+    assert buffer.stats()["backpressure_waits"] > 0
+    assert await count_clicks(session_maker) == 10
+
+
+@pytest.mark.asyncio
+async def test_transient_failure_is_retried(session_maker, monkeypatch):
+    record_clicks = StatRepository.record_clicks
+    failures = [OperationalError("INSERT", {}, Exception("connection reset"))]
+
+    async def flaky_record_clicks(self, clicks):
+        if failures:
+            raise failures.pop()
+        await record_clicks(self, clicks)
+
+    monkeypatch.setattr(StatRepository, "record_clicks", flaky_record_clicks)
+    buffer = ClickBuffer(max_batch_size=100, max_queue_size=1000, flush_interval=60)
+    await buffer.start(session_maker)
+    for i in range(3):
+        await buffer.put({"short_url_id": 1, "clicked_at": i})
+    await buffer.stop()
+
+    assert await count_clicks(session_maker) == 3
+    assert buffer.stats()["retries"] == 1
+    assert buffer.stats()["dropped_events"] == 0
+
+
+@pytest.mark.asyncio
+async def test_clicks_of_deleted_links_are_dropped_alone(session_maker):
+    buffer = ClickBuffer(max_batch_size=100, max_queue_size=1000, flush_interval=60)
+    await buffer.start(session_maker)
+    for i in range(4):
+        await buffer.put({"short_url_id": 1 if i % 2 else 999, "clicked_at": i})
+    await buffer.stop()
+
+    assert await count_clicks(session_maker) == 2
+    assert buffer.stats()["dropped_events"] == 2
+    assert buffer.stats()["retries"] == 1
@@ -0,0 +1,108 @@
+import time
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from config import get_settings
+from models.base import Base
+from models.click_rollups import DAY, HOUR, MINUTE, ClickRollupModel
+from models.click_stats import ClickStatModel
+from models.short_urls import ShortURLModel
+from models.users import UserModel
+from services.click_compaction import compact_clicks
+from utils.unitofwork import UnitOfWork
+
+
+NOW = int(time.time())
+OLD_CLICKS = 25
+RECENT_CLICKS = 3
+
+
+@pytest_asyncio.fixture(scope="function")
+async def session_maker(monkeypatch):
+    retention = get_settings().click_retention
+    monkeypatch.setattr(retention, "click_compaction_batch_size", 10)
+    monkeypatch.setattr(retention, "raw_click_retention_days", 30)
+    monkeypatch.setattr(retention, "minute_rollup_retention_days", 2)
+    monkeypatch.setattr(retention, "hour_rollup_retention_days", 90)
+
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    maker = async_sessionmaker(bind=engine, expire_on_commit=False)
+    async with maker() as session:
+        session.add(UserModel(id=1, username="testuser", password="x"))
+        session.add(
+            ShortURLModel(
+                id=1,
+                short_code="abc",
+                original_url="https://example.com",
+                user_id=1,
+                expires_at=2**31,
+            )
+        )
+        await session.commit()
+
+    uow = UnitOfWork(maker)
+    async with uow:
+        await uow.stat.record_clicks(
+            [
+                {"short_url_id": 1, "clicked_at": NOW - 40 * DAY + i}
+                for i in range(OLD_CLICKS)
+            ]
+            + [{"short_url_id": 1, "clicked_at": NOW - i} for i in range(RECENT_CLICKS)]
+        )
+        await uow.commit()
+
+    yield maker
+    await engine.dispose()
+
+
+async def day_totals(session) -> int:
+    return await session.scalar(
+        select(func.sum(ClickRollupModel.clicks)).where(
+            ClickRollupModel.granularity == DAY
+        )
+    )
+
+
+@pytest.mark.asyncio
+async def test_compaction_deletes_old_raw_clicks_in_batches(session_maker):
+    deleted = await compact_clicks(session_maker)
+
+    assert deleted["raw_clicks"] == OLD_CLICKS
+    async with session_maker() as session:
+        clicked_at = (await session.scalars(select(ClickStatModel.clicked_at))).all()
+        assert all(ts > NOW - DAY for ts in clicked_at)
+        assert len(clicked_at) == RECENT_CLICKS
+        assert await day_totals(session) == OLD_CLICKS + RECENT_CLICKS
+
+
+@pytest.mark.asyncio
+async def test_compaction_prunes_fine_rollups_past_retention(session_maker):
+    await compact_clicks(session_maker)
+
+    async with session_maker() as session:
+        rows = (await session.scalars(select(ClickRollupModel))).all()
+    oldest = {
+        granularity: min(
+            row.bucket_start for row in rows if row.granularity == granularity
+        )
+        for granularity in (MINUTE, HOUR, DAY)
+    }
+    assert oldest[MINUTE] > NOW - 2 * DAY
+    assert oldest[HOUR] < NOW - 30 * DAY
+    assert oldest[DAY] < NOW - 30 * DAY
+
+
+@pytest.mark.asyncio
+async def test_compaction_stops_after_max_batches(session_maker, monkeypatch):
+    monkeypatch.setattr(
+        get_settings().click_retention, "click_compaction_max_batches", 2
+    )
+
+    assert (await compact_clicks(session_maker))["raw_clicks"] == 20
+    assert (await compact_clicks(session_maker))["raw_clicks"] == OLD_CLICKS - 20
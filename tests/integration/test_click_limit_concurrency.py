@@ -0,0 +1,98 @@
+import asyncio
+import os
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from models.base import Base
+from models.short_urls import ShortURLModel
+from models.users import UserModel
+from repositories.urls import ClickRejectReason
+from utils.unitofwork import UnitOfWork
+
+
+CLICKS_LEFT = 25
+CONCURRENT_REDIRECTS = 200
+
+
+def database_urls():
+    urls = [pytest.param("sqlite", id="sqlite")]
+    postgres_url = os.environ.get("TEST_POSTGRES_URL")
+    urls.append(
+        pytest.param(
+            postgres_url,
+            id="postgres",
+            marks=pytest.mark.skipif(
+                not postgres_url, reason="TEST_POSTGRES_URL is not set"
+            ),
+        )
+    )
+    return urls
+
+
+@pytest_asyncio.fixture(params=database_urls())
+async def session_maker(request, tmp_path):
+    url, connect_args = request.param, {}
+    if url == "sqlite":
+        # A private file per test, and a busy timeout long enough for all
+        # writers to queue on SQLite's single write lock instead of failing
+        # with "database is locked".
+        url = f"sqlite+aiosqlite:///{tmp_path / 'concurrency.db'}"
+        connect_args = {"timeout": 30}
+    engine = create_async_engine(
+        url, pool_size=20, max_overflow=0, connect_args=connect_args
+    )
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    maker = async_sessionmaker(bind=engine, expire_on_commit=False)
+    async with maker() as session:
+        session.add(UserModel(id=1, username="testuser", password="x"))
+        session.add(
+            ShortURLModel(
+                id=1,
+                short_code="limited",
+                original_url="https://example.com",
+                user_id=1,
+                clicks_left=CLICKS_LEFT,
+                expires_at=2**31,
+            )
+        )
+        await session.commit()
+
+    yield maker
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
+
+
+async def redirect(maker):
+    uow = UnitOfWork(maker)
+    async with uow:
+        spent, reason = await uow.urls.consume_click("limited", now=0)
+        await uow.commit()
+        return spent, reason
+
+
+@pytest.mark.asyncio
+async def test_concurrent_redirects_do_not_oversell(session_maker):
+    results = await asyncio.gather(
+        *(redirect(session_maker) for _ in range(CONCURRENT_REDIRECTS))
+    )
+
+    spent = [row for row, _ in results if row is not None]
+    reasons = {reason for row, reason in results if row is None}
+    assert len(spent) == CLICKS_LEFT
+    assert all(row.original_url == "https://example.com" for row in spent)
+    assert reasons == {ClickRejectReason.CLICKS_LIMIT_REACHED}
+
+    async with session_maker() as session:
+        clicks_left = await session.scalar(
+            select(ShortURLModel.clicks_left).where(ShortURLModel.id == 1)
+        )
+    assert clicks_left == 0
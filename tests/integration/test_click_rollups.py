@@ -0,0 +1,134 @@
+import time
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from api.v1.dependencies import get_uow
+from db.database import DatabaseManager
+from models.base import Base
+from models.click_rollups import ClickRollupModel
+from models.click_stats import ClickStatModel
+from models.short_urls import ShortURLModel
+from models.users import UserModel
+from src.main import app
+from utils.unitofwork import UnitOfWork
+
+
+async def add_link(session) -> None:
+    session.add(UserModel(id=1, username="testuser", password="x"))
+    session.add(
+        ShortURLModel(
+            id=1,
+            short_code="abc",
+            original_url="https://example.com",
+            user_id=1,
+            expires_at=2**31,
+        )
+    )
+    await session.commit()
+
+
+async def read_rollups(session) -> dict:
+    rows = await session.execute(select(ClickRollupModel))
+    return {
+        (row.granularity, row.bucket_start): row.clicks for row in rows.scalars()
+    }
+
+
+@pytest_asyncio.fixture(scope="function")
+async def session_maker():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    maker = async_sessionmaker(bind=engine, expire_on_commit=False)
+    async with maker() as session:
+        await add_link(session)
+
+    yield maker
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_record_clicks_updates_minute_and_hour_rollups(session_maker):
+    batches = [[3600, 3601, 3660], [3700, 7200]]
+    for batch in batches:
+        uow = UnitOfWork(session_maker)
+        async with uow:
+            await uow.stat.record_clicks(
+                [{"short_url_id": 1, "clicked_at": ts} for ts in batch]
+            )
+            await uow.commit()
+
+    async with session_maker() as session:
+        assert await read_rollups(session) == {
+            (60, 3600): 2,
+            (60, 3660): 2,
+            (60, 7200): 1,
+            (3600, 3600): 4,
+            (3600, 7200): 1,
+            (86400, 0): 5,
+        }
+
+
+@pytest.mark.asyncio
+async def test_stats_only_count_recent_buckets(async_client, test_user):
+    await async_client.post(
+        "/api/v1/urls",
+        json={"original_url": "https://example.com", "desired_short_code": "abc"},
+        headers={"Authorization": f"Bearer {test_user['access_token']}"},
+    )
+
+    now = int(time.time())
+    uow = app.dependency_overrides[get_uow]()
+    async with uow:
+        link = await uow.urls.find_one(short_code="abc")
+        await uow.stat.record_clicks(
+            [
+                {"short_url_id": link.id, "clicked_at": clicked_at}
+                for clicked_at in (now, now - 2 * 3600, now - 3 * 86400)
+            ]
+        )
+        await uow.commit()
+
+    stats_response = await async_client.get(
+        "/api/v1/urls/stats",
+        params={"short_code": "abc"},
+        headers={"Authorization": f"Bearer {test_user['access_token']}"},
+    )
+    stats = stats_response.json()[0]
+    assert stats["clicks_last_hour"] == 1
+    assert stats["clicks_last_day"] == 2
+
+
+@pytest.mark.asyncio
+async def test_connect_backfills_rollups_of_existing_database(tmp_path):
+    db_manager = DatabaseManager(f"sqlite+aiosqlite:///{tmp_path / 'old.db'}")
+    legacy_tables = [
+        Base.metadata.tables[name] for name in ("users", "short_urls", "click_stats")
+    ]
+    async with db_manager.engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all, tables=legacy_tables)
+
+    now = int(time.time())
+    async with db_manager.async_session_maker() as session:
+        await add_link(session)
+        session.add_all(
+            ClickStatModel(short_url_id=1, clicked_at=clicked_at)
+            for clicked_at in (now, now, now - 3 * 86400)
+        )
+        await session.commit()
+
+    await db_manager.connect()
+
+    async with db_manager.async_session_maker() as session:
+        rollups = await read_rollups(session)
+    await db_manager.close()
+    assert rollups == {
+        (60, now // 60 * 60): 2,
+        (3600, now // 3600 * 3600): 2,
+        (86400, now // 86400 * 86400): 2,
+        (86400, (now - 3 * 86400) // 86400 * 86400): 1,
+    }
@@ -0,0 +1,75 @@
+import pytest
+from sqlalchemy import insert, inspect, text
+
+from db.database import DatabaseManager
+from models.base import Base
+from models.users import UserModel
+
+
+@pytest.mark.asyncio
+async def test_connect_adds_missing_indexes_to_existing_tables(tmp_path):
+    db_manager = DatabaseManager(f"sqlite+aiosqlite:///{tmp_path / 'old.db'}")
+    click_stats = Base.metadata.tables["click_stats"]
+    async with db_manager.engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        for index in click_stats.indexes:
+            await conn.run_sync(index.drop)
+
+    await db_manager.connect()
+    await db_manager.connect()
+
+    async with db_manager.engine.connect() as conn:
+        indexes = await conn.run_sync(
+            lambda sync_conn: inspect(sync_conn).get_indexes("click_stats")
+        )
+    await db_manager.close()
+    columns = {index["name"]: index["column_names"] for index in indexes}
+    assert columns["ix_click_stats_short_url_id_clicked_at"] == [
+        "short_url_id",
+        "clicked_at",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_connect_adds_and_backfills_click_totals(tmp_path):
+    db_manager = DatabaseManager(f"sqlite+aiosqlite:///{tmp_path / 'old.db'}")
+    async with db_manager.engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(Base.metadata.tables["click_rollups"].drop)
+        for index in Base.metadata.tables["short_urls"].indexes:
+            if index.name.startswith("ix_short_urls_user_id_"):
+                await conn.run_sync(index.drop)
+        for column in ("total_clicks", "last_clicked_at"):
+            await conn.execute(text(f"ALTER TABLE short_urls DROP COLUMN {column}"))
+        await conn.execute(
+            insert(UserModel).values(id=1, username="user", password="x")
+        )
+        await conn.execute(
+            text(
+                "INSERT INTO short_urls (id, short_code, original_url, user_id, "
+                "is_active, expires_at) VALUES "
+                "(1, 'a', 'https://a.com', 1, 1, 9999999999), "
+                "(2, 'b', 'https://b.com', 1, 1, 9999999999)"
+            )
+        )
+        await conn.execute(
+            text(
+                "INSERT INTO click_stats (short_url_id, clicked_at) "
+                "VALUES (1, 1000), (1, 90000), (1, 5000)"
+            )
+        )
+
+    await db_manager.connect()
+    await db_manager.connect()
+
+    async with db_manager.engine.connect() as conn:
+        rows = (
+            await conn.execute(
+                text(
+                    "SELECT id, total_clicks, last_clicked_at FROM short_urls "
+                    "ORDER BY id"
+                )
+            )
+        ).all()
+    await db_manager.close()
+    assert [tuple(row) for row in rows] == [(1, 3, 90000), (2, 0, None)]
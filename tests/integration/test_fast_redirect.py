@@ -0,0 +1,57 @@
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from api.fast_redirect import fast_redirect
+from core.exceptions import register_exception_handlers
+from src.main import app
+
+
+@pytest_asyncio.fixture(scope="function")
+async def fast_client(async_client):
+    fast_app = FastAPI()
+    fast_app.router.add_route("/{short_code}", fast_redirect, methods=["GET"])
+    register_exception_handlers(fast_app)
+    fast_app.dependency_overrides = app.dependency_overrides
+
+    async with AsyncClient(
+        transport=ASGITransport(app=fast_app), base_url="http://test"
+    ) as client:
+        yield client
+
+
+@pytest.mark.asyncio
+async def test_fast_redirect(async_client, fast_client, test_user):
+    create_response = await async_client.post(
+        "/api/v1/urls",
+        json={
+            "original_url": "https://example.com/path?q=a b",
+            "desired_short_code": "fast",
+        },
+        headers={"Authorization": f"Bearer {test_user['access_token']}"},
+    )
+    assert create_response.status_code == 201
+
+    response = await fast_client.get("/fast")
+    assert response.status_code == 307
+    assert response.headers["location"] == "https://example.com/path?q=a%20b"
+    assert response.content == b""
+
+
+@pytest.mark.asyncio
+async def test_fast_redirect_errors(async_client, fast_client, test_user):
+    response = await fast_client.get("/nonexistent")
+    assert response.status_code == 404
+    assert response.json()["detail"] == "URL not found"
+
+    create_response = await async_client.post(
+        "/api/v1/urls",
+        json={"original_url": "https://example.com", "expire_minutes": -1},
+        headers={"Authorization": f"Bearer {test_user['access_token']}"},
+    )
+    short_code = create_response.json()["short_code"]
+
+    response = await fast_client.get(f"/{short_code}")
+    assert response.status_code == 410
+    assert response.json()["detail"] == "URL has expired"
@@ -1,5 +1,11 @@
 import pytest
 
+from services.click_leases import click_leases
+from services.redirect_cache import negative_cache, redirect_cache
+from services.result_cache import user_results
+from services.short_code_filter import short_code_filter
+from utils.bloom import BloomFilter
+
 
 @pytest.mark.asyncio
 async def test_create_and_redirect_short_url(async_client, test_user):
@@ -158,3 +164,192 @@ async def test_error_cases(async_client, test_user):
         headers={"Authorization": f"Bearer {test_user['access_token']}"},
     )
     assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_redirect_served_from_cache(async_client, test_user):
+    """Test repeated redirects are resolved from the redirect cache."""
+    create_response = await async_client.post(
+        "/api/v1/urls",
+        json={"original_url": "https://example.com", "desired_short_code": "cached"},
+        headers={"Authorization": f"Bearer {test_user['access_token']}"},
+    )
+    assert create_response.status_code == 201
+
+    hits_before = redirect_cache.stats()["hits"]
+    for _ in range(3):
+        response = await async_client.get("/cached")
+        assert response.status_code == 307
+        assert response.headers["location"] == "https://example.com/"
+    assert redirect_cache.stats()["hits"] - hits_before == 2
+
+
+@pytest.mark.asyncio
+async def test_click_limit_with_leases(async_client, test_user, monkeypatch):
+    """Test leased clicks are spent from memory without overselling."""
+    monkeypatch.setattr(click_leases, "lease_size", 5)
+    monkeypatch.setattr(click_leases, "_leases", {})
+
+    create_response = await async_client.post(
+        "/api/v1/urls",
+        json={"original_url": "https://example.com", "clicks_left": 12},
+        headers={"Authorization": f"Bearer {test_user['access_token']}"},
+    )
+    assert create_response.status_code == 201
+    short_code = create_response.json()["short_code"]
+
+    stats_before = click_leases.stats()
+    for _ in range(12):
+        response = await async_client.get(f"/{short_code}")
+        assert response.status_code == 307
+
+    response = await async_client.get(f"/{short_code}")
+    assert response.status_code == 410
+    assert response.json()["detail"] == "Click limit reached"
+
+    stats = click_leases.stats()
+    assert stats["leases_acquired"] - stats_before["leases_acquired"] == 2
+    assert (
+        stats["clicks_served_from_lease"]
+        - stats_before["clicks_served_from_lease"]
+        == 8
+    )
+
+
+@pytest.mark.asyncio
+async def test_deactivation_returns_leased_clicks(
+    async_client, test_user, monkeypatch
+):
+    """Test deactivating a link gives unused leased clicks back."""
+    monkeypatch.setattr(click_leases, "lease_size", 5)
+    monkeypatch.setattr(click_leases, "_leases", {})
+
+    create_response = await async_client.post(
+        "/api/v1/urls",
+        json={"original_url": "https://example.com", "clicks_left": 20},
+        headers={"Authorization": f"Bearer {test_user['access_token']}"},
+    )
+    short_code = create_response.json()["short_code"]
+
+    response = await async_client.get(f"/{short_code}")
+    assert response.status_code == 307
+
+    deactivate_response = await async_client.patch(
+        f"/api/v1/urls/{short_code}",
+        headers={"Authorization": f"Bearer {test_user['access_token']}"},
+    )
+    assert deactivate_response.status_code == 200
+
+    response = await async_client.get(
+        "/api/v1/urls",
+        params={"short_code": short_code},
+        headers={"Authorization": f"Bearer {test_user['access_token']}"},
+    )
+    assert response.json()[0]["clicks_left"] == 19
+    assert click_leases.stats()["active_leases"] == 0
+
+
+@pytest.mark.asyncio
+async def test_not_found_result_is_cached_until_code_is_created(
+    async_client, test_user
+):
+    """Test the negative cache is invalidated when the code gets created."""
+    response = await async_client.get("/later")
+    assert response.status_code == 404
+
+    hits_before = negative_cache.stats()["hits"]
+    response = await async_client.get("/later")
+    assert response.status_code == 404
+    assert negative_cache.stats()["hits"] - hits_before == 1
+
+    create_response = await async_client.post(
+        "/api/v1/urls",
+        json={"original_url": "https://example.com", "desired_short_code": "later"},
+        headers={"Authorization": f"Bearer {test_user['access_token']}"},
+    )
+    assert create_response.status_code == 201
+
+    response = await async_client.get("/later")
+    assert response.status_code == 307
+
+
+@pytest.mark.asyncio
+async def test_bloom_filter_rejects_unknown_codes(
+    async_client, test_user, monkeypatch
+):
+    """Test codes missing from the Bloom filter get a 404 without a lookup."""
+    monkeypatch.setattr(short_code_filter, "_bloom", BloomFilter(100, 0.01))
+
+    create_response = await async_client.post(
+        "/api/v1/urls",
+        json={"original_url": "https://example.com", "desired_short_code": "known"},
+        headers={"Authorization": f"Bearer {test_user['access_token']}"},
+    )
+    assert create_response.status_code == 201
+
+    response = await async_client.get("/known")
+    assert response.status_code == 307
+
+    rejected_before = short_code_filter.stats()["rejected"]
+    response = await async_client.get("/unknown")
+    assert response.status_code == 404
+    assert short_code_filter.stats()["rejected"] - rejected_before == 1
+
+
+@pytest.mark.asyncio
+async def test_url_listing_cache_is_invalidated_on_changes(async_client, test_user):
+    headers = {"Authorization": f"Bearer {test_user['access_token']}"}
+    active = {"is_active": True}
+    response = await async_client.post(
+        "/api/v1/urls", json={"original_url": "https://example1.com"}, headers=headers
+    )
+    short_code = response.json()["short_code"]
+
+    response = await async_client.get("/api/v1/urls", params=active, headers=headers)
+    assert len(response.json()) == 1
+
+    hits = user_results.stats()["hits"]
+    response = await async_client.get("/api/v1/urls", params=active, headers=headers)
+    assert len(response.json()) == 1
+    assert user_results.stats()["hits"] == hits + 1
+
+    await async_client.post(
+        "/api/v1/urls", json={"original_url": "https://example2.com"}, headers=headers
+    )
+    response = await async_client.get("/api/v1/urls", params=active, headers=headers)
+    assert len(response.json()) == 2
+
+    await async_client.patch(f"/api/v1/urls/{short_code}", headers=headers)
+    response = await async_client.get("/api/v1/urls", params=active, headers=headers)
+    assert short_code not in [url["short_code"] for url in response.json()]
+    assert len(response.json()) == 1
+
+
+@pytest.mark.asyncio
+async def test_url_listing_sorted_by_click_totals(async_client, test_user):
+    headers = {"Authorization": f"Bearer {test_user['access_token']}"}
+    for code, clicks in (("never", 0), ("popular", 3), ("recent", 1)):
+        response = await async_client.post(
+            "/api/v1/urls",
+            json={"original_url": "https://example.com", "desired_short_code": code},
+            headers=headers,
+        )
+        assert response.json()["total_clicks"] == 0
+        for _ in range(clicks):
+            assert (await async_client.get(f"/{code}")).status_code == 307
+
+    response = await async_client.get(
+        "/api/v1/urls", params={"sort_by": "total_clicks"}, headers=headers
+    )
+    urls = response.json()
+    assert [url["short_code"] for url in urls] == ["popular", "recent", "never"]
+    assert [url["total_clicks"] for url in urls] == [3, 1, 0]
+    assert urls[0]["last_clicked_at"] is not None
+    assert urls[2]["last_clicked_at"] is None
+
+    response = await async_client.get(
+        "/api/v1/urls", params={"sort_by": "last_clicked_at"}, headers=headers
+    )
+    urls = response.json()
+    assert urls[2]["short_code"] == "never"
+    assert urls[0]["last_clicked_at"] >= urls[1]["last_clicked_at"]
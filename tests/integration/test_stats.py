@@ -1,8 +1,13 @@
+import json
 from datetime import datetime, timedelta, timezone
 
 import pytest
 
+from api.v1.dependencies import get_uow
 from models.click_stats import ClickStatModel
+from services.result_cache import user_results
+from src.main import app
+from utils.hyperloglog import hash64
 
 
 @pytest.mark.asyncio
@@ -174,3 +179,292 @@ async def test_stats_for_deactivated_urls(async_client, test_user):
     stats = stats_response.json()[0]
     assert stats["clicks_last_hour"] == 2
     assert stats["clicks_last_day"] == 2
+
+
+async def create_link_with_clicks(async_client, test_user, clicked_at: list[int]):
+    await async_client.post(
+        "/api/v1/urls",
+        json={"original_url": "https://example.com", "desired_short_code": "series"},
+        headers={"Authorization": f"Bearer {test_user['access_token']}"},
+    )
+    uow = app.dependency_overrides[get_uow]()
+    async with uow:
+        link = await uow.urls.find_one(short_code="series")
+        await uow.stat.record_clicks(
+            [{"short_url_id": link.id, "clicked_at": ts} for ts in clicked_at]
+        )
+        await uow.commit()
+
+
+@pytest.mark.asyncio
+async def test_click_series_buckets(async_client, test_user):
+    """Test bucketed click counts over an explicit range."""
+    start = 1_700_000_000 // 3600 * 3600
+    await create_link_with_clicks(
+        async_client, test_user, [start + 10, start + 20, start + 2 * 3600 + 5]
+    )
+
+    response = await async_client.get(
+        "/api/v1/stats/series/series",
+        params={"from": start + 1800, "to": start + 3 * 3600, "bucket": "1h"},
+        headers={"Authorization": f"Bearer {test_user['access_token']}"},
+    )
+    assert response.status_code == 200
+    series = response.json()
+    assert series["bucket"] == "1h"
+    assert series["points"] == [
+        {"bucket_start": start, "clicks": 2},
+        {"bucket_start": start + 3600, "clicks": 0},
+        {"bucket_start": start + 2 * 3600, "clicks": 1},
+    ]
+
+    response = await async_client.get(
+        "/api/v1/stats/series/series",
+        params={"from": start, "to": start + 120, "bucket": "1m"},
+        headers={"Authorization": f"Bearer {test_user['access_token']}"},
+    )
+    assert [point["clicks"] for point in response.json()["points"]] == [2, 0]
+
+
+@pytest.mark.asyncio
+async def test_click_series_rejects_oversized_ranges(async_client, test_user):
+    """Test the bucket-count cap and range validation."""
+    await create_link_with_clicks(async_client, test_user, [])
+
+    response = await async_client.get(
+        "/api/v1/stats/series/series",
+        params={"from": 0, "to": 365 * 86400, "bucket": "1m"},
+        headers={"Authorization": f"Bearer {test_user['access_token']}"},
+    )
+    assert response.status_code == 400
+
+    response = await async_client.get(
+        "/api/v1/stats/series/series",
+        params={"from": 100, "to": 100},
+        headers={"Authorization": f"Bearer {test_user['access_token']}"},
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_click_series_of_unknown_url(async_client, test_user):
+    """Test the series of a URL that does not exist."""
+    response = await async_client.get(
+        "/api/v1/stats/missing/series",
+        headers={"Authorization": f"Bearer {test_user['access_token']}"},
+    )
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_stats_windows_and_sorting(async_client, test_user):
+    """Test custom windows and sorting by any of them."""
+    now = int(datetime.now(timezone.utc).timestamp())
+    clicks = {
+        "recent": [now] * 3,
+        "weekly": [now - 3 * 86400] * 5,
+    }
+    uow = app.dependency_overrides[get_uow]()
+    for code in clicks:
+        await async_client.post(
+            "/api/v1/urls",
+            json={"original_url": "https://example.com", "desired_short_code": code},
+            headers={"Authorization": f"Bearer {test_user['access_token']}"},
+        )
+    async with uow:
+        for code, clicked_at in clicks.items():
+            link = await uow.urls.find_one(short_code=code)
+            await uow.stat.record_clicks(
+                [{"short_url_id": link.id, "clicked_at": ts} for ts in clicked_at]
+            )
+        await uow.commit()
+
+    response = await async_client.get(
+        "/api/v1/urls/stats",
+        params={"windows": "5m,24h,7d", "sort_by": "7d"},
+        headers={"Authorization": f"Bearer {test_user['access_token']}"},
+    )
+    assert response.status_code == 200
+    stats = response.json()
+    assert [row["short_code"] for row in stats] == ["weekly", "recent"]
+    assert stats[0]["clicks"] == {"5m": 0, "24h": 0, "7d": 5}
+    assert stats[1]["clicks"] == {"5m": 3, "24h": 3, "7d": 3}
+    assert stats[1]["clicks_last_hour"] == 3
+
+    response = await async_client.get(
+        "/api/v1/urls/stats",
+        params={"windows": "7d", "sort_by": "5m"},
+        headers={"Authorization": f"Bearer {test_user['access_token']}"},
+    )
+    assert [row["short_code"] for row in response.json()] == ["recent", "weekly"]
+
+
+@pytest.mark.asyncio
+async def test_stats_rejects_invalid_windows(async_client, test_user):
+    """Test validation of requested windows."""
+    for params in ({"windows": "5x"}, {"windows": "0m"}, {"sort_by": "forever"}):
+        response = await async_client.get(
+            "/api/v1/urls/stats",
+            params=params,
+            headers={"Authorization": f"Bearer {test_user['access_token']}"},
+        )
+        assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_stats_minute_windows_longer_than_a_day(async_client, test_user):
+    """Test minute windows past a day are accepted only as whole hours."""
+    headers = {"Authorization": f"Bearer {test_user['access_token']}"}
+    for windows in ("1441m", "5000m"):
+        response = await async_client.get(
+            "/api/v1/urls/stats", params={"windows": windows}, headers=headers
+        )
+        assert response.status_code == 422
+    response = await async_client.get(
+        "/api/v1/urls/stats", params={"sort_by": "2000m"}, headers=headers
+    )
+    assert response.status_code == 422
+
+    for windows in ("90m", "1440m", "3000m"):
+        response = await async_client.get(
+            "/api/v1/urls/stats",
+            params={"windows": windows, "sort_by": windows},
+            headers=headers,
+        )
+        assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_unique_visitors(async_client, test_user):
+    """Test approximate unique visitors fed by redirects."""
+    create_response = await async_client.post(
+        "/api/v1/urls",
+        json={"original_url": "https://example.com"},
+        headers={"Authorization": f"Bearer {test_user['access_token']}"},
+    )
+    short_code = create_response.json()["short_code"]
+
+    for user_agent in ["browser-a", "browser-b", "browser-a", "browser-c"]:
+        response = await async_client.get(
+            f"/{short_code}", headers={"User-Agent": user_agent}
+        )
+        assert response.status_code == 307
+
+    stats_response = await async_client.get(
+        "/api/v1/urls/stats",
+        params={"short_code": short_code, "windows": "5m,1h,48h,7d"},
+        headers={"Authorization": f"Bearer {test_user['access_token']}"},
+    )
+    stats = stats_response.json()[0]
+    assert stats["clicks_last_day"] == 4
+    assert stats["clicks"]["7d"] == 4
+    assert stats["unique_visitors_last_day"] == 3
+    assert stats["unique_visitors"] == {"1h": 3, "48h": 3}
+
+
+@pytest.mark.asyncio
+async def test_visitor_sketches_merge_across_batches(async_client, test_user):
+    """Test sketches written by separate flushes are merged, not replaced."""
+    await create_link_with_clicks(async_client, test_user, [])
+    now = int(datetime.now(timezone.utc).timestamp())
+
+    uow = app.dependency_overrides[get_uow]()
+    async with uow:
+        link_id = (await uow.urls.find_one(short_code="series")).id
+    for visitors in (range(0, 30), range(20, 50)):
+        async with uow:
+            await uow.stat.record_clicks(
+                [
+                    {"short_url_id": link_id, "clicked_at": now, "visitor": visitor}
+                    for visitor in (hash64(str(v)) for v in visitors)
+                ]
+            )
+            await uow.commit()
+
+    stats_response = await async_client.get(
+        "/api/v1/urls/stats",
+        params={"short_code": "series"},
+        headers={"Authorization": f"Bearer {test_user['access_token']}"},
+    )
+    stats = stats_response.json()[0]
+    assert stats["clicks_last_day"] == 60
+    # A sketch overwritten by the second batch would report about 30.
+    assert abs(stats["unique_visitors_last_day"] - 50) <= 2
+
+
+@pytest.mark.asyncio
+async def test_stats_are_cached_briefly(async_client, test_user):
+    headers = {"Authorization": f"Bearer {test_user['access_token']}"}
+    create_response = await async_client.post(
+        "/api/v1/urls", json={"original_url": "https://example.com"}, headers=headers
+    )
+    short_code = create_response.json()["short_code"]
+    await async_client.get(f"/{short_code}")
+
+    response = await async_client.get("/api/v1/urls/stats", headers=headers)
+    assert response.json()[0]["clicks_last_hour"] == 1
+
+    await async_client.get(f"/{short_code}")
+    response = await async_client.get("/api/v1/urls/stats", headers=headers)
+    assert response.json()[0]["clicks_last_hour"] == 1
+
+    user_results.clear()
+    response = await async_client.get("/api/v1/urls/stats", headers=headers)
+    assert response.json()[0]["clicks_last_hour"] == 2
+
+
+@pytest.mark.asyncio
+async def test_export_links_as_ndjson(async_client, test_user):
+    day = 1_700_000_000 // 86400 * 86400
+    await create_link_with_clicks(
+        async_client, test_user, [day + 10, day + 20, day + 86400 + 5]
+    )
+    await async_client.post(
+        "/api/v1/urls",
+        json={"original_url": "https://example.org", "desired_short_code": "idle"},
+        headers={"Authorization": f"Bearer {test_user['access_token']}"},
+    )
+
+    response = await async_client.get(
+        "/api/v1/stats/export",
+        params={"kind": "links", "from": day, "to": day + 86400},
+        headers={"Authorization": f"Bearer {test_user['access_token']}"},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [(row["short_code"], row["clicks"]) for row in rows] == [
+        ("series", 2),
+        ("idle", 0),
+    ]
+    assert rows[0]["total_clicks"] == 3
+    assert rows[0]["last_clicked_at"] == day + 86400 + 5
+
+
+@pytest.mark.asyncio
+async def test_export_raw_clicks_as_csv(async_client, test_user):
+    start = 1_700_000_000
+    await create_link_with_clicks(async_client, test_user, [start + 30, start, start + 90])
+
+    response = await async_client.get(
+        "/api/v1/stats/export",
+        params={"kind": "clicks", "format": "csv", "from": start, "to": start + 60},
+        headers={"Authorization": f"Bearer {test_user['access_token']}"},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.text.splitlines() == [
+        "short_code,clicked_at",
+        f"series,{start}",
+        f"series,{start + 30}",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_export_rejects_empty_range(async_client, test_user):
+    response = await async_client.get(
+        "/api/v1/stats/export",
+        params={"kind": "clicks", "from": 200, "to": 100},
+        headers={"Authorization": f"Bearer {test_user['access_token']}"},
+    )
+    assert response.status_code == 400
@@ -0,0 +1,42 @@
+import pytest
+from sqlalchemy import event
+from sqlalchemy.pool import Pool
+
+from services.user_cache import user_cache
+
+
+@pytest.fixture
+def checkouts():
+    counted = []
+
+    def on_checkout(*args):
+        counted.append(args)
+
+    event.listen(Pool, "checkout", on_checkout)
+    yield counted
+    event.remove(Pool, "checkout", on_checkout)
+
+
+@pytest.mark.asyncio
+async def test_authenticated_request_checks_out_one_connection(
+    async_client, test_user, checkouts
+):
+    headers = {"Authorization": f"Bearer {test_user['access_token']}"}
+    user_cache.clear()
+
+    response = await async_client.get("/api/v1/urls", headers=headers)
+
+    assert response.status_code == 200
+    assert len(checkouts) == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_service_call_rolls_back_shared_session(async_client, test_user):
+    headers = {"Authorization": f"Bearer {test_user['access_token']}"}
+    user_cache.clear()
+
+    response = await async_client.patch("/api/v1/urls/missing", headers=headers)
+    assert response.status_code == 404
+
+    response = await async_client.get("/api/v1/users/me", headers=headers)
+    assert response.status_code == 200
@@ -1,5 +1,9 @@
 import pytest
 
+from repositories.users import UsersRepository
+from services.login_guard import login_guard
+from utils.jwt_utils import password_executor
+
 
 @pytest.mark.asyncio
 async def test_register_user(async_client):
@@ -166,3 +170,104 @@ async def test_invalid_token_format(async_client):
     )
     assert response.status_code == 401
     assert response.json()["detail"] == "Not authenticated"
+
+
+@pytest.mark.asyncio
+async def test_login_rejected_when_password_pool_is_saturated(
+    async_client, monkeypatch
+):
+    await async_client.post(
+        "/api/v1/register",
+        data={"username": "testuser", "password": "testpass"},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    monkeypatch.setattr(password_executor, "max_pending", 0)
+
+    response = await async_client.post(
+        "/api/v1/token",
+        data={"username": "testuser", "password": "testpass", "grant_type": "password"},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+    assert password_executor.stats()["rejected"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_authentication_uses_cached_user(async_client, test_user, monkeypatch):
+    headers = {"Authorization": f"Bearer {test_user['access_token']}"}
+    response = await async_client.get("/api/v1/users/me", headers=headers)
+    assert response.status_code == 200
+
+    lookups = []
+    find_one = UsersRepository.find_one
+
+    async def counting_find_one(self, **filter_by):
+        lookups.append(filter_by)
+        return await find_one(self, **filter_by)
+
+    monkeypatch.setattr(UsersRepository, "find_one", counting_find_one)
+    for _ in range(3):
+        response = await async_client.get("/api/v1/users/me", headers=headers)
+        assert response.json()["username"] == "testuser"
+    assert not lookups
+
+
+@pytest.mark.asyncio
+async def test_revoked_token_is_rejected_immediately(async_client, test_user):
+    headers = {"Authorization": f"Bearer {test_user['access_token']}"}
+    response = await async_client.get("/api/v1/users/me", headers=headers)
+    user_id = response.json()["id"]
+
+    response = await async_client.post(
+        f"/api/v1/users/{user_id}/revoke_tokens", headers=headers
+    )
+    assert response.status_code == 200
+
+    response = await async_client.get("/api/v1/users/me", headers=headers)
+    assert response.status_code == 401
+    assert response.json()["detail"] == "Token revoked"
+
+
+@pytest.mark.asyncio
+async def test_login_throttled_per_username_before_password_check(
+    async_client, monkeypatch
+):
+    await async_client.post(
+        "/api/v1/register",
+        data={"username": "testuser", "password": "testpass"},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    monkeypatch.setattr(login_guard.by_username, "burst", 2)
+    for _ in range(2):
+        response = await async_client.post(
+            "/api/v1/token",
+            data={"username": "testuser", "password": "wrong", "grant_type": "password"},
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+        )
+        assert response.status_code == 401
+
+    checks = password_executor.stats()["completed"]
+    response = await async_client.post(
+        "/api/v1/token",
+        data={"username": "testuser", "password": "testpass", "grant_type": "password"},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    assert response.status_code == 429
+    assert int(response.headers["retry-after"]) >= 1
+    assert password_executor.stats()["completed"] == checks
+
+
+@pytest.mark.asyncio
+async def test_login_rejected_when_too_many_logins_in_flight(
+    async_client, monkeypatch
+):
+    monkeypatch.setattr(login_guard, "max_concurrent", 0)
+
+    response = await async_client.post(
+        "/api/v1/token",
+        data={"username": "testuser", "password": "testpass", "grant_type": "password"},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    assert response.status_code == 429
+    assert response.json()["detail"] == "Too many concurrent login attempts"
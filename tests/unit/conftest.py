@@ -0,0 +1,16 @@
+import pytest
+
+
+class FakeClock:
+    """Manually advanced stand-in for the ``clock`` callables of the utils."""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
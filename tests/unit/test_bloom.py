@@ -0,0 +1,27 @@
+from src.utils.bloom import BloomFilter
+
+
+def test_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    codes = [f"code{i}" for i in range(1000)]
+    for code in codes:
+        bloom.add(code)
+
+    assert all(code in bloom for code in codes)
+    assert bloom.count == 1000
+
+
+def test_false_positive_rate_close_to_target():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    for i in range(1000):
+        bloom.add(f"code{i}")
+
+    false_positives = sum(f"missing{i}" in bloom for i in range(10000))
+    assert false_positives / 10000 < 0.03
+    assert 0.005 < bloom.estimated_false_positive_rate < 0.02
+
+
+def test_memory_is_sized_from_capacity():
+    bloom = BloomFilter(capacity=1_000_000, error_rate=0.01)
+    assert bloom.memory_bytes < 1_300_000
+    assert bloom.hash_count == 7
@@ -0,0 +1,37 @@
+import asyncio
+import threading
+
+import pytest
+
+from src.utils.bounded_executor import BoundedExecutor, ExecutorSaturated
+
+
+@pytest.mark.asyncio
+async def test_runs_calls_off_the_event_loop():
+    executor = BoundedExecutor(max_workers=2, max_pending=4)
+    loop_thread = threading.get_ident()
+
+    thread = await executor.run(threading.get_ident)
+
+    assert thread != loop_thread
+    assert executor.stats()["completed"] == 1
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_rejects_calls_beyond_max_pending():
+    executor = BoundedExecutor(max_workers=1, max_pending=2)
+    release = threading.Event()
+    calls = [asyncio.create_task(executor.run(release.wait)) for _ in range(2)]
+    await asyncio.sleep(0.05)
+
+    stats = executor.stats()
+    assert (stats["running"], stats["queue_depth"]) == (1, 1)
+    with pytest.raises(ExecutorSaturated):
+        await executor.run(release.wait)
+
+    release.set()
+    assert await asyncio.gather(*calls) == [True, True]
+    stats = executor.stats()
+    assert (stats["completed"], stats["rejected"], stats["queue_depth"]) == (2, 1, 0)
+    executor.shutdown()
@@ -0,0 +1,78 @@
+from src.utils.cache import TTLCache
+
+
+def test_get_and_set():
+    cache = TTLCache(maxsize=10, ttl=60)
+    assert cache.get("a") is None
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_entry_expires_after_ttl(clock):
+    cache = TTLCache(maxsize=10, ttl=60, clock=clock)
+    cache.set("a", 1)
+
+    clock.now += 59
+    assert cache.get("a") == 1
+
+    clock.now += 1
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+    assert len(cache) == 0
+
+
+def test_entry_expires_at_explicit_deadline(clock):
+    cache = TTLCache(maxsize=10, ttl=60, clock=clock)
+    cache.set("a", 1, expires_at=clock.now + 10)
+
+    clock.now += 10
+    assert cache.get("a") is None
+
+
+def test_already_expired_entry_is_not_stored(clock):
+    cache = TTLCache(maxsize=10, ttl=60, clock=clock)
+    cache.set("a", 1, expires_at=clock.now - 1)
+    assert len(cache) == 0
+
+
+def test_lru_eviction():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_zero_size_disables_cache():
+    cache = TTLCache(maxsize=0, ttl=60)
+    cache.set("a", 1)
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_pinned_keys_are_not_evicted():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("hot", 1)
+    cache.pin({"hot"})
+    cache.set("b", 2)
+    cache.set("c", 3)
+
+    assert cache.get("hot") == 1
+    assert cache.get("b") is None
+    assert cache.stats()["pinned"] == 1
+
+
+def test_pinned_keys_still_expire(clock):
+    cache = TTLCache(maxsize=2, ttl=60, clock=clock)
+    cache.set("hot", 1)
+    cache.pin({"hot"})
+
+    clock.now += 60
+    assert cache.get("hot") is None
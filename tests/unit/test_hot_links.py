@@ -0,0 +1,52 @@
+from src.services.hot_links import HotLinkTracker
+
+
+def test_link_is_pinned_once_hot(clock):
+    tracker = HotLinkTracker(capacity=16, top_k=2, min_hits=4, window=10, clock=clock)
+    for _ in range(4):
+        tracker.record("hot")
+    tracker.record("cold")
+    tracker.record("cold")
+    clock.now += 10
+    tracker.record("hot")
+
+    top = {link["short_code"]: link for link in tracker.top()}
+    assert top["hot"]["pinned"]
+    assert not top["cold"]["pinned"]
+
+
+def test_link_is_unpinned_when_traffic_stops(clock):
+    tracker = HotLinkTracker(capacity=16, top_k=2, min_hits=4, window=10, clock=clock)
+    for _ in range(4):
+        tracker.record("hot")
+    clock.now += 10
+    tracker.record("other")
+    clock.now += 10
+    tracker.record("other")
+
+    assert not any(link["pinned"] for link in tracker.top())
+
+
+def test_hot_link_survives_long_tail_churn(clock):
+    tracker = HotLinkTracker(capacity=8, top_k=1, min_hits=4, window=10, clock=clock)
+    for window in range(3):
+        for i in range(200):
+            tracker.record("hot")
+            tracker.record(f"tail-{window}-{i}")
+        clock.now += 10
+    tracker.record("hot")
+
+    [top] = tracker.top()
+    assert top["short_code"] == "hot"
+    assert top["pinned"]
+
+
+def test_reset_restarts_decay_window(clock):
+    tracker = HotLinkTracker(capacity=16, top_k=1, min_hits=4, window=10, clock=clock)
+    clock.now += 9
+    tracker.reset()
+    clock.now += 9
+    for _ in range(5):
+        tracker.record("hot")
+
+    assert tracker.top()[0]["hits"] == 5
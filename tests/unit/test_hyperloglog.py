@@ -0,0 +1,55 @@
+import random
+
+import pytest
+
+from src.utils.hyperloglog import HyperLogLog, register_max
+
+
+def make_sketch(values) -> HyperLogLog:
+    sketch = HyperLogLog(11)
+    for value in values:
+        sketch.add(f"visitor-{value}")
+    return sketch
+
+
+@pytest.mark.parametrize("cardinality", [0, 10, 1000, 50000])
+def test_count_is_within_error_bound(cardinality):
+    sketch = make_sketch(range(cardinality))
+
+    # ~2.3% standard error at precision 11; allow four standard errors.
+    assert abs(sketch.count() - cardinality) <= max(1, cardinality * 0.1)
+
+
+def test_duplicates_are_counted_once():
+    assert make_sketch([1, 2, 3] * 100).count() == 3
+
+
+def test_merge_counts_union():
+    sketch = make_sketch(range(0, 6000))
+    sketch.merge(make_sketch(range(3000, 9000)))
+
+    assert abs(sketch.count() - 9000) <= 900
+
+
+def test_register_max_matches_bytewise_max():
+    rng = random.Random(7)
+    for _ in range(50):
+        left = bytes(rng.randint(0, 54) for _ in range(2048))
+        right = bytes(rng.randint(0, 54) for _ in range(2048))
+
+        assert register_max(left, right) == bytes(map(max, left, right))
+
+
+def test_bytes_round_trip_is_compact():
+    sketch = make_sketch(range(20))
+    data = sketch.to_bytes()
+
+    assert len(data) < 200
+    restored = HyperLogLog.from_bytes(data)
+    assert restored.precision == 11
+    assert restored.count() == sketch.count()
+
+
+def test_merge_rejects_other_precision():
+    with pytest.raises(ValueError):
+        HyperLogLog(11).merge(HyperLogLog(10))
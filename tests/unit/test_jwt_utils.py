@@ -1,3 +1,4 @@
+import time
 from datetime import datetime, timedelta, timezone
 
 import jwt
@@ -138,3 +139,33 @@ def test_token_expiration_times(jwt_utils):
     assert abs((access_exp - now).total_seconds() - 15 * 60) < 5
 
     assert abs((refresh_exp - now).total_seconds() - 60 * 60) < 5
+
+
+def test_decode_jwt_caches_verified_payload(jwt_utils, monkeypatch):
+    token = jwt_utils.create_token_pair(1, 1).access_token
+    first = jwt_utils.decode_jwt(token)
+
+    def fail_decode(*args, **kwargs):
+        raise AssertionError("token verified again")
+
+    monkeypatch.setattr(jwt, "decode", fail_decode)
+    assert jwt_utils.decode_jwt(token) == first
+    assert jwt_utils.decoded_token_stats()["hits"] == 1
+
+
+def test_decode_jwt_cache_honours_exp(jwt_utils, test_settings):
+    payload = {
+        "id": 1,
+        "token_type": TokenType.ACCESS,
+        "token_version": 1,
+        "exp": int(time.time()) + 1,
+    }
+    token = jwt.encode(
+        payload, test_settings.auth_jwt.secret_key, test_settings.auth_jwt.algorithm
+    )
+    assert jwt_utils.decode_jwt(token).id == 1
+
+    time.sleep(payload["exp"] - time.time() + 0.05)
+    with pytest.raises(HTTPException) as exc_info:
+        jwt_utils.decode_jwt(token)
+    assert exc_info.value.detail == "Token expired"
@@ -0,0 +1,35 @@
+import pytest
+
+from src.utils.rate_limit import TokenBucketLimiter
+
+
+def test_burst_then_throttle_until_refill(clock):
+    limiter = TokenBucketLimiter(rate=0.5, burst=3, maxsize=10, clock=clock)
+
+    assert [limiter.acquire("a") for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert limiter.acquire("a") == pytest.approx(2.0)
+    assert limiter.acquire("b") == 0.0
+
+    clock.now += 2
+    assert limiter.acquire("a") == 0.0
+    assert limiter.acquire("a") > 0
+    assert limiter.stats() == {"keys": 2, "allowed": 5, "throttled": 2}
+
+
+def test_refill_is_capped_at_burst(clock):
+    limiter = TokenBucketLimiter(rate=1, burst=2, maxsize=10, clock=clock)
+    limiter.acquire("a")
+
+    clock.now += 60
+    assert [limiter.acquire("a") for _ in range(2)] == [0.0, 0.0]
+    assert limiter.acquire("a") > 0
+
+
+def test_least_recently_used_keys_are_dropped(clock):
+    limiter = TokenBucketLimiter(rate=1, burst=1, maxsize=2, clock=clock)
+    for key in ("a", "b", "c"):
+        limiter.acquire(key)
+
+    assert limiter.stats()["keys"] == 2
+    assert limiter.acquire("a") == 0.0
+    assert limiter.acquire("c") > 0
@@ -0,0 +1,59 @@
+from src.schemas.short_urls import ShortURLFilters
+from src.services.result_cache import UserResultCache
+
+
+def make_cache(clock, maxsize=10):
+    return UserResultCache(maxsize=maxsize, ttls={"urls": 30, "stats": 5}, clock=clock)
+
+
+def test_key_is_normalized_filter_set(clock):
+    cache = make_cache(clock)
+    assert cache.key("urls", 1, ShortURLFilters(tag="a")) == cache.key(
+        "urls", 1, ShortURLFilters(tag="a", page=1)
+    )
+    assert cache.key("urls", 1, ShortURLFilters()) != cache.key(
+        "urls", 2, ShortURLFilters()
+    )
+    assert cache.key("urls", 1, ShortURLFilters()) != cache.key(
+        "stats", 1, ShortURLFilters()
+    )
+
+
+def test_entries_expire_after_kind_ttl(clock):
+    cache = make_cache(clock)
+    stats_key = cache.key("stats", 1, ShortURLFilters())
+    urls_key = cache.key("urls", 1, ShortURLFilters())
+    cache.set(stats_key, ["stats"])
+    cache.set(urls_key, ["urls"])
+
+    clock.now += 6
+    assert cache.get(stats_key) is None
+    assert cache.get(urls_key) == ["urls"]
+
+    clock.now += 25
+    assert cache.get(urls_key) is None
+
+
+def test_invalidate_user_only_drops_that_user(clock):
+    cache = make_cache(clock)
+    filters = ShortURLFilters()
+    cache.set(cache.key("urls", 1, filters), ["one"])
+    cache.set(cache.key("urls", 2, filters), ["two"])
+
+    cache.invalidate_user(1)
+
+    assert cache.get(cache.key("urls", 1, filters)) is None
+    assert cache.get(cache.key("urls", 2, filters)) == ["two"]
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = make_cache(clock, maxsize=2)
+    keys = [cache.key("urls", 1, ShortURLFilters(page=page)) for page in (1, 2, 3)]
+    cache.set(keys[0], ["page 1"])
+    cache.set(keys[1], ["page 2"])
+    cache.get(keys[0])
+    cache.set(keys[2], ["page 3"])
+
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) == ["page 1"]
+    assert cache.stats()["evictions"] == 1
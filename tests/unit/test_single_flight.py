@@ -0,0 +1,70 @@
+import asyncio
+
+import pytest
+
+from src.utils.single_flight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_are_coalesced():
+    flight = SingleFlight()
+    calls = 0
+
+    async def lookup():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "result"
+
+    results = await asyncio.gather(*(flight.do("key", lookup) for _ in range(10)))
+
+    assert results == ["result"] * 10
+    assert calls == 1
+    assert flight.stats() == {"in_flight": 0, "executed": 1, "coalesced": 9}
+
+
+@pytest.mark.asyncio
+async def test_different_keys_are_not_coalesced():
+    flight = SingleFlight()
+
+    async def lookup():
+        await asyncio.sleep(0.01)
+
+    await asyncio.gather(flight.do("a", lookup), flight.do("b", lookup))
+    assert flight.stats()["executed"] == 2
+
+
+@pytest.mark.asyncio
+async def test_exception_is_shared_with_waiters():
+    flight = SingleFlight()
+
+    async def lookup():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("db down")
+
+    results = await asyncio.gather(
+        *(flight.do("key", lookup) for _ in range(3)), return_exceptions=True
+    )
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert flight.stats()["executed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_waiter_retries_when_leader_is_cancelled():
+    flight = SingleFlight()
+
+    async def slow_lookup():
+        await asyncio.sleep(10)
+
+    async def fast_lookup():
+        return "result"
+
+    leader = asyncio.create_task(flight.do("key", slow_lookup))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(flight.do("key", fast_lookup))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await waiter == "result"
+    with pytest.raises(asyncio.CancelledError):
+        await leader
@@ -0,0 +1,90 @@
+import random
+from collections import Counter
+
+from src.utils.sketches import SlidingTopK, SpaceSaving
+
+
+def test_exact_counts_below_capacity():
+    sketch = SpaceSaving(capacity=10)
+    for key, hits in (("a", 5), ("b", 3), ("c", 1)):
+        for _ in range(hits):
+            sketch.add(key)
+
+    assert sketch.top(2) == [("a", 5, 0), ("b", 3, 0)]
+
+
+def test_heavy_hitters_survive_eviction():
+    sketch = SpaceSaving(capacity=5)
+    for i in range(1000):
+        sketch.add("hot")
+        sketch.add(f"cold{i}")
+
+    key, count, error = sketch.top(1)[0]
+    assert key == "hot"
+    assert count - error <= 1000 <= count
+    assert len(sketch) == 5
+
+
+def test_eviction_replaces_current_minimum():
+    sketch = SpaceSaving(capacity=3)
+    for key, hits in (("a", 1), ("b", 2), ("c", 3)):
+        for _ in range(hits):
+            sketch.add(key)
+    for _ in range(3):
+        sketch.add("a")
+
+    sketch.add("d")
+    assert sorted(sketch.top(3)) == [("a", 4, 0), ("c", 3, 0), ("d", 3, 2)]
+    sketch.add("e")
+    assert sorted(sketch.top(3)) == [("a", 4, 0), ("d", 3, 2), ("e", 4, 3)]
+
+
+def test_counts_bound_true_frequencies():
+    rng = random.Random(7)
+    sketch = SpaceSaving(capacity=20)
+    truth = Counter()
+    for _ in range(5000):
+        key = min(int(rng.paretovariate(1.2)), 200)
+        truth[key] += 1
+        sketch.add(key)
+
+    for key, count, error in sketch.items():
+        assert count - error <= truth[key] <= count
+    assert {key for key, _, _ in sketch.top(3)} == {
+        key for key, _ in truth.most_common(3)
+    }
+
+
+def test_decay_halves_counts():
+    sketch = SpaceSaving(capacity=10)
+    for _ in range(8):
+        sketch.add("a")
+    sketch.add("b")
+
+    sketch.decay()
+    assert sketch.top(10) == [("a", 4, 0)]
+
+
+def test_sliding_top_k_sums_slots_in_window(clock):
+    trending = SlidingTopK(capacity=10, window=60, slots=6, clock=clock)
+    for _ in range(3):
+        trending.add("a")
+    clock.now += 10
+    for _ in range(2):
+        trending.add("a")
+        trending.add("b")
+
+    assert trending.top(2) == [("a", 5, 0), ("b", 2, 0)]
+    assert trending.top(1) == [("a", 5, 0)]
+
+
+def test_sliding_top_k_forgets_expired_slots(clock):
+    trending = SlidingTopK(capacity=10, window=60, slots=6, clock=clock)
+    for _ in range(5):
+        trending.add("old")
+    clock.now += 30
+    trending.add("new")
+
+    assert trending.top(2) == [("old", 5, 0), ("new", 1, 0)]
+    clock.now += 30
+    assert trending.top(2) == [("new", 1, 0)]